@@ -25,4 +25,21 @@ ORDER BY "obsidianTot" DESC;
 SELECT
     SUM("obsidianBlades") AS total_obsidian_blades
 FROM public.wide_format_data
-WHERE "unit" = 'N1W4' AND "collectionYear" = 64;
\ No newline at end of file
+WHERE "unit" = 'N1W4' AND "collectionYear" = 64;
+
+-- CATEGORY: selectivity_sweep
+-- QUERY: 4.1
+-- Template of 3.1 filtered by unit only; swept over units drawn from the data
+-- (parameter values declared in _categories.json under "parameter_sets")
+SELECT
+    SUM("obsidianBlades") AS total_obsidian_blades
+FROM public.wide_format_data
+WHERE "unit" = :unit;
+
+-- CATEGORY: selectivity_sweep
+-- QUERY: 4.2
+-- Template of 3.1 filtered by collection year only; swept over years
+SELECT
+    SUM("obsidianBlades") AS total_obsidian_blades
+FROM public.wide_format_data
+WHERE "collectionYear" = :collection_year;
@@ -40,4 +40,19 @@ WHERE
     AND ac2."Description" = 'Obsidian'
     AND ac1."Description" = 'Lithic'
     AND ct."Variable" = 'collectionYear' 
-    AND cc."Description" = '1964';
\ No newline at end of file
+    AND cc."Description" = '1964';
+
+-- CATEGORY: selectivity_sweep
+-- QUERY: 4.1
+-- Template of 3.1 filtered by unit only (EAV year filter dropped); swept over
+-- units drawn from the data (declared in _categories.json "parameter_sets")
+SELECT
+    SUM(a."Count") AS total_obsidian_blades
+FROM tmp_df10."provTable" p
+JOIN tmp_df10."artifactTable" a ON p."SSN" = a."SSN"
+JOIN tmp_df10."artifactCodes" ac1 ON a."ArtCode1" = ac1."Code"
+JOIN tmp_df10."artifactCodes" ac2 ON a."ArtCode2" = ac2."Code"
+WHERE
+    p."Unit" = :unit
+    AND ac2."Description" = 'Obsidian'
+    AND ac1."Description" = 'Lithic';
@@ -30,4 +30,25 @@ SELECT
 FROM tmp_df8.v401 AS t1
 JOIN tmp_df8.v201 AS t2 ON t1."SSN" = t2."SSN"
 JOIN tmp_df8.v301 AS t3 ON t1."SSN" = t3."SSN"
-WHERE t1."UNIT" = 'N1W4' AND t2."COLLYEAR" = 64;
\ No newline at end of file
+WHERE t1."UNIT" = 'N1W4' AND t2."COLLYEAR" = 64;
+
+-- CATEGORY: selectivity_sweep
+-- QUERY: 4.1
+-- Template of 3.1 filtered by unit only; swept over units drawn from the data
+-- (parameter values declared in _categories.json under "parameter_sets")
+SELECT
+    SUM(t3."OBSIBLDS") AS total_obsidian_blades
+FROM tmp_df8.v401 AS t1
+JOIN tmp_df8.v201 AS t2 ON t1."SSN" = t2."SSN"
+JOIN tmp_df8.v301 AS t3 ON t1."SSN" = t3."SSN"
+WHERE t1."UNIT" = :unit;
+
+-- CATEGORY: selectivity_sweep
+-- QUERY: 4.2
+-- Template of 3.1 filtered by collection year only; swept over years
+SELECT
+    SUM(t3."OBSIBLDS") AS total_obsidian_blades
+FROM tmp_df8.v401 AS t1
+JOIN tmp_df8.v201 AS t2 ON t1."SSN" = t2."SSN"
+JOIN tmp_df8.v301 AS t3 ON t1."SSN" = t3."SSN"
+WHERE t2."COLLYEAR" = :collection_year;
@@ -31,4 +31,25 @@ SELECT
 FROM tmp_df9.location AS loc
 JOIN tmp_df9.admin AS adm ON loc."SSN" = adm."SSN"
 JOIN tmp_df9.lithicFlaked AS lith ON loc."SSN" = lith."SSN"
-WHERE loc.unit = 'N1W4' AND adm."collectionYear" = 64;
\ No newline at end of file
+WHERE loc.unit = 'N1W4' AND adm."collectionYear" = 64;
+
+-- CATEGORY: selectivity_sweep
+-- QUERY: 4.1
+-- Template of 3.1 filtered by unit only; swept over units drawn from the data
+-- (parameter values declared in _categories.json under "parameter_sets")
+SELECT
+    SUM(lith."obsidianBlades") AS total_obsidian_blades
+FROM tmp_df9.location AS loc
+JOIN tmp_df9.admin AS adm ON loc."SSN" = adm."SSN"
+JOIN tmp_df9.lithicFlaked AS lith ON loc."SSN" = lith."SSN"
+WHERE loc.unit = :unit;
+
+-- CATEGORY: selectivity_sweep
+-- QUERY: 4.2
+-- Template of 3.1 filtered by collection year only; swept over years
+SELECT
+    SUM(lith."obsidianBlades") AS total_obsidian_blades
+FROM tmp_df9.location AS loc
+JOIN tmp_df9.admin AS adm ON loc."SSN" = adm."SSN"
+JOIN tmp_df9.lithicFlaked AS lith ON loc."SSN" = lith."SSN"
+WHERE adm."collectionYear" = :collection_year;
@@ -31,4 +31,14 @@ SELECT
     SUM(r01."CerTot_REAN") AS total_ceramics
 FROM tmp_rean_df2."REAN_00" AS r00
 JOIN tmp_rean_df2."REAN_01" AS r01 ON r00.ssn = r01.ssn
-WHERE r00.unit = 'N1W4' AND r01."REAN_Year" = 96;
\ No newline at end of file
+WHERE r00.unit = 'N1W4' AND r01."REAN_Year" = 96;
+
+-- CATEGORY: selectivity_sweep
+-- QUERY: 4.1
+-- Template of 3.1 filtered by unit only; swept over units drawn from the data
+-- (parameter values declared in _categories.json under "parameter_sets")
+SELECT
+    SUM(r01."CerTot_REAN") AS total_ceramics
+FROM tmp_rean_df2."REAN_00" AS r00
+JOIN tmp_rean_df2."REAN_01" AS r01 ON r00.ssn = r01.ssn
+WHERE r00.unit = :unit;
@@ -8,43 +8,115 @@ if it does not already exist, and populates it by executing the corresponding
 .sql dump file.
 
 The script is designed to be idempotent; it can be run multiple times without
-causing errors or changing the state of already-existing databases.
+causing errors or changing the state of already-existing databases. Each
+restored database keeps a load ledger (`setup_ledger.dump_loads`) with the
+dump's SHA-256, size, load duration and per-table row counts: a dump that is
+unchanged since its last load is skipped (in constant time when its size and
+modification time match), and a changed dump is reloaded into a fresh
+database. Every load leaves a load-in-progress marker until it is recorded,
+so a database with neither an entry nor a marker was restored before the
+ledger existed and is adopted as is (an entry is recorded for its dump).
+`--reload` forces a reload.
 
 All operations are logged to both the console and a file named
 '00_setup_databases.log' in the same directory.
 
+The databases are independent, so with `--jobs N` up to N of them are
+restored concurrently, each on its own connections. Every database then
+also gets its own log file ('00_setup_databases_<db>.log'), and the run
+ends with a per-database timing summary.
+
+With `[database_setup] fast_load`, dumps are restored with relaxed
+durability into UNLOGGED tables, and their indexes and constraints are
+built after the data; the seconds of each phase are recorded with the
+load timings.
+
+With `[database_setup] use_templates`, each dump is restored only once,
+into a frozen template database (`<db>_template`), and the working
+database is cloned from it with `CREATE DATABASE ... TEMPLATE`. `--reset`
+then recreates any database that has a template in seconds, and
+`--freeze` snapshots a database (e.g. a benchmark database) as its
+template.
+
 Usage:
     From the src/ directory, run:
     $ python 00_setup_databases.py --config config.ini
+    $ python 00_setup_databases.py --config config.ini --jobs 4
+    $ python 00_setup_databases.py --config config.ini --reload
+    $ python 00_setup_databases.py --freeze tmp_benchmark_wide_numeric
+    $ python 00_setup_databases.py --reset TMP_DF9 tmp_benchmark_wide_numeric
 
 """
 
 import argparse
 import configparser
+import json
 import logging
 import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, List
 
 import psycopg2
+from loading_modules import fast_load, load_ledger, statement_stream, template_clone
 from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 
 # --- Constants ---
 LOG_FILE_NAME = "00_setup_databases.log"
+DEFAULT_CHECKPOINT_DIR = "../outputs/history/restore_checkpoints/"
+# stream: statement-by-statement with batches, periodic commits and resume;
+# script: the whole dump in one execute() and one transaction.
+EXECUTOR_STREAM = "stream"
+EXECUTOR_SCRIPT = "script"
+# Load mode of the stream executor when INSERT runs are rewritten into COPY.
+LOAD_MODE_COPY = "stream+copy"
+# Suffix of the load mode when the fast-load profile is on.
+FAST_LOAD_SUFFIX = "+fast"
+DEFAULT_LOAD_TIMINGS_PATH = "../outputs/reports/setup_load_timings.json"
+# Per-database log streams of concurrent restores.
+DB_LOG_FILE_PATTERN = "00_setup_databases_{db_name}.log"
+LOG_FORMAT = "%(asctime)s [%(levelname)-7s] %(message)s"
+# Concurrent restores interleave on the console, so lines name their database.
+PARALLEL_LOG_FORMAT = "%(asctime)s [%(levelname)-7s] [%(threadName)s] %(message)s"
 
 
 # --- Logging Setup ---
 
 
-def setup_logging(log_path: Path) -> None:
+def setup_logging(log_path: Path, parallel: bool = False) -> None:
     """Configures logging to both console and a file."""
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s [%(levelname)-7s] %(message)s",
+        format=PARALLEL_LOG_FORMAT if parallel else LOG_FORMAT,
         handlers=[logging.FileHandler(log_path), logging.StreamHandler(sys.stdout)],
     )
 
 
+class ThreadNameFilter(logging.Filter):
+    """Passes only the records emitted by the thread with the given name."""
+
+    def __init__(self, thread_name: str) -> None:
+        super().__init__()
+        self.thread_name = thread_name
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        return record.threadName == self.thread_name
+
+
+def add_database_log(log_dir: Path, db_name: str) -> logging.Handler:
+    """Routes the current thread's log records to a per-database log file."""
+    handler = logging.FileHandler(
+        log_dir / DB_LOG_FILE_PATTERN.format(db_name=db_name), mode="w"
+    )
+    handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    handler.addFilter(ThreadNameFilter(threading.current_thread().name))
+    logging.getLogger().addHandler(handler)
+    return handler
+
+
 # --- Argument Parsing ---
 
 
@@ -59,6 +131,29 @@ def parse_arguments() -> argparse.Namespace:
         default="config.ini",
         help="Path to the configuration file (default: config.ini)",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of databases to restore concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--reload",
+        action="store_true",
+        help="Drop and reload every database, ignoring the load ledger.",
+    )
+    parser.add_argument(
+        "--reset",
+        nargs="+",
+        metavar="DB",
+        help="Recreate the given databases from their frozen templates and exit.",
+    )
+    parser.add_argument(
+        "--freeze",
+        nargs="+",
+        metavar="DB",
+        help="Snapshot the given databases as their frozen templates and exit.",
+    )
     return parser.parse_args()
 
 
@@ -114,21 +209,61 @@ def create_database(db_config: dict, db_name: str) -> bool:
             conn.close()
 
 
-def populate_database(db_config: dict, db_name: str, sql_file_path: Path) -> bool:
+def drop_database(db_config: dict, db_name: str) -> None:
+    """Drops a database (ending its sessions) so it can be reloaded."""
+    conn = psycopg2.connect(**db_config)
+    try:
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            template_clone.drop_database(cur, db_name)
+    finally:
+        conn.close()
+    logging.info("Dropped database '%s' for a reload.", db_name)
+
+
+def get_checkpoint_path(setup_options: Dict[str, Any], db_name: str) -> Path:
+    """Returns the restore checkpoint file of a database."""
+    return (
+        Path(setup_options.get("checkpoint_dir", DEFAULT_CHECKPOINT_DIR))
+        / f"{db_name}.json"
+    )
+
+
+def populate_database(
+    db_config: dict,
+    db_name: str,
+    sql_file_path: Path,
+    setup_options: Dict[str, Any] | None = None,
+) -> Dict[str, Any] | None:
     """
     Populates a database by executing a .sql script.
 
+    With the ``stream`` executor (default), the dump is tokenized and run
+    statement by statement in batches with periodic commits and a
+    checkpoint, so an interrupted restore resumes after the last commit;
+    with ``copy_inserts``, runs of INSERTs are loaded via COPY. The
+    ``script`` executor sends the whole file in one transaction.
+
+    With ``fast_load`` (stream executor only), the session runs with
+    ``synchronous_commit=off`` and a large ``maintenance_work_mem``, tables
+    are created UNLOGGED, and the dump's indexes and constraints are only
+    created once the data is in; the tables are then switched back to
+    LOGGED. A crash would empty UNLOGGED tables, so no checkpoint is kept.
+
     Args:
         db_config: A dictionary with connection details.
         db_name: The name of the target database to populate.
         sql_file_path: The path to the .sql file to execute.
+        setup_options: Executor settings from ``[database_setup]``.
 
     Returns:
-        True on success, False on failure.
+        The load statistics (with per-phase seconds under ``phases`` for
+        ``fast_load``) on success, None on failure.
     """
+    setup_options = setup_options or {}
     if not sql_file_path.is_file():
         logging.error("SQL script not found at: %s", sql_file_path)
-        return False
+        return None
 
     logging.info("Populating '%s' from '%s'...", db_name, sql_file_path.name)
 
@@ -136,24 +271,342 @@ def populate_database(db_config: dict, db_name: str, sql_file_path: Path) -> boo
     target_db_config = db_config.copy()
     target_db_config["dbname"] = db_name
 
+    stats: Dict[str, Any] = {}
+    executor = setup_options.get("executor", EXECUTOR_STREAM)
+    fast = setup_options.get("fast_load", False)
+    if fast and executor != EXECUTOR_STREAM:
+        logging.warning("fast_load requires the stream executor; ignoring it.")
+    checkpoint_path = None if fast else get_checkpoint_path(setup_options, db_name)
+
     try:
-        with open(sql_file_path, "r", encoding="utf-8") as f:
-            sql_script = f.read()
+        if executor == EXECUTOR_STREAM:
+            conn = psycopg2.connect(**target_db_config)
+            try:
+                profile = None
+                if fast:
+                    profile = fast_load.DumpProfile()
+                    with conn.cursor() as cur:
+                        fast_load.apply_session_settings(
+                            cur,
+                            fast_load.session_settings(
+                                setup_options.get(
+                                    "maintenance_work_mem",
+                                    fast_load.DEFAULT_MAINTENANCE_WORK_MEM,
+                                )
+                            ),
+                        )
+                    conn.commit()
+                stats = statement_stream.execute_dump(
+                    conn,
+                    sql_file_path,
+                    batch_statements=setup_options.get(
+                        "batch_statements", statement_stream.DEFAULT_BATCH_STATEMENTS
+                    ),
+                    commit_statements=setup_options.get(
+                        "commit_statements", statement_stream.DEFAULT_COMMIT_STATEMENTS
+                    ),
+                    checkpoint_path=checkpoint_path,
+                    copy_inserts=setup_options.get("copy_inserts", False),
+                    statement_filter=profile.rewrite if profile else None,
+                )
+                if profile is not None:
+                    stats["phases"] = {
+                        fast_load.PHASE_LOAD: stats["seconds"],
+                        **profile.finish(conn),
+                    }
+            finally:
+                conn.close()
+            logging.info(
+                "Executed %s statements in %ss (%s statements/s).",
+                stats["statements"],
+                stats["seconds"],
+                stats["statements_per_s"],
+            )
+            if "rows_copied" in stats:
+                logging.info(
+                    "Loaded %s INSERT statements (%s rows) via COPY; "
+                    "%s COPY runs fell back to verbatim execution.",
+                    stats["statements_copied"],
+                    stats["rows_copied"],
+                    stats["copy_fallbacks"],
+                )
+            if "phases" in stats:
+                logging.info(
+                    "Fast-load phases: %s.",
+                    ", ".join(f"{k} {v}s" for k, v in stats["phases"].items()),
+                )
+        else:
+            with open(sql_file_path, "r", encoding="utf-8") as f:
+                sql_script = f.read()
 
-        with psycopg2.connect(**target_db_config) as conn:
-            with conn.cursor() as cur:
-                cur.execute(sql_script)
+            with psycopg2.connect(**target_db_config) as conn:
+                with conn.cursor() as cur:
+                    cur.execute(sql_script)
 
         logging.info("Successfully populated database '%s'.", db_name)
 
     except psycopg2.Error as e:
         logging.error("Failed to populate database '%s'. Error: %s", db_name, e)
-        return False
+        return None
     except IOError as e:
         logging.error("Could not read SQL file '%s'. Error: %s", sql_file_path, e)
-        return False
+        return None
+
+    return stats
 
-    return True
+
+def setup_database(
+    db_config: dict,
+    db_name: str,
+    sql_dump_dir: Path,
+    setup_options: Dict[str, Any],
+    log_dir: Path | None = None,
+    reload: bool = False,
+) -> Dict[str, Any]:
+    """
+    Creates and populates one legacy database; returns its timing summary.
+
+    The database's load ledger decides what to do: an unchanged dump is
+    skipped, a changed one (or ``reload``) is loaded into a freshly
+    recreated database, and an interrupted load with a checkpoint is
+    resumed. A restore without a ledger entry or a load-in-progress marker
+    (made before the ledger existed) is adopted: an entry is recorded and
+    nothing is dropped. With ``use_templates``, the dump is restored into the
+    database's frozen template instead and the working database is cloned
+    from it; as frozen templates accept no connections, their ledger is
+    read from that clone. With ``log_dir``, the worker thread is named
+    after the database and its log records are also written to that
+    database's own log file.
+    """
+    handler = None
+    if log_dir is not None:
+        threading.current_thread().name = db_name
+        handler = add_database_log(log_dir, db_name)
+    logging.info("--- Processing: %s ---", db_name)
+    start_time = time.monotonic()
+    summary = {"database": db_name, "status": "failed"}
+    sql_file = sql_dump_dir / f"{db_name}.sql"
+    restore_db = db_name
+    try:
+        if not sql_file.is_file():
+            logging.error("SQL script not found at: %s", sql_file)
+            return summary
+
+        state_db = db_name
+        if setup_options["use_templates"]:
+            restore_db = template_clone.template_name(db_name)
+            state_db = restore_db
+            if template_clone.has_template(db_config, db_name):
+                state_db = db_name
+                if load_ledger.read_load_state(db_config, db_name) is None:
+                    logging.info("Template '%s' exists; cloning it.", restore_db)
+                    summary["clone_seconds"] = template_clone.clone_database(
+                        db_config, restore_db, db_name, setup_options["clone_strategy"]
+                    )
+                    summary["status"] = "cloned"
+
+        checkpoint_path = get_checkpoint_path(setup_options, restore_db)
+        if reload:
+            plan = (load_ledger.ACTION_RELOAD, "reload requested", None)
+        else:
+            state = load_ledger.read_load_state(db_config, state_db)
+            # An unfrozen template without an entry is an interrupted restore.
+            adoptable = (
+                state == {}
+                and state_db == db_name
+                and load_ledger.is_adoptable(db_config, db_name)
+            )
+            plan = load_ledger.plan_load(
+                state,
+                sql_file,
+                resumable=checkpoint_path.is_file(),
+                adoptable=adoptable,
+            )
+        action, reason, sha256 = plan
+        logging.info("Load plan for '%s': %s (%s).", db_name, action, reason)
+
+        if action == load_ledger.ACTION_ADOPT:
+            logging.warning(
+                "Adopting '%s' as loaded from '%s'; use --reload to restore it "
+                "from the dump instead.",
+                db_name,
+                sql_file.name,
+            )
+            try:
+                load_ledger.record_load(db_config, state_db, sql_file, None)
+            except psycopg2.Error as e:
+                logging.warning("Could not record '%s' in its ledger: %s", state_db, e)
+            if summary["status"] != "cloned":
+                summary["status"] = "adopted"
+            return summary
+        if action == load_ledger.ACTION_SKIP:
+            if sha256 is not None:
+                load_ledger.refresh_signature(db_config, state_db, sql_file)
+            if summary["status"] != "cloned":
+                summary["status"] = "unchanged"
+            return summary
+        if action != load_ledger.ACTION_RESUME:
+            checkpoint_path.unlink(missing_ok=True)
+        if action == load_ledger.ACTION_RELOAD:
+            drop_database(db_config, restore_db)
+
+        # Create the database
+        if create_database(db_config, restore_db):
+            summary["create_seconds"] = round(time.monotonic() - start_time, 2)
+
+            # Populate the database
+            load_ledger.mark_load_started(db_config, restore_db, sql_file)
+            load_start = time.monotonic()
+            stats = populate_database(db_config, restore_db, sql_file, setup_options)
+            if stats is not None:
+                summary["status"] = "populated"
+                summary["load_seconds"] = round(time.monotonic() - load_start, 2)
+                if "phases" in stats:
+                    summary["load_phases"] = stats["phases"]
+                try:
+                    load_ledger.record_load(
+                        db_config,
+                        restore_db,
+                        sql_file,
+                        summary["load_seconds"],
+                        sha256=sha256,
+                    )
+                except psycopg2.Error as e:
+                    logging.warning(
+                        "Could not record the load of '%s' in its ledger: %s",
+                        restore_db,
+                        e,
+                    )
+
+                if restore_db != db_name:
+                    template_clone.freeze_template(db_config, restore_db)
+                    summary["clone_seconds"] = template_clone.clone_database(
+                        db_config, restore_db, db_name, setup_options["clone_strategy"]
+                    )
+    except psycopg2.Error as e:
+        logging.error("Failed to set up '%s': %s", db_name, e)
+        summary["status"] = "failed"
+    finally:
+        summary["seconds"] = round(time.monotonic() - start_time, 2)
+        if handler is not None:
+            logging.getLogger().removeHandler(handler)
+            handler.close()
+    return summary
+
+
+def get_load_mode(setup_options: Dict[str, Any]) -> str:
+    """Names the way dumps are executed, for comparing load times."""
+    if setup_options["executor"] != EXECUTOR_STREAM:
+        return setup_options["executor"]
+    load_mode = LOAD_MODE_COPY if setup_options["copy_inserts"] else EXECUTOR_STREAM
+    if setup_options["fast_load"]:
+        load_mode += FAST_LOAD_SUFFIX
+    return load_mode
+
+
+def record_load_timings(
+    timings_path: Path, summaries: List[Dict[str, Any]], load_mode: str
+) -> Dict[str, Any]:
+    """
+    Stores this run's load time per database and load mode.
+
+    Returns:
+        All recorded timings, ``{db: {mode: {"seconds", "recorded_at"}}}``,
+        plus the per-phase seconds (``phases``) of fast-load runs.
+    """
+    timings: Dict[str, Any] = {}
+    if timings_path.is_file():
+        try:
+            with open(timings_path, "r", encoding="utf-8") as f:
+                timings = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(
+                "Ignoring unreadable load timings '%s': %s", timings_path, e
+            )
+    for summary in summaries:
+        if "load_seconds" in summary:
+            timings.setdefault(summary["database"], {})[load_mode] = {
+                "seconds": summary["load_seconds"],
+                "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+            if "load_phases" in summary:
+                timings[summary["database"]][load_mode]["phases"] = summary[
+                    "load_phases"
+                ]
+    timings_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(timings_path, "w", encoding="utf-8") as f:
+        json.dump(timings, f, indent=2, sort_keys=True)
+    return timings
+
+
+def get_copy_speedup(db_timings: Dict[str, Any]) -> float | None:
+    """Returns the latest verbatim load time over the latest COPY load time."""
+    copy_timing = db_timings.get(LOAD_MODE_COPY)
+    verbatim = db_timings.get(EXECUTOR_STREAM) or db_timings.get(EXECUTOR_SCRIPT)
+    if not copy_timing or not verbatim or not copy_timing["seconds"]:
+        return None
+    return verbatim["seconds"] / copy_timing["seconds"]
+
+
+def log_timing_summary(
+    summaries: List[Dict[str, Any]],
+    wall_seconds: float,
+    timings: Dict[str, Any] | None = None,
+) -> None:
+    """
+    Logs each database's restore time and the run's wall-clock time.
+
+    With recorded ``timings``, the COPY-rewriting speedup over the latest
+    verbatim load of the same database is shown where both exist.
+    """
+    logging.info("--- Timing summary ---")
+    for summary in sorted(summaries, key=lambda s: s["seconds"], reverse=True):
+        speedup = get_copy_speedup((timings or {}).get(summary["database"], {}))
+        logging.info(
+            "  %-16s %-10s %8.2fs%s",
+            summary["database"],
+            summary["status"],
+            summary["seconds"],
+            f"  (COPY speedup {speedup:.1f}x)" if speedup else "",
+        )
+    logging.info(
+        "  Wall clock %.2fs for %.2fs of restores.",
+        wall_seconds,
+        sum(summary["seconds"] for summary in summaries),
+    )
+
+
+def run_template_command(
+    db_config: dict, db_names: List[str], freeze: bool, strategy: str
+) -> List[Dict[str, Any]]:
+    """Resets databases from, or freezes them as, their templates."""
+    summaries = []
+    for db_name in db_names:
+        start_time = time.monotonic()
+        status = "frozen" if freeze else "reset"
+        try:
+            if freeze:
+                template_clone.snapshot_template(db_config, db_name, strategy)
+            elif not template_clone.has_template(db_config, db_name):
+                logging.error(
+                    "No template for '%s'; run setup with use_templates or "
+                    "--freeze it first.",
+                    db_name,
+                )
+                status = "failed"
+            else:
+                template_clone.clone_database(
+                    db_config, template_clone.template_name(db_name), db_name, strategy
+                )
+        except psycopg2.Error as e:
+            logging.error("Failed to %s '%s'. Error: %s", status, db_name, e)
+            status = "failed"
+        summaries.append({
+            "database": db_name,
+            "status": status,
+            "seconds": round(time.monotonic() - start_time, 2),
+        })
+    return summaries
 
 
 # --- Main Orchestrator ---
@@ -165,8 +618,8 @@ def main() -> None:
     config_path = Path(args.config)
 
     # Assume log file is in the same directory as the script
-    log_file_path = Path(__file__).parent / LOG_FILE_NAME
-    setup_logging(log_file_path)
+    log_dir = Path(__file__).parent
+    setup_logging(log_dir / LOG_FILE_NAME, parallel=args.jobs > 1)
 
     if not config_path.is_file():
         logging.critical("Configuration file not found at: %s", config_path)
@@ -188,25 +641,105 @@ def main() -> None:
             db.strip() for db in config.get("databases", "legacy_dbs").split(",")
         ]
         sql_dump_dir = Path(config.get("paths", "sql_dump_dir"))
-    except (configparser.NoSectionError, configparser.NoOptionError) as e:
+        setup_options = {
+            "executor": config.get(
+                "database_setup", "executor", fallback=EXECUTOR_STREAM
+            ),
+            "batch_statements": config.getint(
+                "database_setup",
+                "batch_statements",
+                fallback=statement_stream.DEFAULT_BATCH_STATEMENTS,
+            ),
+            "commit_statements": config.getint(
+                "database_setup",
+                "commit_statements",
+                fallback=statement_stream.DEFAULT_COMMIT_STATEMENTS,
+            ),
+            "checkpoint_dir": config.get(
+                "database_setup", "checkpoint_dir", fallback=DEFAULT_CHECKPOINT_DIR
+            ),
+            "copy_inserts": config.getboolean(
+                "database_setup", "copy_inserts", fallback=False
+            ),
+            "fast_load": config.getboolean(
+                "database_setup", "fast_load", fallback=False
+            ),
+            "maintenance_work_mem": config.get(
+                "database_setup",
+                "maintenance_work_mem",
+                fallback=fast_load.DEFAULT_MAINTENANCE_WORK_MEM,
+            ),
+            "use_templates": config.getboolean(
+                "database_setup", "use_templates", fallback=False
+            ),
+            "clone_strategy": config.get(
+                "database_setup",
+                "clone_strategy",
+                fallback=template_clone.STRATEGY_FILE_COPY,
+            ),
+        }
+        load_timings_path = Path(
+            config.get(
+                "database_setup",
+                "load_timings_path",
+                fallback=DEFAULT_LOAD_TIMINGS_PATH,
+            )
+        )
+    except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
         logging.critical(
             "Configuration file is missing a required section or option: %s", e
         )
         sys.exit(1)
 
-    logging.info("Starting legacy database setup process...")
-
-    for db_name in legacy_dbs:
-        logging.info("--- Processing: %s ---", db_name)
-
-        # Create the database
-        if not create_database(db_config, db_name):
-            continue  # Skip to next DB if creation failed
+    if args.reset or args.freeze:
+        start_time = time.monotonic()
+        summaries = run_template_command(
+            db_config,
+            args.freeze or args.reset,
+            bool(args.freeze),
+            setup_options["clone_strategy"],
+        )
+        log_timing_summary(summaries, time.monotonic() - start_time)
+        return
 
-        # Populate the database
-        sql_file = sql_dump_dir / f"{db_name}.sql"
-        populate_database(db_config, db_name, sql_file)
+    logging.info("Starting legacy database setup process...")
+    start_time = time.monotonic()
+
+    if args.jobs > 1:
+        logging.info("Restoring up to %s databases concurrently.", args.jobs)
+        with ThreadPoolExecutor(
+            max_workers=args.jobs, thread_name_prefix="setup"
+        ) as executor:
+            summaries = list(
+                executor.map(
+                    lambda db_name: setup_database(
+                        db_config,
+                        db_name,
+                        sql_dump_dir,
+                        setup_options,
+                        log_dir,
+                        reload=args.reload,
+                    ),
+                    legacy_dbs,
+                )
+            )
+    else:
+        summaries = [
+            setup_database(
+                db_config, db_name, sql_dump_dir, setup_options, reload=args.reload
+            )
+            for db_name in legacy_dbs
+        ]
 
+    wall_seconds = time.monotonic() - start_time
+    timings = None
+    try:
+        timings = record_load_timings(
+            load_timings_path, summaries, get_load_mode(setup_options)
+        )
+    except OSError as e:
+        logging.error("Could not record load timings: %s", e)
+    log_timing_summary(summaries, wall_seconds, timings)
     logging.info("--- Legacy database setup process complete. ---")
 
 
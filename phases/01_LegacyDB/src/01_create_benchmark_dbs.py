@@ -12,8 +12,47 @@ two powerful, purpose-built SQL queries to generate benchmark databases.
     b) `flatten_df9_text_nulls.sql`: Performs the same flattening but also
        translates numeric codes to their text descriptions and converts
        known NA-marker values (e.g., -1, 'NONE') to standard SQL NULLs.
-2.  LOAD: It creates two new PostgreSQL databases and loads the resulting
-    DataFrame from each query into its respective database.
+2.  LOAD: It creates two new PostgreSQL databases and loads the result of
+    each query into its respective database. The load strategy is set by
+    `[benchmark_build] load_method`:
+    a) `auto` (default): the fastest server-to-server path available, i.e.
+       `dblink` on the same server when the extension exists, else `pipe`.
+    b) `dblink`: `INSERT ... SELECT` from the source inside the target server.
+    c) `pipe`: `COPY (query) TO STDOUT` piped into `COPY ... FROM STDIN`;
+       rows pass through Python only as raw bytes.
+    d) `copy`: a server-side cursor reads bounded chunks that are decoded and
+       written with `COPY ... FROM STDIN` (constant memory).
+    e) `pandas`: the original path; the full result is read into a DataFrame
+       and written with multi-row INSERTs. With `compact_frames`, the
+       DataFrame is read in chunks with nullable dtypes, categorical text
+       and downcast integers, and its memory footprint is logged.
+    With `workers` > 1 the direct methods split the extraction into SSN key
+    ranges loaded concurrently, and with `parallel_variants` the two
+    benchmark databases are built at the same time.
+3.  OPTIMIZE: Every load path creates the target table with the exact
+    column types of the query result. After loading, integer-valued columns
+    are narrowed, the primary key (SSN) and indexes on the canonical filter
+    columns are created, the table is optionally CLUSTERed and then
+    `VACUUM (ANALYZE)`d. What was applied is written to
+    `benchmark_build_report.json` in the reports directory. With
+    `[benchmark_build] fast_load`, the load runs with relaxed durability
+    (database-level `synchronous_commit=off`, a large
+    `maintenance_work_mem`) into an UNLOGGED table that is switched to
+    LOGGED before the key and indexes are built; every phase is timed.
+4.  INCREMENTAL: With `[benchmark_build] incremental` (default), a build
+    ledger fingerprints the TMP_DF9 tables and the SQL files. Unchanged
+    targets are skipped; when only some SSNs changed, just their rows are
+    replaced in place. `--full-rebuild` ignores the ledger. A target's
+    entry is only kept while its last build succeeded, so a failed or
+    interrupted build is redone in full.
+5.  EXPORT (optional): With `[benchmark_build] parquet_export`, each wide
+    table is also written as a partitioned, compressed Parquet dataset
+    (via Arrow) for the columnar-file benchmarks of the profiling pipeline.
+6.  MATERIALIZED VIEWS (optional): With `[benchmark_build]
+    materialized_views`, the same flattening queries are also kept as
+    materialized views inside TMP_DF9 (one schema per benchmark database),
+    with a unique SSN index for `REFRESH ... CONCURRENTLY`. Their refresh
+    time and storage are added to the build report.
 
 This approach offloads the complex transformation logic to the database engine
 for maximum performance and robustness.
@@ -26,13 +65,28 @@ Usage:
 
 import argparse
 import configparser
+import json
 import logging
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict
+from typing import Any, Dict, List, Tuple
 
 import pandas as pd
 import psycopg2
+from loading_modules import (
+    build_ledger,
+    compact_frame,
+    copy_loader,
+    direct_transfer,
+    fast_load,
+    materialized_view,
+    parallel_build,
+    parquet_export,
+    post_load,
+    table_schema,
+)
 from psycopg2 import sql
 from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
 from sqlalchemy import create_engine, text
@@ -40,7 +94,23 @@ from sqlalchemy.engine import Engine
 
 # --- Constants ---
 LOG_FILE_NAME = "01_create_benchmark_dbs.log"
+BUILD_REPORT_NAME = "benchmark_build_report.json"
 BENCHMARK_TABLE_NAME = "wide_format_data"
+# Filter columns of the canonical benchmark queries
+# (sql/canonical_queries/canonical_queries_benchmark.sql).
+DEFAULT_INDEX_COLUMNS = "unit, collectionYear, obsidianTot"
+# Build options that change the table's content or shape; recorded in the
+# build ledger so changing any of them forces a full rebuild.
+TABLE_SHAPE_OPTIONS = ["narrow_types", "primary_key", "index_columns", "cluster"]
+
+LOAD_METHOD_AUTO = "auto"
+LOAD_METHOD_COPY = "copy"
+LOAD_METHOD_PANDAS = "pandas"
+DIRECT_LOAD_METHODS = {
+    LOAD_METHOD_AUTO: None,
+    direct_transfer.STRATEGY_DBLINK: direct_transfer.STRATEGY_DBLINK,
+    direct_transfer.STRATEGY_PIPE: direct_transfer.STRATEGY_PIPE,
+}
 
 # Mapping of benchmark database names to their corresponding SQL query files.
 # This makes the script's logic clear and easily extensible.
@@ -79,6 +149,11 @@ def parse_arguments() -> argparse.Namespace:
         default="config.ini",
         help="Path to the configuration file (default: config.ini)",
     )
+    parser.add_argument(
+        "--full-rebuild",
+        action="store_true",
+        help="Rebuild every benchmark database, ignoring the build ledger.",
+    )
     return parser.parse_args()
 
 
@@ -160,6 +235,41 @@ def extract_transform_data(engine: Engine, query_path: Path) -> pd.DataFrame | N
         return None
 
 
+def extract_compact_data(
+    engine: Engine, query_path: Path, build_options: Dict[str, Any]
+) -> pd.DataFrame | None:
+    """Extracts the query result into a DataFrame with compact dtypes."""
+    if not query_path.is_file():
+        logging.critical("SQL query file not found at: %s", query_path)
+        return None
+
+    logging.info("Reading '%s' in chunks with compact dtypes...", query_path.name)
+    try:
+        df, stats = compact_frame.read_compact_frame(
+            engine,
+            query_path.read_text(encoding="utf-8"),
+            chunk_rows=build_options["chunk_rows"],
+            dtype_backend=build_options["dtype_backend"],
+            category_max_ratio=build_options["category_max_ratio"],
+        )
+    except Exception as e:
+        logging.critical(
+            "Failed to execute query from '%s'. Error: %s", query_path.name, e
+        )
+        return None
+    logging.info(
+        "Extracted %s rows: %.1f MB as decoded, %.1f MB compact "
+        "(%s categorical columns); peak RSS %s MB before, %s MB after.",
+        stats["rows"],
+        stats["raw_bytes"] / (1024 * 1024),
+        stats["compact_bytes"] / (1024 * 1024),
+        stats["category_columns"],
+        stats["peak_rss_before_mb"],
+        stats["peak_rss_after_mb"],
+    )
+    return df
+
+
 def write_to_database(df: pd.DataFrame, engine: Engine) -> bool:
     """Writes a DataFrame to the specified database."""
     db_name = engine.url.database
@@ -172,10 +282,11 @@ def write_to_database(df: pd.DataFrame, engine: Engine) -> bool:
     try:
         # Using method='multi' is crucial for bulk insert performance.
         # chunksize helps manage memory for extremely large datasets.
+        # The table already exists with the query's types; only append rows.
         df.to_sql(
             name=BENCHMARK_TABLE_NAME,
             con=engine,
-            if_exists="replace",
+            if_exists="append",
             index=False,
             method="multi",
             chunksize=1000,
@@ -187,6 +298,359 @@ def write_to_database(df: pd.DataFrame, engine: Engine) -> bool:
         return False
 
 
+def stream_to_database(
+    source_engine: Engine,
+    query_path: Path,
+    target_engine: Engine,
+    chunk_rows: int,
+    unlogged: bool = False,
+) -> bool:
+    """Streams a query result from the source into the target via COPY."""
+    if not query_path.is_file():
+        logging.critical("SQL query file not found at: %s", query_path)
+        return False
+
+    db_name = target_engine.url.database
+    logging.info(
+        "Streaming '%s' into '%s.%s' (%s rows per chunk)...",
+        query_path.name,
+        db_name,
+        BENCHMARK_TABLE_NAME,
+        chunk_rows,
+    )
+    try:
+        stats = copy_loader.stream_query_to_table(
+            source_engine,
+            query_path.read_text(encoding="utf-8"),
+            target_engine,
+            BENCHMARK_TABLE_NAME,
+            chunk_rows=chunk_rows,
+            unlogged=unlogged,
+        )
+    except Exception as e:
+        logging.error("Failed to stream data into '%s'. Error: %s", db_name, e)
+        return False
+
+    logging.info(
+        "Loaded %s rows into '%s' in %ss (%s rows/s, peak RSS %s MB).",
+        stats["rows"],
+        db_name,
+        stats["seconds"],
+        stats["rows_per_s"],
+        stats["peak_rss_mb"],
+    )
+    return True
+
+
+def transfer_to_database(
+    source_engine: Engine,
+    query_path: Path,
+    target_engine: Engine,
+    strategy: str | None,
+    build_options: Dict[str, Any],
+) -> bool:
+    """Moves a query result server-to-server (dblink or piped COPY)."""
+    if not query_path.is_file():
+        logging.critical("SQL query file not found at: %s", query_path)
+        return False
+
+    db_name = target_engine.url.database
+    logging.info(
+        "Transferring '%s' into '%s.%s'...",
+        query_path.name,
+        db_name,
+        BENCHMARK_TABLE_NAME,
+    )
+    query_sql = query_path.read_text(encoding="utf-8")
+    try:
+        if build_options["workers"] > 1:
+            stats = parallel_build.parallel_transfer(
+                source_engine,
+                query_sql,
+                target_engine,
+                BENCHMARK_TABLE_NAME,
+                build_options["workers"],
+                key_table=build_options["partition_table"],
+                key_column=build_options["partition_key"],
+                strategy=strategy,
+                unlogged=build_options["fast_load"],
+            )
+        else:
+            stats = direct_transfer.transfer_query_to_table(
+                source_engine,
+                query_sql,
+                target_engine,
+                BENCHMARK_TABLE_NAME,
+                strategy=strategy,
+                unlogged=build_options["fast_load"],
+            )
+    except Exception as e:
+        logging.error("Failed to transfer data into '%s'. Error: %s", db_name, e)
+        return False
+
+    logging.info(
+        "Loaded %s rows into '%s' via %s in %ss (%s rows/s).",
+        stats["rows"],
+        db_name,
+        stats["strategy"],
+        stats["seconds"],
+        stats["rows_per_s"],
+    )
+    return True
+
+
+def load_benchmark_db(
+    source_engine: Engine,
+    target_engine: Engine,
+    query_path: Path,
+    build_options: Dict[str, Any],
+) -> bool:
+    """Loads one benchmark table with the configured load method."""
+    load_method = build_options["load_method"]
+
+    if load_method in DIRECT_LOAD_METHODS:
+        return transfer_to_database(
+            source_engine,
+            query_path,
+            target_engine,
+            DIRECT_LOAD_METHODS[load_method],
+            build_options,
+        )
+
+    if load_method == LOAD_METHOD_COPY:
+        return stream_to_database(
+            source_engine,
+            query_path,
+            target_engine,
+            build_options["chunk_rows"],
+            unlogged=build_options["fast_load"],
+        )
+
+    # Extract and Transform using the specified SQL query
+    if build_options["compact_frames"]:
+        df = extract_compact_data(source_engine, query_path, build_options)
+    else:
+        df = extract_transform_data(source_engine, query_path)
+    if df is None:
+        logging.error("Halting: data extraction failed for %s.", target_engine.url)
+        return False
+
+    # Create the table with the query's own types instead of pandas' guesses
+    try:
+        table_schema.create_typed_table(
+            source_engine,
+            query_path.read_text(encoding="utf-8"),
+            target_engine,
+            BENCHMARK_TABLE_NAME,
+            unlogged=build_options["fast_load"],
+        )
+    except Exception as e:
+        logging.error("Failed to create '%s'. Error: %s", BENCHMARK_TABLE_NAME, e)
+        return False
+
+    # Load data into the target benchmark database
+    return write_to_database(df, target_engine)
+
+
+def build_benchmark_db(
+    db_config: Dict,
+    source_engine: Engine,
+    db_name: str,
+    query_path: Path,
+    build_options: Dict[str, Any],
+    ledger_entries: Tuple[Dict | None, Dict] | None = None,
+) -> Dict[str, Any] | None:
+    """
+    Loads and optimizes one benchmark database; returns its build report.
+
+    With ``ledger_entries`` (previous, current), the target is skipped when
+    its inputs are unchanged and patched in place when only some keys
+    changed; a failed patch falls back to the full build.
+    """
+    logging.info("--- Processing benchmark database: %s ---", db_name)
+    target_engine = get_sqlalchemy_engine(db_config, db_name)
+    plan = (build_ledger.ACTION_FULL, "incremental builds disabled", [])
+
+    if ledger_entries is not None:
+        previous, current = ledger_entries
+        try:
+            target_ready = build_ledger.target_table_exists(
+                target_engine, BENCHMARK_TABLE_NAME
+            )
+        except Exception as e:
+            logging.warning("Could not inspect '%s': %s", db_name, e)
+            target_ready = False
+        plan = build_ledger.plan_build(
+            previous, current, target_ready, build_options["max_delta_fraction"]
+        )
+        logging.info("Build plan for '%s': %s (%s).", db_name, plan[0], plan[1])
+    action, reason, changed_keys = plan
+    summary = {"database": db_name, "action": action, "reason": reason}
+
+    if action == build_ledger.ACTION_SKIP:
+        report = {**summary, "steps": []}
+        parquet_missing = not (build_options["parquet_dir"] / db_name).is_dir()
+        if build_options["parquet_export"] and parquet_missing:
+            report["parquet"] = export_to_parquet(target_engine, db_name, build_options)
+        return report
+
+    if action == build_ledger.ACTION_DELTA:
+        try:
+            delta = build_ledger.apply_key_delta(
+                source_engine,
+                query_path.read_text(encoding="utf-8"),
+                target_engine,
+                BENCHMARK_TABLE_NAME,
+                build_options["partition_key"],
+                changed_keys,
+            )
+            logging.info(
+                "Replaced %s keys: %s rows deleted, %s inserted.",
+                len(changed_keys),
+                delta["deleted"],
+                delta["inserted"],
+            )
+            report = post_load.optimize_table(
+                target_engine, BENCHMARK_TABLE_NAME, narrow_types=False
+            )
+            report = {**summary, "delta": delta, **report}
+            if build_options["parquet_export"]:
+                report["parquet"] = export_to_parquet(
+                    target_engine, db_name, build_options
+                )
+            return report
+        except Exception as e:
+            logging.warning("In-place update failed (%s); rebuilding in full.", e)
+            summary.update({"action": build_ledger.ACTION_FULL, "reason": str(e)})
+
+    fast = build_options["fast_load"]
+    if fast:
+        set_fast_load_settings(target_engine, build_options["maintenance_work_mem"])
+    try:
+        load_start = time.monotonic()
+        if not load_benchmark_db(
+            source_engine, target_engine, query_path, build_options
+        ):
+            return None
+        load_seconds = round(time.monotonic() - load_start, 2)
+
+        logging.info("Optimizing '%s.%s'...", db_name, BENCHMARK_TABLE_NAME)
+        report = post_load.optimize_table(
+            target_engine,
+            BENCHMARK_TABLE_NAME,
+            primary_key=build_options["primary_key"],
+            index_columns=build_options["index_columns"],
+            narrow_types=build_options["narrow_types"],
+            cluster=build_options["cluster"],
+            set_logged=fast,
+        )
+    finally:
+        if fast:
+            set_fast_load_settings(target_engine, None)
+    report = {
+        **summary,
+        "load_method": build_options["load_method"],
+        "fast_load": fast,
+        "load_seconds": load_seconds,
+        **report,
+    }
+    if build_options["parquet_export"]:
+        report["parquet"] = export_to_parquet(target_engine, db_name, build_options)
+    return report
+
+
+def set_fast_load_settings(
+    target_engine: Engine, maintenance_work_mem: str | None
+) -> None:
+    """Applies (or, with None, resets) the fast-load database settings."""
+    settings = None
+    if maintenance_work_mem is not None:
+        settings = fast_load.session_settings(maintenance_work_mem)
+    try:
+        fast_load.set_database_settings(target_engine, settings)
+    except Exception as e:
+        logging.warning(
+            "Could not %s fast-load settings on '%s': %s",
+            "apply" if settings else "reset",
+            target_engine.url.database,
+            e,
+        )
+
+
+def export_to_parquet(
+    target_engine: Engine, db_name: str, build_options: Dict[str, Any]
+) -> Dict[str, Any] | None:
+    """Writes the benchmark table as a Parquet dataset; returns export stats."""
+    output_dir = build_options["parquet_dir"] / db_name
+    logging.info("Exporting '%s' to Parquet in '%s'...", db_name, output_dir)
+    try:
+        stats = parquet_export.export_table_to_parquet(
+            target_engine,
+            BENCHMARK_TABLE_NAME,
+            output_dir,
+            partition_column=build_options["parquet_partition_column"],
+            chunk_rows=build_options["chunk_rows"],
+            compression=build_options["parquet_compression"],
+        )
+    except Exception as e:
+        logging.error("Failed to export '%s' to Parquet. Error: %s", db_name, e)
+        return None
+    logging.info(
+        "Exported %s rows to %s files (%.1f MB) in %ss.",
+        stats["rows"],
+        stats["files"],
+        stats["bytes"] / (1024 * 1024),
+        stats["seconds"],
+    )
+    return stats
+
+
+def build_materialized_views(
+    source_engine: Engine, sql_dir: Path, build_options: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """
+    Builds each benchmark materialized view; returns their build reports.
+
+    Each wide database of ``BENCHMARK_DB_TO_SQL_MAP`` gets a view variant in
+    a schema of the same name inside the source database, built from the
+    same SQL file.
+    """
+    reports = []
+    for schema, sql_filename in BENCHMARK_DB_TO_SQL_MAP.items():
+        logging.info("--- Processing materialized view: %s ---", schema)
+        try:
+            report = materialized_view.build_materialized_view(
+                source_engine,
+                schema,
+                (sql_dir / sql_filename).read_text(encoding="utf-8"),
+                build_options["primary_key"],
+                build_options["index_columns"],
+            )
+        except Exception as e:
+            logging.error(
+                "Failed to build materialized view '%s'. Error: %s", schema, e
+            )
+            continue
+        logging.info(
+            "Materialized view '%s': %s rows, %.1f MB, refresh %ss.",
+            schema,
+            report["rows"],
+            report["total_bytes"] / (1024 * 1024),
+            report["refresh_seconds"],
+        )
+        reports.append({"database": source_engine.url.database, **report})
+    return reports
+
+
+def write_build_report(reports: List[Dict[str, Any]], output_dir: Path) -> None:
+    """Writes the per-database build reports to a JSON file."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    report_path = output_dir / BUILD_REPORT_NAME
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(reports, f, indent=2, default=str)
+    logging.info("Build report written to '%s'.", report_path)
+
+
 # --- Main Orchestrator ---
 
 
@@ -212,8 +676,115 @@ def main() -> None:
         # The new benchmark DB name from the user's updated SQL script
         benchmark_dbs = ["tmp_benchmark_wide_numeric", "tmp_benchmark_wide_text_nulls"]
         sql_dir = Path(config.get("paths", "sql_queries_dir"))
+        build_options = {
+            "load_method": config.get(
+                "benchmark_build", "load_method", fallback=LOAD_METHOD_AUTO
+            ),
+            "chunk_rows": config.getint(
+                "benchmark_build",
+                "chunk_rows",
+                fallback=copy_loader.DEFAULT_CHUNK_ROWS,
+            ),
+            "workers": config.getint("benchmark_build", "workers", fallback=1),
+            "partition_table": config.get(
+                "benchmark_build", "partition_table", fallback=""
+            )
+            or None,
+            "partition_key": config.get(
+                "benchmark_build",
+                "partition_key",
+                fallback=parallel_build.DEFAULT_PARTITION_KEY,
+            ),
+            "narrow_types": config.getboolean(
+                "benchmark_build", "narrow_types", fallback=True
+            ),
+            "primary_key": config.get(
+                "benchmark_build", "primary_key", fallback="SSN"
+            ).strip()
+            or None,
+            "index_columns": [
+                col.strip()
+                for col in config.get(
+                    "benchmark_build",
+                    "index_columns",
+                    fallback=DEFAULT_INDEX_COLUMNS,
+                ).split(",")
+                if col.strip()
+            ],
+            "cluster": config.getboolean("benchmark_build", "cluster", fallback=False),
+            "fast_load": config.getboolean(
+                "benchmark_build", "fast_load", fallback=False
+            ),
+            "maintenance_work_mem": config.get(
+                "benchmark_build",
+                "maintenance_work_mem",
+                fallback=fast_load.DEFAULT_MAINTENANCE_WORK_MEM,
+            ),
+        }
+        incremental = config.getboolean("benchmark_build", "incremental", fallback=True)
+        fingerprint_mode = config.get(
+            "benchmark_build",
+            "fingerprint",
+            fallback=build_ledger.FINGERPRINT_CHECKSUM,
+        )
+        source_schema = config.get(
+            "benchmark_build", "source_schema", fallback="tmp_df9"
+        )
+        ledger_path = Path(
+            config.get(
+                "benchmark_build",
+                "ledger_path",
+                fallback=build_ledger.DEFAULT_LEDGER_PATH,
+            )
+        )
+        build_options["max_delta_fraction"] = config.getfloat(
+            "benchmark_build",
+            "max_delta_fraction",
+            fallback=build_ledger.DEFAULT_MAX_DELTA_FRACTION,
+        )
+        build_options.update({
+            "compact_frames": config.getboolean(
+                "benchmark_build", "compact_frames", fallback=False
+            ),
+            "dtype_backend": config.get(
+                "benchmark_build",
+                "dtype_backend",
+                fallback=compact_frame.DEFAULT_DTYPE_BACKEND,
+            ),
+            "category_max_ratio": config.getfloat(
+                "benchmark_build",
+                "category_max_ratio",
+                fallback=compact_frame.DEFAULT_CATEGORY_MAX_RATIO,
+            ),
+            "parquet_export": config.getboolean(
+                "benchmark_build", "parquet_export", fallback=False
+            ),
+            "parquet_dir": Path(
+                config.get(
+                    "benchmark_build", "parquet_dir", fallback="../outputs/parquet/"
+                )
+            ),
+            "parquet_partition_column": config.get(
+                "benchmark_build", "parquet_partition_column", fallback=""
+            ).strip()
+            or None,
+            "parquet_compression": config.get(
+                "benchmark_build",
+                "parquet_compression",
+                fallback=parquet_export.DEFAULT_COMPRESSION,
+            ),
+        })
+        reports_dir = Path(
+            config.get("paths", "output_reports", fallback="../outputs/reports/")
+        )
+        parallel_variants = config.getboolean(
+            "benchmark_build", "parallel_variants", fallback=True
+        )
+        materialized_views = config.getboolean(
+            "benchmark_build", "materialized_views", fallback=False
+        )
 
-    except (configparser.NoSectionError, configparser.NoOptionError) as e:
+    except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
         logging.critical("Config file is missing a required section or option: %s", e)
         sys.exit(1)
 
@@ -231,21 +802,75 @@ def main() -> None:
     # 2. Establish connection to the source database
     source_engine = get_sqlalchemy_engine(db_config_root, source_db_name)
 
-    # 3. Loop through the map, execute the correct SQL, and load the correct DB
-    for db_name, sql_filename in BENCHMARK_DB_TO_SQL_MAP.items():
-        logging.info("--- Processing benchmark database: %s ---", db_name)
-        query_path = sql_dir / sql_filename
-
-        # Extract and Transform using the specified SQL query
-        df = extract_transform_data(source_engine, query_path)
-        if df is None:
-            logging.error("Halting: data extraction failed for %s.", db_name)
-            continue  # Try the next one, but this is a critical failure
-
-        # Load data into the target benchmark database
-        target_engine = get_sqlalchemy_engine(db_config_root, db_name)
-        if not write_to_database(df, target_engine):
-            logging.error("Halting: failed to load data into %s.", db_name)
+    # 3. Execute the correct SQL for each DB and load it, optionally all at once
+    build_jobs = {
+        db_name: sql_dir / sql_filename
+        for db_name, sql_filename in BENCHMARK_DB_TO_SQL_MAP.items()
+    }
+    ledger: Dict[str, Any] = {}
+    ledger_entries: Dict[str, Tuple[Dict | None, Dict]] = {}
+    if incremental:
+        ledger = build_ledger.load_ledger(ledger_path)
+        logging.info("Fingerprinting '%s' (%s)...", source_schema, fingerprint_mode)
+        try:
+            fingerprint = build_ledger.fingerprint_source(
+                source_engine,
+                source_schema,
+                build_options["partition_key"],
+                fingerprint_mode,
+            )
+            shape = {key: build_options[key] for key in TABLE_SHAPE_OPTIONS}
+            for db_name, query_path in build_jobs.items():
+                current = build_ledger.make_entry(
+                    fingerprint, build_ledger.file_sha256(query_path), shape
+                )
+                previous = None if args.full_rebuild else ledger.get(db_name)
+                ledger_entries[db_name] = (previous, current)
+        except Exception as e:
+            logging.warning("Build ledger unavailable, rebuilding in full: %s", e)
+            ledger_entries = {}
+        try:
+            build_ledger.invalidate_entries(ledger_path, ledger, build_jobs)
+        except OSError as e:
+            logging.warning("Could not update the build ledger: %s", e)
+
+    max_workers = len(build_jobs) if parallel_variants else 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            db_name: executor.submit(
+                build_benchmark_db,
+                db_config_root,
+                source_engine,
+                db_name,
+                query_path,
+                build_options,
+                ledger_entries.get(db_name),
+            )
+            for db_name, query_path in build_jobs.items()
+        }
+        reports = []
+        for db_name, future in futures.items():
+            try:
+                report = future.result()
+            except Exception as e:
+                logging.error("Failed to build %s. Error: %s", db_name, e)
+                report = None
+            if db_name in ledger_entries:
+                build_ledger.record_build(
+                    ledger, db_name, ledger_entries[db_name], report
+                )
+            if report is None:
+                logging.error("Halting: failed to load data into %s.", db_name)
+                continue
+            reports.append(report)
+
+    # 4. Optionally keep the same queries as materialized views in the source
+    if materialized_views:
+        reports.extend(build_materialized_views(source_engine, sql_dir, build_options))
+
+    write_build_report(reports, reports_dir)
+    if incremental:
+        build_ledger.save_ledger(ledger_path, ledger)
 
     logging.info("--- Benchmark database creation process complete. ---")
 
@@ -16,50 +16,82 @@ The pipeline is designed for robustness:
 - A failure of a single metric-gathering function will be logged, and the
   script will continue to the next metric for that database.
 
+Within a database, the independent catalog metric groups run concurrently
+on `--metric-workers` threads; the timed benchmark groups follow one at a
+time. With `--workers N`, up to N databases are profiled concurrently, each
+in its own process (their benchmarks then share the server). The run ends
+with a per-database summary of wall-clock vs. client CPU time.
+
 Usage:
     From the src/ directory, run:
     $ python 02_run_profiling_pipeline.py --config config.ini
+    $ python 02_run_profiling_pipeline.py --config config.ini --workers 4
 
 """
 
 import argparse
 import configparser
+import itertools
 import json
 import logging
 import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List
 
 import pandas as pd
 from sqlalchemy import create_engine
 from sqlalchemy.engine import Engine
 
 # Import all our profiling functions
+from loading_modules import materialized_view
+from profiling_modules import benchmark_history
 from profiling_modules import metrics_basic
+from profiling_modules import metrics_columnar
 from profiling_modules import metrics_schema
 from profiling_modules import metrics_profile
 from profiling_modules import metrics_interop
+from profiling_modules import metrics_indexes
 from profiling_modules import metrics_performance
+from profiling_modules import metrics_plans
+from profiling_modules import metrics_load
+from profiling_modules import metrics_sweeps
+from profiling_modules.metrics_cache import CACHE_MODE_UNMANAGED
+from profiling_modules.timing import FETCH_MODE_EXECUTE
 
 # --- Constants ---
 LOG_FILE_NAME = "02_run_profiling_pipeline.log"
+LOG_FORMAT = "%(asctime)s [%(levelname)-7s] %(name)s: %(message)s"
+# Concurrent databases and metric groups interleave, so lines name their thread.
+PARALLEL_LOG_FORMAT = (
+    "%(asctime)s [%(levelname)-7s] [%(threadName)s] %(name)s: %(message)s"
+)
 OUTPUT_METRICS_DIR = "outputs/metrics"
+DEFAULT_METRIC_WORKERS = 4
 
 
 # --- Setup Functions ---
 
 
-def setup_logging(log_dir: Path) -> None:
-    """Configures logging to both console and a file."""
+def setup_logging(log_dir: Path, parallel: bool = False, append: bool = False) -> None:
+    """
+    Configures logging to both console and a file.
+
+    With ``parallel``, records name their thread (the database, or its
+    metric worker). Worker processes ``append`` to the main process's file.
+    """
     log_dir.mkdir(exist_ok=True)
     log_path = log_dir / LOG_FILE_NAME
     logging.basicConfig(
         level=logging.INFO,
-        format="%(asctime)s [%(levelname)-7s] %(name)s: %(message)s",
+        format=PARALLEL_LOG_FORMAT if parallel else LOG_FORMAT,
         handlers=[
-            logging.FileHandler(log_path, mode="w"),
+            logging.FileHandler(log_path, mode="a" if append else "w"),
             logging.StreamHandler(sys.stdout),
         ],
+        force=True,
     )
 
 
@@ -74,6 +106,20 @@ def parse_arguments() -> argparse.Namespace:
         default="config.ini",
         help="Path to the configuration file (default: config.ini)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of databases to profile concurrently, each in its own "
+        "process (default: 1)",
+    )
+    parser.add_argument(
+        "--metric-workers",
+        type=int,
+        default=DEFAULT_METRIC_WORKERS,
+        help="Threads running a database's catalog metric groups concurrently "
+        f"(default: {DEFAULT_METRIC_WORKERS})",
+    )
     return parser.parse_args()
 
 
@@ -139,6 +185,361 @@ def save_results(
         )
 
 
+# --- Per-Database Profiling ---
+
+
+def run_metric(
+    db_name: str,
+    label: str,
+    metric_name: str | None,
+    collect: Callable[[], Any],
+    output_dir: Path,
+) -> bool:
+    """
+    Runs one metric group and saves its result, isolating any failure.
+
+    Args:
+        db_name: Database being profiled (for logging and file names).
+        label: Human-readable name of the metric group.
+        metric_name: Output file suffix; None if ``collect`` saves itself.
+        collect: Callable returning the metric data.
+        output_dir: Directory for the result files.
+
+    Returns:
+        True if the metric group completed, False if it failed.
+    """
+    logging.info("--> Running: %s", label)
+    try:
+        data = collect()
+        if metric_name is not None:
+            save_results(data, db_name, metric_name, output_dir)
+    except Exception as e:
+        logging.error(
+            "CRITICAL ERROR in %s for '%s': %s",
+            label,
+            db_name,
+            e,
+            exc_info=True,
+        )
+        return False
+    return True
+
+
+def profile_database(
+    db_name: str, options: Dict[str, Any], position: int = 1
+) -> Dict[str, Any]:
+    """
+    Runs every enabled metric group against one database.
+
+    The catalog metric groups (sizes, object counts, table and column
+    structure, pg_stats profiles, interoperability) are independent and
+    read-only, so they run concurrently on ``options["metric_workers"]``
+    threads sharing one engine. The timed groups (benchmarks, plans,
+    sweeps, index experiments, load test) then run one after another so
+    that they do not skew each other's latencies. A failing group is
+    logged and does not stop the others.
+
+    Module-level so that it can run in a worker process; the engine is
+    created here, from ``options["db_config"]``.
+
+    Returns:
+        A summary: database, status, wall and client-CPU seconds, and the
+        names of failed metric groups.
+    """
+    if options["parallel_logs"]:
+        threading.current_thread().name = db_name
+    start_time, start_cpu = time.monotonic(), time.process_time()
+    summary: Dict[str, Any] = {"database": db_name, "status": "failed", "failed": []}
+
+    logging.info("=" * 80)
+    logging.info(
+        "Processing Database %s/%s: %s", position, options["total_dbs"], db_name
+    )
+    logging.info("=" * 80)
+
+    engine = get_sqlalchemy_engine(options["db_config"], db_name)
+    if not engine:
+        logging.error("Skipping database '%s' due to connection failure.", db_name)
+        summary["seconds"] = round(time.monotonic() - start_time, 2)
+        summary["cpu_seconds"] = round(time.process_time() - start_cpu, 2)
+        return summary
+
+    # Determine schema name (legacy dbs have matching schema, benchmarks use public;
+    # scaled copies keep the schema of their source database)
+    base_db_name, _ = metrics_performance.split_scale_factor(db_name)
+    schema_name = base_db_name if base_db_name in options["legacy_dbs"] else "public"
+    logging.info(
+        "Target schema for '%s' is '%s'.",
+        db_name,
+        schema_name,
+    )
+
+    output_dir = options["output_dir"]
+    queries_dir = options["sql_queries_dir"] / "canonical_queries"
+    history_enabled = options["history_enabled"]
+    history_path = options["history_path"]
+    run_id = options["run_id"]
+
+    # --- Catalog metric groups (independent, run concurrently) ---
+
+    catalog_metrics = [
+        (
+            "Basic DB Metrics",
+            "basic_metrics",
+            lambda: metrics_basic.get_basic_db_metrics(engine),
+        ),
+        (
+            "Schema Object Counts",
+            "schema_counts",
+            lambda: metrics_basic.get_schema_object_counts(engine, schema_name),
+        ),
+        (
+            "Table Level Metrics",
+            "table_metrics",
+            lambda: metrics_schema.get_table_level_metrics(engine, schema_name),
+        ),
+        (
+            "Column Structural Metrics",
+            "column_structure",
+            lambda: metrics_schema.get_column_structural_metrics(engine, schema_name),
+        ),
+        (
+            "Column Data Profiles (pg_stats)",
+            "column_profiles",
+            lambda: metrics_profile.get_all_column_profiles(engine, schema_name),
+        ),
+    ]
+    # Interoperability metrics only make sense for schemas with multiple tables
+    if schema_name != "public":
+        catalog_metrics.append((
+            "Interoperability Metrics",
+            "interop_metrics",
+            lambda: metrics_interop.calculate_interoperability_metrics(
+                engine, schema_name
+            ),
+        ))
+    else:
+        logging.info(
+            "--> Skipping: Interoperability Metrics (not applicable to "
+            "single-table schema)."
+        )
+
+    # --- Timed metric groups (run one at a time) ---
+
+    def _performance_benchmarks() -> None:
+        perf_benchmarks = []
+        for cache_mode, fetch_mode in itertools.product(
+            options["cache_modes"], options["fetch_modes"]
+        ):
+            perf_benchmarks.extend(
+                metrics_performance.run_performance_benchmarks(
+                    engine,
+                    db_name,
+                    schema_name,
+                    queries_dir,
+                    trials=options["trials"],
+                    warmup_runs=options["warmup_runs"],
+                    cache_mode=cache_mode,
+                    evict_hook=options["cold_cache_hook"],
+                    fetch_mode=fetch_mode,
+                    collect_statement_stats=options["statement_stats"],
+                )
+            )
+        save_results(perf_benchmarks, db_name, "performance_benchmarks", output_dir)
+        if history_enabled:
+            appended = benchmark_history.append_benchmark_results(
+                history_path,
+                run_id,
+                db_name,
+                perf_benchmarks,
+                benchmark_history.get_server_info(engine),
+            )
+            logging.info("Appended %s results to benchmark history.", appended)
+
+    def _columnar_benchmarks() -> None:
+        columnar_benchmarks = []
+        for fetch_mode in options["fetch_modes"]:
+            columnar_benchmarks.extend(
+                metrics_columnar.run_columnar_benchmarks(
+                    options["parquet_dir"] / db_name,
+                    db_name,
+                    queries_dir,
+                    trials=options["trials"],
+                    warmup_runs=options["warmup_runs"],
+                    fetch_mode=fetch_mode,
+                )
+            )
+        save_results(
+            columnar_benchmarks,
+            f"{db_name}{metrics_columnar.COLUMNAR_DB_SUFFIX}",
+            "performance_benchmarks",
+            output_dir,
+        )
+
+    def _matview_benchmarks() -> None:
+        for matview_schema in materialized_view.list_materialized_views(engine):
+            matview_db = f"{matview_schema}{materialized_view.MATVIEW_DB_SUFFIX}"
+            relation_map = {
+                f"public.{materialized_view.MATVIEW_NAME}": (
+                    f"{matview_schema}.{materialized_view.MATVIEW_NAME}"
+                )
+            }
+            matview_benchmarks = []
+            for cache_mode, fetch_mode in itertools.product(
+                options["cache_modes"], options["fetch_modes"]
+            ):
+                matview_benchmarks.extend(
+                    metrics_performance.run_performance_benchmarks(
+                        engine,
+                        matview_db,
+                        matview_schema,
+                        queries_dir,
+                        trials=options["trials"],
+                        warmup_runs=options["warmup_runs"],
+                        cache_mode=cache_mode,
+                        evict_hook=options["cold_cache_hook"],
+                        fetch_mode=fetch_mode,
+                        collect_statement_stats=options["statement_stats"],
+                        relation_map=relation_map,
+                    )
+                )
+            save_results(
+                matview_benchmarks,
+                matview_db,
+                "performance_benchmarks",
+                output_dir,
+            )
+            if history_enabled:
+                benchmark_history.append_benchmark_results(
+                    history_path,
+                    run_id,
+                    matview_db,
+                    matview_benchmarks,
+                    benchmark_history.get_server_info(engine),
+                )
+
+    timed_metrics = [
+        ("Performance Benchmarks", None, _performance_benchmarks),
+    ]
+    if options["columnar_enabled"] and db_name in options["benchmark_dbs"]:
+        timed_metrics.append((
+            "Columnar File Benchmarks (DuckDB)",
+            None,
+            _columnar_benchmarks,
+        ))
+    if options["matview_enabled"] and db_name == options["benchmark_source_db"]:
+        timed_metrics.append((
+            "Materialized View Benchmarks",
+            None,
+            _matview_benchmarks,
+        ))
+    if options["capture_plans"]:
+        timed_metrics.append((
+            "Query Plan Capture (EXPLAIN ANALYZE)",
+            "query_plans",
+            lambda: metrics_plans.capture_query_plans(
+                engine, db_name, schema_name, queries_dir
+            ),
+        ))
+    if options["run_sweeps"]:
+        timed_metrics.append((
+            "Parameter Sweeps (Selectivity Curves)",
+            "selectivity_sweeps",
+            lambda: metrics_sweeps.run_parameter_sweeps(
+                engine,
+                db_name,
+                schema_name,
+                queries_dir,
+                trials=options["trials"],
+                warmup_runs=options["warmup_runs"],
+            ),
+        ))
+    if options["index_experiments"]:
+        timed_metrics.append((
+            "Index Experiments (scratch copy)",
+            "index_experiments",
+            lambda: metrics_indexes.run_index_experiments(
+                engine,
+                db_name,
+                schema_name,
+                queries_dir,
+                root_db=options["db_config"]["root_db"],
+                trials=options["trials"],
+                warmup_runs=options["warmup_runs"],
+            ),
+        ))
+    if options["load_test_enabled"]:
+        timed_metrics.append((
+            "Concurrent Load Test",
+            "load_test",
+            lambda: metrics_load.run_load_test(
+                engine,
+                db_name,
+                schema_name,
+                queries_dir,
+                concurrency_levels=options["load_concurrency_levels"],
+                duration_s=options["load_duration_s"],
+                requests_per_client=options["load_requests_per_client"],
+            ),
+        ))
+
+    # --- Execute Profiling Modules ---
+
+    try:
+        with ThreadPoolExecutor(
+            max_workers=options["metric_workers"], thread_name_prefix=db_name
+        ) as executor:
+            outcomes = list(
+                executor.map(
+                    lambda metric: run_metric(db_name, *metric, output_dir),
+                    catalog_metrics,
+                )
+            )
+        outcomes += [
+            run_metric(db_name, *metric, output_dir) for metric in timed_metrics
+        ]
+    finally:
+        engine.dispose()
+
+    all_metrics = catalog_metrics + timed_metrics
+    summary["failed"] = [
+        label for (label, _, _), ok in zip(all_metrics, outcomes, strict=True) if not ok
+    ]
+    summary["status"] = "failed metrics" if summary["failed"] else "ok"
+    summary["seconds"] = round(time.monotonic() - start_time, 2)
+    summary["cpu_seconds"] = round(time.process_time() - start_cpu, 2)
+    logging.info("--- Finished processing %s ---", db_name)
+    return summary
+
+
+def log_timing_summary(summaries: List[Dict[str, Any]], wall_seconds: float) -> None:
+    """
+    Logs each database's time and the run's wall clock vs summed CPU time.
+
+    CPU time is that of the profiling client (all its threads); the work
+    done by the PostgreSQL server is not included.
+    """
+    logging.info("--- Timing summary ---")
+    for summary in sorted(summaries, key=lambda s: s["seconds"], reverse=True):
+        logging.info(
+            "  %-36s %-14s %8.2fs wall %8.2fs CPU%s",
+            summary["database"],
+            summary["status"],
+            summary["seconds"],
+            summary["cpu_seconds"],
+            f"  (failed: {', '.join(summary['failed'])})" if summary["failed"] else "",
+        )
+    database_seconds = sum(summary["seconds"] for summary in summaries)
+    logging.info(
+        "  Wall clock %.2fs for %.2fs of database time (%.1fx) and %.2fs of "
+        "client CPU.",
+        wall_seconds,
+        database_seconds,
+        database_seconds / wall_seconds if wall_seconds > 0 else 0,
+        sum(summary["cpu_seconds"] for summary in summaries),
+    )
+
+
 # --- Main Orchestrator ---
 
 
@@ -149,7 +550,8 @@ def main() -> None:
 
     # Assume log directory is relative to script location
     log_dir = Path(__file__).parent
-    setup_logging(log_dir)
+    parallel_logs = args.workers > 1 or args.metric_workers > 1
+    setup_logging(log_dir, parallel=parallel_logs)
 
     logging.info("--- Starting Database Profiling Pipeline ---")
 
@@ -171,146 +573,204 @@ def main() -> None:
         ]
         all_dbs_to_profile = legacy_dbs + benchmark_dbs
 
+        # Synthetically scaled copies from 05_create_scaled_dbs.py (optional)
+        if config.getboolean("scaling", "enabled", fallback=False):
+            scaling_sources = [
+                db.strip()
+                for db in config.get(
+                    "scaling",
+                    "source_dbs",
+                    fallback=",".join(
+                        [config.get("databases", "benchmark_source_db")]
+                        + benchmark_dbs
+                    ),
+                ).split(",")
+                if db.strip()
+            ]
+            scale_factors = metrics_performance.parse_scale_factors(
+                config.get("scaling", "scale_factors", fallback="")
+            )
+            all_dbs_to_profile += [
+                f"{db}_x{factor}" for db in scaling_sources for factor in scale_factors
+            ]
+
         # Define paths relative to the project structure
         project_root = Path(__file__).parent.parent
         output_dir = project_root / OUTPUT_METRICS_DIR
         sql_queries_dir = project_root / config.get("paths", "sql_queries_dir")
 
-    except (configparser.NoSectionError, configparser.NoOptionError) as e:
-        logging.critical(
-            "Config file is missing a required section or option: %s",
-            e,
+        # Benchmark repetition settings (optional section)
+        benchmark_trials = config.getint(
+            "benchmarks", "trials", fallback=metrics_performance.DEFAULT_TRIALS
         )
-        sys.exit(1)
-
-    for i, db_name in enumerate(all_dbs_to_profile, 1):
-        logging.info("=" * 80)
-        logging.info(
-            "Processing Database %s/%s: %s",
-            i,
-            len(all_dbs_to_profile),
-            db_name,
+        benchmark_warmup_runs = config.getint(
+            "benchmarks",
+            "warmup_runs",
+            fallback=metrics_performance.DEFAULT_WARMUP_RUNS,
         )
-        logging.info("=" * 80)
-
-        engine = get_sqlalchemy_engine(db_config_root, db_name)
-        if not engine:
-            logging.error("Skipping database '%s' due to connection failure.", db_name)
-            continue
-
-        # Determine schema name (legacy dbs have matching schema, benchmarks use public)
-        schema_name = db_name if db_name in legacy_dbs else "public"
-        logging.info(
-            "Target schema for '%s' is '%s'.",
-            db_name,
-            schema_name,
+        capture_plans = config.getboolean(
+            "benchmarks", "capture_plans", fallback=False
         )
+        run_sweeps = config.getboolean("benchmarks", "run_sweeps", fallback=False)
+        statement_stats = config.getboolean(
+            "benchmarks", "statement_stats", fallback=False
+        )
+        index_experiments = config.getboolean(
+            "benchmarks", "index_experiments", fallback=False
+        )
+        benchmark_cache_modes = [
+            mode.strip()
+            for mode in config.get(
+                "benchmarks", "cache_modes", fallback=CACHE_MODE_UNMANAGED
+            ).split(",")
+            if mode.strip()
+        ]
+        cold_cache_hook = (
+            config.get("benchmarks", "cold_cache_hook", fallback="").strip() or None
+        )
+        benchmark_fetch_modes = [
+            mode.strip()
+            for mode in config.get(
+                "benchmarks", "fetch_modes", fallback=FETCH_MODE_EXECUTE
+            ).split(",")
+            if mode.strip()
+        ]
 
-        # --- Execute Profiling Modules ---
-
-        try:
-            logging.info("--> Running: Basic DB Metrics")
-            basic_metrics = metrics_basic.get_basic_db_metrics(engine)
-            save_results(basic_metrics, db_name, "basic_metrics", output_dir)
-        except Exception as e:
-            logging.error(
-                "CRITICAL ERROR in Basic DB Metrics for '%s': %s",
-                db_name,
-                e,
-                exc_info=True,
-            )
-
-        try:
-            logging.info("--> Running: Schema Object Counts")
-            schema_counts = metrics_basic.get_schema_object_counts(engine, schema_name)
-            save_results(schema_counts, db_name, "schema_counts", output_dir)
-        except Exception as e:
-            logging.error(
-                "CRITICAL ERROR in Schema Object Counts for '%s': %s",
-                db_name,
-                e,
-                exc_info=True,
-            )
-
-        try:
-            logging.info("--> Running: Table Level Metrics")
-            table_metrics = metrics_schema.get_table_level_metrics(engine, schema_name)
-            save_results(table_metrics, db_name, "table_metrics", output_dir)
-        except Exception as e:
-            logging.error(
-                "CRITICAL ERROR in Table Level Metrics for '%s': %s",
-                db_name,
-                e,
-                exc_info=True,
-            )
+        # Columnar-file target: Parquet exports written by 01 (path relative
+        # to src/, as in [benchmark_build])
+        columnar_enabled = config.getboolean("benchmarks", "columnar", fallback=False)
+        parquet_dir = Path(__file__).parent / config.get(
+            "benchmark_build", "parquet_dir", fallback="../outputs/parquet/"
+        )
 
-        try:
-            logging.info("--> Running: Column Structural Metrics")
-            column_structure = metrics_schema.get_column_structural_metrics(
-                engine, schema_name
-            )
-            save_results(column_structure, db_name, "column_structure", output_dir)
-        except Exception as e:
-            logging.error(
-                "CRITICAL ERROR in Column Structural Metrics for '%s': %s",
-                db_name,
-                e,
-                exc_info=True,
-            )
+        # Materialized-view variants built inside the source database by 01
+        matview_enabled = config.getboolean(
+            "benchmarks", "materialized_views", fallback=False
+        )
+        benchmark_source_db = config.get(
+            "databases", "benchmark_source_db", fallback=""
+        )
 
-        try:
-            logging.info("--> Running: Column Data Profiles (pg_stats)")
-            column_profiles = metrics_profile.get_all_column_profiles(
-                engine, schema_name
-            )
-            save_results(column_profiles, db_name, "column_profiles", output_dir)
-        except Exception as e:
-            logging.error(
-                "CRITICAL ERROR in Column Data Profiles for '%s': %s",
-                db_name,
-                e,
-                exc_info=True,
-            )
+        # Concurrent load-test settings (optional section)
+        load_test_enabled = config.getboolean("load_test", "enabled", fallback=False)
+        load_concurrency_levels = [
+            int(level)
+            for level in config.get(
+                "load_test", "concurrency_levels", fallback=""
+            ).split(",")
+            if level.strip()
+        ] or metrics_load.DEFAULT_CONCURRENCY_LEVELS
+        load_duration_s = config.getfloat(
+            "load_test",
+            "duration_seconds",
+            fallback=metrics_load.DEFAULT_DURATION_SECONDS,
+        )
+        load_requests_raw = config.get(
+            "load_test", "requests_per_client", fallback=""
+        ).strip()
+        load_requests_per_client = int(load_requests_raw) if load_requests_raw else None
+
+        # Persistent benchmark history (optional section, enabled by default)
+        history_enabled = config.getboolean("history", "enabled", fallback=True)
+        history_path = project_root / config.get(
+            "history", "path", fallback=benchmark_history.DEFAULT_HISTORY_PATH
+        )
 
-        try:
-            # Interoperability metrics only make sense for schemas with multiple tables
-            if schema_name != "public":
-                logging.info("--> Running: Interoperability Metrics")
-                interop_metrics = metrics_interop.calculate_interoperability_metrics(
-                    engine, schema_name
-                )
-                save_results(interop_metrics, db_name, "interop_metrics", output_dir)
-            else:
-                logging.info(
-                    "--> Skipping: Interoperability Metrics (not applicable to single-table schema)."
-                )
-        except Exception as e:
-            logging.error(
-                "CRITICAL ERROR in Interoperability Metrics for '%s': %s",
-                db_name,
-                e,
-                exc_info=True,
-            )
+    except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
+        logging.critical(
+            "Config file is missing a required section or option: %s",
+            e,
+        )
+        sys.exit(1)
 
+    run_id = benchmark_history.new_run_id()
+    if history_enabled:
         try:
-            logging.info("--> Running: Performance Benchmarks")
-            perf_benchmarks = metrics_performance.run_performance_benchmarks(
-                engine,
-                db_name,
-                schema_name,
-                sql_queries_dir / "canonical_queries",  # Point to queries directory
+            benchmark_history.record_run(
+                history_path,
+                run_id,
+                {
+                    "trials": benchmark_trials,
+                    "warmup_runs": benchmark_warmup_runs,
+                    "cache_modes": benchmark_cache_modes,
+                    "fetch_modes": benchmark_fetch_modes,
+                },
             )
-            save_results(perf_benchmarks, db_name, "performance_benchmarks", output_dir)
+            logging.info("Recording benchmark history as run '%s'.", run_id)
         except Exception as e:
-            logging.error(
-                "CRITICAL ERROR in Performance Benchmarks for '%s': %s",
-                db_name,
-                e,
-                exc_info=True,
-            )
-
-        logging.info("--- Finished processing %s ---", db_name)
+            logging.error("Could not open benchmark history store: %s", e)
+            history_enabled = False
+
+    profile_options = {
+        "db_config": db_config_root,
+        "legacy_dbs": legacy_dbs,
+        "benchmark_dbs": benchmark_dbs,
+        "total_dbs": len(all_dbs_to_profile),
+        "output_dir": output_dir,
+        "sql_queries_dir": sql_queries_dir,
+        "trials": benchmark_trials,
+        "warmup_runs": benchmark_warmup_runs,
+        "capture_plans": capture_plans,
+        "run_sweeps": run_sweeps,
+        "statement_stats": statement_stats,
+        "index_experiments": index_experiments,
+        "cache_modes": benchmark_cache_modes,
+        "cold_cache_hook": cold_cache_hook,
+        "fetch_modes": benchmark_fetch_modes,
+        "columnar_enabled": columnar_enabled,
+        "parquet_dir": parquet_dir,
+        "matview_enabled": matview_enabled,
+        "benchmark_source_db": benchmark_source_db,
+        "load_test_enabled": load_test_enabled,
+        "load_concurrency_levels": load_concurrency_levels,
+        "load_duration_s": load_duration_s,
+        "load_requests_per_client": load_requests_per_client,
+        "history_enabled": history_enabled,
+        "history_path": history_path,
+        "run_id": run_id,
+        "metric_workers": max(1, args.metric_workers),
+        "parallel_logs": parallel_logs,
+    }
+
+    start_time = time.monotonic()
+    if args.workers > 1:
+        logging.info("Profiling up to %s databases concurrently.", args.workers)
+        logging.warning(
+            "Concurrently profiled databases share the server, so their "
+            "benchmark latencies affect each other; use --workers 1 for "
+            "latency comparisons."
+        )
+        summaries = []
+        with ProcessPoolExecutor(
+            max_workers=args.workers,
+            initializer=setup_logging,
+            initargs=(log_dir, True, True),
+        ) as executor:
+            futures = {
+                executor.submit(profile_database, db_name, profile_options, i): db_name
+                for i, db_name in enumerate(all_dbs_to_profile, 1)
+            }
+            for future in as_completed(futures):
+                try:
+                    summaries.append(future.result())
+                except Exception as e:
+                    logging.error(
+                        "Profiling worker for '%s' failed: %s", futures[future], e
+                    )
+                    summaries.append({
+                        "database": futures[future],
+                        "status": "failed",
+                        "failed": [],
+                        "seconds": 0.0,
+                        "cpu_seconds": 0.0,
+                    })
+    else:
+        summaries = [
+            profile_database(db_name, profile_options, i)
+            for i, db_name in enumerate(all_dbs_to_profile, 1)
+        ]
 
+    log_timing_summary(summaries, time.monotonic() - start_time)
     logging.info("=" * 80)
     logging.info("--- Database Profiling Pipeline Finished ---")
 
@@ -15,6 +15,20 @@ not connect to any databases. Instead, it performs the following steps:
        performance report with calculated efficiency and improvement factors.
     d) `report_performance_pivot_efficiency.csv`: A pivot table for at-a-glance
        comparison of schema efficiency.
+    e) `report_load_test_summary.csv`: Throughput and tail latency per
+       concurrency level, when load-test results are present.
+    f) `report_selectivity_curves.csv`: Latency-vs-selectivity points from
+       the parameter sweeps, when present.
+    g) `report_scaling_summary.csv`: Median latency per query at each
+       synthetic scale factor, when scaled databases were profiled.
+    h) `report_regressions.csv`: The newest run in the benchmark history
+       compared per query against a window of earlier runs.
+    i) `report_index_experiments.csv`: Latency delta and size of each
+       candidate index, when index experiments were run.
+    j) `report_storage_tiers.csv`: Median latency per query for the
+       normalized and wide Postgres databases, the materialized views in
+       the source database and the columnar Parquet files side by side,
+       when materialized-view or columnar benchmarks were run.
 """
 
 import argparse
@@ -25,14 +39,23 @@ import sys
 from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Tuple
 
+import numpy as np
 import pandas as pd
+from profiling_modules import benchmark_history
+from profiling_modules.metrics_performance import split_scale_factor
+from profiling_modules.timing import bootstrap_median_ratio_ci, parse_latency_samples
 
 # --- Constants ---
 LOG_FILE_NAME = "04_run_comparison.log"
 INPUT_METRICS_DIR = "outputs/metrics"
 OUTPUT_REPORTS_DIR = "outputs/reports"
+ROW_STORE_ENGINE = "postgresql"
+# Materialized-view benchmark results are saved as <schema>_matview.
+MATVIEW_DB_SUFFIX = "_matview"
+# Storage tiers compared side by side, in report column order.
+STORAGE_TIERS = ["row_normalized", "row_wide", "row_matview", "columnar_file"]
 
 
 # --- Setup Functions ---
@@ -101,6 +124,10 @@ def load_all_metrics(input_dir: Path) -> Dict[str, Dict[str, Any]]:
         "column_profiles",
         "interop_metrics",
         "performance_benchmarks",
+        "query_plans",
+        "load_test",
+        "selectivity_sweeps",
+        "index_experiments",
     ]
     metric_suffixes.sort(key=len, reverse=True)
 
@@ -178,11 +205,25 @@ def calculate_summary_metrics(db_name: str, db_data: Dict[str, Any]) -> Dict[str
     return summary
 
 
+def add_scale_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Adds ``base_database`` and ``scale_factor`` columns from database names."""
+    parts = df["database"].map(split_scale_factor)
+    df["scale_factor"] = parts.str[1].astype(int)
+    df["base_database"] = parts.str[0]
+    return df
+
+
 def calculate_comparative_performance_metrics(
     all_data: Dict[str, Dict[str, Any]],
 ) -> pd.DataFrame:
     """
     Calculates advanced, comparative performance metrics using the new architecture.
+
+    When the benchmark files carry multi-trial distributions, the comparison
+    is based on the median latency, a p95 tail factor is added, and a
+    bootstrap confidence interval of the efficiency factor is computed from
+    the raw samples. Files produced by single-trial runs fall back to the
+    plain ``latency_ms`` column.
     """
     logging.info("Calculating advanced comparative performance metrics...")
     perf_data = []
@@ -204,31 +245,90 @@ def calculate_comparative_performance_metrics(
         return pd.DataFrame()
 
     df["latency_ms"] = pd.to_numeric(df["latency_ms"], errors="coerce")
+    if "latency_median_ms" not in df.columns:
+        df["latency_median_ms"] = df["latency_ms"]
+    if "latency_p95_ms" not in df.columns:
+        df["latency_p95_ms"] = df["latency_ms"]
+    if "latency_samples_ms" not in df.columns:
+        df["latency_samples_ms"] = None
+    for col in ["latency_median_ms", "latency_p95_ms"]:
+        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(df["latency_ms"])
+    if "cache_state" not in df.columns:
+        df["cache_state"] = "unmanaged"
+    df["cache_state"] = df["cache_state"].fillna("unmanaged")
+    if "fetch_mode" not in df.columns:
+        df["fetch_mode"] = "execute"
+    df["fetch_mode"] = df["fetch_mode"].fillna("execute")
+    if "storage_engine" not in df.columns:
+        df["storage_engine"] = ROW_STORE_ENGINE
+    df["storage_engine"] = df["storage_engine"].fillna(ROW_STORE_ENGINE)
+    df = add_scale_columns(df)
     df_success = df[df["status"] == "Success"].copy()
 
+    # Columnar-file and materialized-view runs are compared against the
+    # baseline but never set it.
+    row_store = df_success["storage_engine"] == ROW_STORE_ENGINE
+    matview = df_success["database"].str.endswith(MATVIEW_DB_SUFFIX)
     denormalized_dbs = [
-        db for db in df_success["database"].unique() if "benchmark" in db
+        db
+        for db in df_success.loc[row_store & ~matview, "database"].unique()
+        if "benchmark" in db
     ]
+    df_success["storage_tier"] = np.select(
+        [
+            ~row_store,
+            matview,
+            df_success["database"].isin(denormalized_dbs),
+        ],
+        ["columnar_file", "row_matview", "row_wide"],
+        default="row_normalized",
+    )
     if not denormalized_dbs:
         logging.error("No benchmark/denormalized databases found for comparison base.")
         return df
 
-    baseline_latency = (
-        df_success[df_success["database"].isin(denormalized_dbs)]
-        .groupby("query_id")["latency_ms"]
-        .min()
-        .rename("baseline_latency_ms")
+    # The baseline for each query (per cache state, fetch mode and scale
+    # factor) is the denormalized run with the lowest median latency; its p95
+    # and raw samples travel with it. Measurements are only compared within
+    # the same cache state, materialization mode and data scale.
+    baseline_keys = ["query_id", "cache_state", "fetch_mode", "scale_factor"]
+    df_denorm = df_success[df_success["database"].isin(denormalized_dbs)]
+    baseline_rows = df_denorm.loc[
+        df_denorm.groupby(baseline_keys)["latency_median_ms"].idxmin(),
+        baseline_keys
+        + ["latency_median_ms", "latency_p95_ms", "latency_samples_ms"],
+    ].rename(
+        columns={
+            "latency_median_ms": "baseline_latency_ms",
+            "latency_p95_ms": "baseline_latency_p95_ms",
+            "latency_samples_ms": "baseline_latency_samples_ms",
+        }
     )
 
-    df_success = pd.merge(df_success, baseline_latency, on="query_id", how="left")
+    df_success = pd.merge(df_success, baseline_rows, on=baseline_keys, how="left")
 
     df_success["schema_efficiency_factor"] = (
-        df_success["latency_ms"] / df_success["baseline_latency_ms"]
+        df_success["latency_median_ms"] / df_success["baseline_latency_ms"]
+    ).round(2)
+    df_success["schema_efficiency_factor_p95"] = (
+        df_success["latency_p95_ms"] / df_success["baseline_latency_p95_ms"]
     ).round(2)
+
+    ci_bounds = [
+        bootstrap_median_ratio_ci(
+            parse_latency_samples(row["latency_samples_ms"]),
+            parse_latency_samples(row["baseline_latency_samples_ms"]),
+        )
+        for _, row in df_success.iterrows()
+    ]
+    df_success["efficiency_factor_ci_low"] = [low for low, _ in ci_bounds]
+    df_success["efficiency_factor_ci_high"] = [high for _, high in ci_bounds]
+    df_success = df_success.drop(columns=["baseline_latency_samples_ms"])
+
     df_success["performance_improvement_factor"] = (
         (
-            (df_success["latency_ms"] - df_success["baseline_latency_ms"])
-            / df_success["latency_ms"]
+            (df_success["latency_median_ms"] - df_success["baseline_latency_ms"])
+            / df_success["latency_median_ms"]
         )
         * 100
     ).round(2)
@@ -240,8 +340,184 @@ def calculate_comparative_performance_metrics(
     return df_success
 
 
+def summarize_storage_tiers(perf_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Puts the latencies of each storage tier side by side per query.
+
+    Each cell is the median latency of the fastest database in that tier
+    (e.g. the best of the normalized legacy databases), compared within the
+    same cache state, fetch mode and scale factor.
+    """
+    if perf_df.empty or "storage_tier" not in perf_df.columns:
+        return pd.DataFrame()
+    if not {"row_matview", "columnar_file"} & set(perf_df["storage_tier"]):
+        return pd.DataFrame()
+
+    tiers = perf_df.pivot_table(
+        index=["query_id", "cache_state", "fetch_mode", "scale_factor"],
+        columns="storage_tier",
+        values="latency_median_ms",
+        aggfunc="min",
+    )
+    tiers = tiers[[tier for tier in STORAGE_TIERS if tier in tiers.columns]]
+    if {"row_wide", "columnar_file"} <= set(tiers.columns):
+        tiers["columnar_speedup_vs_wide"] = tiers["row_wide"] / tiers["columnar_file"]
+    if {"row_wide", "row_matview"} <= set(tiers.columns):
+        tiers["matview_speedup_vs_wide"] = tiers["row_wide"] / tiers["row_matview"]
+    return tiers.round(2).reset_index()
+
+
+def attach_query_plan_metrics(
+    perf_df: pd.DataFrame, all_data: Dict[str, Dict[str, Any]]
+) -> pd.DataFrame:
+    """
+    Joins the extracted EXPLAIN ANALYZE columns onto the performance summary.
+
+    The full JSON plan stays in the per-database ``query_plans`` files; only
+    the scalar columns are carried into the comparison report.
+    """
+    plan_frames = [
+        db_metrics["query_plans"].assign(database=db_name)
+        for db_name, db_metrics in all_data.items()
+        if "query_plans" in db_metrics
+    ]
+    if perf_df.empty or not plan_frames:
+        return perf_df
+
+    plan_columns = [
+        "database",
+        "query_id",
+        "planning_time_ms",
+        "execution_time_ms",
+        "shared_hit_blocks",
+        "shared_read_blocks",
+        "temp_read_blocks",
+        "temp_written_blocks",
+        "seq_scan_count",
+        "disk_sort_count",
+        "slowest_node_type",
+        "slowest_node_relation",
+        "slowest_node_time_ms",
+    ]
+    plans_df = pd.concat(plan_frames, ignore_index=True)
+    plans_df = plans_df[plans_df["status"] == "Success"]
+    plans_df = plans_df[[c for c in plan_columns if c in plans_df.columns]]
+    plans_df["query_id"] = plans_df["query_id"].astype(str)
+
+    perf_df = perf_df.copy()
+    perf_df["query_id"] = perf_df["query_id"].astype(str)
+    logging.info("Attaching query plan metrics to performance summary.")
+    return pd.merge(perf_df, plans_df, on=["database", "query_id"], how="left")
+
+
+def attribute_server_time(perf_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Splits median client latency into planning, execution and client overhead.
+
+    Uses the pg_stat_statements counters (``pgss_*``) harvested during the
+    benchmark pass. The overhead is whatever the client measured beyond the
+    server's mean plan + execution time (driver, network, materialization).
+    """
+    if perf_df.empty or "pgss_mean_exec_time" not in perf_df.columns:
+        return perf_df
+
+    plan_ms = pd.to_numeric(perf_df["pgss_mean_plan_time"], errors="coerce")
+    exec_ms = pd.to_numeric(perf_df["pgss_mean_exec_time"], errors="coerce")
+    hits = pd.to_numeric(perf_df["pgss_shared_blks_hit"], errors="coerce")
+    reads = pd.to_numeric(perf_df["pgss_shared_blks_read"], errors="coerce")
+
+    perf_df["server_plan_ms"] = plan_ms.round(3)
+    perf_df["server_exec_ms"] = exec_ms.round(3)
+    perf_df["client_overhead_ms"] = (
+        perf_df["latency_median_ms"] - plan_ms - exec_ms
+    ).round(3)
+    perf_df["buffer_read_ratio"] = (reads / (hits + reads)).round(4)
+    return perf_df
+
+
+def collect_index_experiments(all_data: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """Concatenates the per-database index experiments, best speedups first."""
+    frames = [
+        db_metrics["index_experiments"].assign(database=db_name)
+        for db_name, db_metrics in all_data.items()
+        if "index_experiments" in db_metrics
+    ]
+    if not frames:
+        return pd.DataFrame()
+    experiments = pd.concat(frames, ignore_index=True)
+    experiments = experiments[experiments["status"] == "Success"]
+    return experiments.sort_values(["database", "speedup"], ascending=[True, False])
+
+
+def collect_load_test_results(all_data: Dict[str, Dict[str, Any]]) -> pd.DataFrame:
+    """Concatenates the per-database concurrent load-test results."""
+    frames = [
+        db_metrics["load_test"].assign(database=db_name)
+        for db_name, db_metrics in all_data.items()
+        if "load_test" in db_metrics
+    ]
+    if not frames:
+        return pd.DataFrame()
+    load_df = pd.concat(frames, ignore_index=True)
+    return load_df[load_df["status"] == "Success"].copy()
+
+
+def calculate_selectivity_curves(
+    all_data: Dict[str, Dict[str, Any]],
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Builds latency-vs-selectivity curves from the parameter-sweep results.
+
+    Returns:
+        A tuple of (long-format curve points sorted by selectivity, one summary
+        row per database and query with the fitted slope in ms per percentage
+        point of selectivity).
+    """
+    frames = [
+        db_metrics["selectivity_sweeps"].assign(database=db_name)
+        for db_name, db_metrics in all_data.items()
+        if "selectivity_sweeps" in db_metrics
+    ]
+    if not frames:
+        return pd.DataFrame(), pd.DataFrame()
+
+    curves = pd.concat(frames, ignore_index=True)
+    curves = curves[curves["status"] == "Success"].dropna(
+        subset=["selectivity", "latency_median_ms"]
+    )
+    curves = curves.sort_values(["query_id", "database", "selectivity"])
+
+    summary_rows = []
+    for (query_id, db_name), group in curves.groupby(["query_id", "database"]):
+        slope = None
+        if group["selectivity"].nunique() > 1:
+            slope = np.polyfit(
+                group["selectivity"] * 100, group["latency_median_ms"], 1
+            )[0]
+        summary_rows.append(
+            {
+                "query_id": query_id,
+                "database": db_name,
+                "points": len(group),
+                "min_selectivity_pct": round(group["selectivity"].min() * 100, 3),
+                "max_selectivity_pct": round(group["selectivity"].max() * 100, 3),
+                "latency_at_min_ms": group["latency_median_ms"].iloc[0],
+                "latency_at_max_ms": group["latency_median_ms"].iloc[-1],
+                "ms_per_selectivity_pct": None if slope is None else round(slope, 4),
+            }
+        )
+    return curves, pd.DataFrame(summary_rows)
+
+
 def generate_markdown_report(
-    summary_df: pd.DataFrame, perf_summary_df: pd.DataFrame, output_path: Path
+    summary_df: pd.DataFrame,
+    perf_summary_df: pd.DataFrame,
+    output_path: Path,
+    load_df: pd.DataFrame | None = None,
+    selectivity_summary_df: pd.DataFrame | None = None,
+    regressions_df: pd.DataFrame | None = None,
+    index_df: pd.DataFrame | None = None,
+    tiers_df: pd.DataFrame | None = None,
 ) -> None:
     """Generates a rich, multi-section markdown report, now enhanced with new performance insights."""
     logging.info(
@@ -283,16 +559,173 @@ def generate_markdown_report(
         ).round(2)
         report_parts.append(pivot_efficiency.to_markdown())
 
-        report_parts.append("\n### Detailed Latency Breakdown (ms)")
+        if perf_summary_df["cache_state"].nunique() > 1:
+            report_parts.append("\n### Schema Efficiency Factor by Cache State")
+            report_parts.append(
+                "Cold runs start each trial from a fresh session with the query's "
+                "relations evicted; warm runs preload them first."
+            )
+            pivot_cache = perf_summary_df.pivot_table(
+                index="database",
+                columns="cache_state",
+                values="schema_efficiency_factor",
+                aggfunc="mean",
+            ).round(2)
+            report_parts.append(pivot_cache.to_markdown())
+
+        report_parts.append("\n### Detailed Latency Breakdown (median ms)")
         pivot_latency = perf_summary_df.pivot_table(
-            index=["category", "query_id"], columns="database", values="latency_ms"
+            index=["category", "query_id", "cache_state", "fetch_mode"],
+            columns="database",
+            values="latency_median_ms",
         ).round(2)
         report_parts.append(pivot_latency.to_markdown())
+
+        if "latency_per_row_us" in perf_summary_df.columns:
+            report_parts.append("\n### Materialization Cost (µs per returned row)")
+            report_parts.append(
+                "Median latency normalized by rows returned, per "
+                "result-materialization mode (execute only, server-side stream, "
+                "pandas DataFrame)."
+            )
+            pivot_per_row = perf_summary_df.pivot_table(
+                index=["query_id", "fetch_mode"],
+                columns="database",
+                values="latency_per_row_us",
+            ).round(3)
+            report_parts.append(pivot_per_row.to_markdown())
+
+        if "server_exec_ms" in perf_summary_df.columns:
+            report_parts.append(
+                "\n### Server-Side Time Attribution (pg_stat_statements)"
+            )
+            report_parts.append(
+                "Mean planning and execution time per call as recorded by the server, "
+                "the remaining client-side overhead of the median latency, and the "
+                "share of buffer accesses that had to be read from outside shared "
+                "buffers."
+            )
+            report_parts.append(
+                perf_summary_df.pivot_table(
+                    index=["database", "fetch_mode"],
+                    values=[
+                        "server_plan_ms",
+                        "server_exec_ms",
+                        "client_overhead_ms",
+                        "buffer_read_ratio",
+                    ],
+                    aggfunc="mean",
+                ).round(3).to_markdown()
+            )
+
+        report_parts.append("\n### Tail Latency Breakdown (p95 ms)")
+        pivot_p95 = perf_summary_df.pivot_table(
+            index=["category", "query_id", "cache_state", "fetch_mode"],
+            columns="database",
+            values="latency_p95_ms",
+        ).round(2)
+        report_parts.append(pivot_p95.to_markdown())
     else:
         report_parts.append(
             "No performance benchmark data was found or could be calculated."
         )
 
+    if (
+        not perf_summary_df.empty
+        and "scale_factor" in perf_summary_df.columns
+        and perf_summary_df["scale_factor"].nunique() > 1
+    ):
+        report_parts.append("\n### Latency vs. Data Scale (median ms)")
+        report_parts.append(
+            "Synthetically scaled copies replicate every SSN-keyed row with shifted "
+            "keys; scale factor 1 is the original data."
+        )
+        report_parts.append(
+            perf_summary_df.pivot_table(
+                index=["query_id", "base_database"],
+                columns="scale_factor",
+                values="latency_median_ms",
+                aggfunc="median",
+            ).round(2).to_markdown()
+        )
+
+    if tiers_df is not None and not tiers_df.empty:
+        report_parts.append("\n### Storage Tiers (median ms)")
+        report_parts.append(
+            "The canonical benchmark queries on the Postgres databases (fastest "
+            "normalized and fastest wide database), on the materialized views kept "
+            "inside the source database and on the Parquet export of the wide tables, "
+            "queried in-process with DuckDB. A speedup above 1 means that tier "
+            "answered faster than the wide Postgres table."
+        )
+        report_parts.append(tiers_df.to_markdown(index=False))
+
+    if load_df is not None and not load_df.empty:
+        report_parts.append("\n### Throughput Under Concurrency (QPS)")
+        report_parts.append(
+            "Queries per second for the canonical query mix at each number of "
+            "concurrent clients."
+        )
+        report_parts.append(
+            load_df.pivot_table(
+                index="database", columns="concurrency", values="qps"
+            ).round(2).to_markdown()
+        )
+        report_parts.append("\n### Tail Latency Under Concurrency (p99 ms)")
+        report_parts.append(
+            load_df.pivot_table(
+                index="database", columns="concurrency", values="latency_p99_ms"
+            ).round(2).to_markdown()
+        )
+
+    if selectivity_summary_df is not None and not selectivity_summary_df.empty:
+        report_parts.append("\n### Latency vs. Selectivity (Parameter Sweeps)")
+        report_parts.append(
+            "Each templated query was swept across parameter values drawn from the "
+            "data. The slope is the fitted change in median latency per percentage "
+            "point of rows matched."
+        )
+        report_parts.append(selectivity_summary_df.to_markdown(index=False))
+
+    if index_df is not None and not index_df.empty:
+        report_parts.append("\n### Index Experiments")
+        report_parts.append(
+            "Each candidate index (a join or filter column of the canonical queries "
+            "without an existing index) was built alone in a scratch copy of the "
+            "database; the affected queries were re-timed against the unindexed "
+            "baseline."
+        )
+        report_parts.append(
+            index_df[
+                [
+                    "database",
+                    "index_table",
+                    "index_column",
+                    "query_id",
+                    "baseline_latency_ms",
+                    "indexed_latency_ms",
+                    "latency_delta_ms",
+                    "speedup",
+                    "index_size_bytes",
+                ]
+            ].to_markdown(index=False)
+        )
+
+    if regressions_df is not None and not regressions_df.empty:
+        report_parts.append("\n### Regression Check Against Benchmark History")
+        flagged = regressions_df[regressions_df["regression"]]
+        report_parts.append(
+            f"The newest run (`{regressions_df['run_id'].iloc[0]}`) was compared with "
+            f"up to {int(regressions_df['baseline_runs'].max())} earlier runs. A query "
+            "is flagged when the 95% bootstrap interval of its median slowdown lies "
+            "above 1 and the slowdown is at least the configured minimum. "
+            f"**{len(flagged)} of {len(regressions_df)} measurements regressed.**"
+        )
+        if not flagged.empty:
+            report_parts.append(
+                flagged.drop(columns=["run_id", "regression"]).to_markdown(index=False)
+            )
+
     report_parts.append("\n## 3. Run Metadata")
     report_parts.append(f"- **Databases Processed**: {summary_df['Database'].tolist()}")
 
@@ -329,7 +762,20 @@ def main() -> None:
         input_dir = project_root / config.get("paths", "output_metrics")
         output_dir = project_root / config.get("paths", "output_reports")
         output_dir.mkdir(parents=True, exist_ok=True)
-    except (configparser.NoSectionError, configparser.NoOptionError) as e:
+        history_path = project_root / config.get(
+            "history", "path", fallback=benchmark_history.DEFAULT_HISTORY_PATH
+        )
+        history_baseline_runs = config.getint(
+            "history",
+            "baseline_runs",
+            fallback=benchmark_history.DEFAULT_BASELINE_RUNS,
+        )
+        history_min_slowdown = config.getfloat(
+            "history",
+            "min_slowdown",
+            fallback=benchmark_history.DEFAULT_MIN_SLOWDOWN,
+        )
+    except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
         logging.critical(
             "Configuration file is missing a required section or option: %s",
             e,
@@ -351,6 +797,8 @@ def main() -> None:
 
     # 3. Calculate NEW advanced performance metrics
     perf_summary_df = calculate_comparative_performance_metrics(all_loaded_data)
+    perf_summary_df = attach_query_plan_metrics(perf_summary_df, all_loaded_data)
+    perf_summary_df = attribute_server_time(perf_summary_df)
 
     # 4. Save ALL reports
     # ORIGINAL: machine-readable comparison matrix
@@ -373,7 +821,7 @@ def main() -> None:
         pivot_path = output_dir / "report_performance_pivot_efficiency.csv"
         perf_summary_df.pivot_table(
             index="database",
-            columns="category",
+            columns=["cache_state", "fetch_mode", "category"],
             values="schema_efficiency_factor",
             aggfunc="mean",
         ).round(2).to_csv(pivot_path)
@@ -382,9 +830,80 @@ def main() -> None:
             pivot_path,
         )
 
+    # NEW: latency per scale factor for the synthetically scaled databases
+    if (
+        not perf_summary_df.empty
+        and "scale_factor" in perf_summary_df.columns
+        and perf_summary_df["scale_factor"].nunique() > 1
+    ):
+        scaling_path = output_dir / "report_scaling_summary.csv"
+        perf_summary_df.pivot_table(
+            index=["base_database", "query_id", "cache_state", "fetch_mode"],
+            columns="scale_factor",
+            values="latency_median_ms",
+        ).round(2).to_csv(scaling_path)
+        logging.info("Saved latency-vs-scale summary to: %s", scaling_path)
+
     # ENHANCED ORIGINAL: human-readable markdown report
+    # NEW: concurrent load-test summary
+    load_df = collect_load_test_results(all_loaded_data)
+    if not load_df.empty:
+        load_path = output_dir / "report_load_test_summary.csv"
+        load_df.to_csv(load_path, index=False)
+        logging.info("Saved concurrent load-test summary to: %s", load_path)
+
+    # NEW: latency-vs-selectivity curves from parameter sweeps
+    curves_df, selectivity_summary_df = calculate_selectivity_curves(all_loaded_data)
+    if not curves_df.empty:
+        curves_path = output_dir / "report_selectivity_curves.csv"
+        curves_df.to_csv(curves_path, index=False)
+        logging.info("Saved latency-vs-selectivity curves to: %s", curves_path)
+
+    # NEW: regression check of the newest run against the benchmark history
+    regressions_df = benchmark_history.detect_regressions(
+        benchmark_history.load_history(history_path),
+        baseline_runs=history_baseline_runs,
+        min_slowdown=history_min_slowdown,
+    )
+    if not regressions_df.empty:
+        regressions_path = output_dir / "report_regressions.csv"
+        regressions_df.to_csv(regressions_path, index=False)
+        for _, row in regressions_df[regressions_df["regression"]].iterrows():
+            logging.warning(
+                "Regression: query %s on '%s' (%s/%s) is %.2fx slower than baseline.",
+                row["query_id"],
+                row["database"],
+                row["cache_state"],
+                row["fetch_mode"],
+                row["slowdown_ratio"],
+            )
+        logging.info("Saved regression check to: %s", regressions_path)
+
+    # NEW: candidate index experiments
+    index_df = collect_index_experiments(all_loaded_data)
+    if not index_df.empty:
+        index_path = output_dir / "report_index_experiments.csv"
+        index_df.to_csv(index_path, index=False)
+        logging.info("Saved index experiment summary to: %s", index_path)
+
+    # NEW: row-store vs columnar-file latencies
+    tiers_df = summarize_storage_tiers(perf_summary_df)
+    if not tiers_df.empty:
+        tiers_path = output_dir / "report_storage_tiers.csv"
+        tiers_df.to_csv(tiers_path, index=False)
+        logging.info("Saved storage-tier comparison to: %s", tiers_path)
+
     report_path = output_dir / "comparison_report.md"
-    generate_markdown_report(summary_df, perf_summary_df, report_path)
+    generate_markdown_report(
+        summary_df,
+        perf_summary_df,
+        report_path,
+        load_df,
+        selectivity_summary_df,
+        regressions_df,
+        index_df,
+        tiers_df,
+    )
 
     logging.info("--- Comparison & Aggregation Script Finished ---")
 
@@ -0,0 +1,449 @@
+# -*- coding: utf-8 -*-
+"""
+Creates synthetically scaled copies of the source and benchmark databases.
+
+The legacy TMP databases are small enough that most canonical queries finish
+in milliseconds, which says little about how each schema design scales. This
+script clones `TMP_DF9` and the wide-format benchmark databases at a set of
+scale factors (e.g. x1, x10, x100) so the profiling pipeline can measure
+latency against data size.
+
+For each (source database, scale factor) pair it:
+1.  Clones the source with `CREATE DATABASE <source>_x<k> TEMPLATE <source>`.
+2.  Finds every table carrying the key column (`SSN` by default) and orders
+    them so that foreign-key parents are filled before their children.
+3.  Appends k-1 replicas of every row, shifting the key by a power-of-ten
+    stride larger than the largest existing key (e.g. SSN 1234 becomes
+    101234, 201234, ...). Because every SSN-keyed table gets the same key
+    mapping, foreign keys between them stay valid, and because all other
+    columns are copied verbatim, value distributions are preserved exactly.
+4.  Runs `ANALYZE` so the planner sees the new row counts.
+
+The scaled databases are named `<source>_x<k>`. When `[scaling] enabled` is
+true, `02_run_profiling_pipeline.py` profiles them alongside the originals and
+`04_run_comparison.py` reports latency per scale factor.
+
+Usage:
+    From the src/ directory, run:
+    $ python 05_create_scaled_dbs.py --config config.ini [--rebuild]
+
+"""
+
+import argparse
+import configparser
+import logging
+import math
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import psycopg2
+from profiling_modules.metrics_performance import parse_scale_factors
+from psycopg2 import sql
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+# --- Constants ---
+LOG_FILE_NAME = "05_create_scaled_dbs.log"
+DEFAULT_KEY_COLUMN = "SSN"
+NUMERIC_KEY_TYPES = {"smallint", "integer", "bigint", "numeric", "real"}
+SCALED_DB_NAME_TEMPLATE = "{source}_x{factor}"
+
+
+# --- Logging Setup ---
+
+
+def setup_logging(log_path: Path) -> None:
+    """Configures logging to both console and a file."""
+    logging.basicConfig(
+        level=logging.INFO,
+        format="%(asctime)s [%(levelname)-7s] %(message)s",
+        handlers=[
+            logging.FileHandler(log_path, mode="w"),
+            logging.StreamHandler(sys.stdout),
+        ],
+    )
+
+
+# --- Argument Parsing ---
+
+
+def parse_arguments() -> argparse.Namespace:
+    """Parses command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="Create synthetically scaled copies of the benchmark databases."
+    )
+    parser.add_argument(
+        "--config",
+        type=str,
+        default="config.ini",
+        help="Path to the configuration file (default: config.ini)",
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Drop and recreate scaled databases that already exist.",
+    )
+    return parser.parse_args()
+
+
+# --- Database Operations ---
+
+
+def clone_database(
+    db_config: Dict, source_db: str, target_db: str, rebuild: bool
+) -> bool:
+    """
+    Clones a database using it as a template.
+
+    Note that PostgreSQL refuses to use a database as a template while other
+    sessions are connected to it.
+
+    Returns:
+        True if the clone was created or already exists (and should be
+        scaled), False on failure or if it exists and is left untouched.
+    """
+    conn = None
+    try:
+        conn = psycopg2.connect(**db_config)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1 FROM pg_database WHERE datname = %s", [target_db])
+            if cur.fetchone():
+                if not rebuild:
+                    logging.info(
+                        "Database '%s' already exists. Skipping (use --rebuild).",
+                        target_db,
+                    )
+                    return False
+                logging.info("Dropping existing database '%s'...", target_db)
+                cur.execute(
+                    sql.SQL("DROP DATABASE {}").format(sql.Identifier(target_db))
+                )
+
+            cur.execute(
+                sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                    sql.Identifier(target_db), sql.Identifier(source_db)
+                )
+            )
+        logging.info("Cloned '%s' into '%s'.", source_db, target_db)
+        return True
+    except psycopg2.Error as e:
+        logging.error("Failed to clone '%s' into '%s': %s", source_db, target_db, e)
+        return False
+    finally:
+        if conn:
+            conn.close()
+
+
+def drop_database(db_config: Dict, db_name: str) -> None:
+    """Drops a database if it exists; failures are logged."""
+    conn = None
+    try:
+        conn = psycopg2.connect(**db_config)
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute(
+                sql.SQL("DROP DATABASE IF EXISTS {}").format(sql.Identifier(db_name))
+            )
+        logging.info("Dropped database '%s'.", db_name)
+    except psycopg2.Error as e:
+        logging.error("Failed to drop database '%s': %s", db_name, e)
+    finally:
+        if conn:
+            conn.close()
+
+
+def get_keyed_tables(cur, key_column: str) -> List[Tuple[str, str, str]]:
+    """
+    Lists user tables that contain the key column.
+
+    Returns:
+        A list of ``(schema, table, key data type)`` tuples.
+    """
+    cur.execute(
+        """
+        SELECT c.table_schema, c.table_name, c.data_type
+        FROM information_schema.columns AS c
+        JOIN information_schema.tables AS t
+          ON t.table_schema = c.table_schema AND t.table_name = c.table_name
+        WHERE c.column_name = %s
+          AND t.table_type = 'BASE TABLE'
+          AND c.table_schema NOT IN ('pg_catalog', 'information_schema')
+        ORDER BY c.table_schema, c.table_name;
+        """,
+        [key_column],
+    )
+    return cur.fetchall()
+
+
+def order_by_foreign_keys(
+    cur, tables: List[Tuple[str, str, str]]
+) -> List[Tuple[str, str, str]]:
+    """
+    Orders tables so that referenced (parent) tables come before children.
+
+    Tables involved in a reference cycle are appended in their original
+    order; inserts into them may then fail on an immediate FK check, in which
+    case the whole scaling transaction is rolled back.
+    """
+    cur.execute(
+        """
+        SELECT child_ns.nspname, child.relname, parent_ns.nspname, parent.relname
+        FROM pg_constraint AS con
+        JOIN pg_class AS child ON child.oid = con.conrelid
+        JOIN pg_namespace AS child_ns ON child_ns.oid = child.relnamespace
+        JOIN pg_class AS parent ON parent.oid = con.confrelid
+        JOIN pg_namespace AS parent_ns ON parent_ns.oid = parent.relnamespace
+        WHERE con.contype = 'f' AND con.conrelid <> con.confrelid;
+        """
+    )
+    names = {(schema, table) for schema, table, _ in tables}
+    parents: Dict[Tuple[str, str], set] = defaultdict(set)
+    for child_s, child_t, parent_s, parent_t in cur.fetchall():
+        if (child_s, child_t) in names and (parent_s, parent_t) in names:
+            parents[(child_s, child_t)].add((parent_s, parent_t))
+
+    ordered: List[Tuple[str, str, str]] = []
+    placed: set = set()
+    remaining = list(tables)
+    while remaining:
+        ready = [t for t in remaining if parents[(t[0], t[1])] <= placed]
+        if not ready:
+            logging.warning(
+                "Foreign-key cycle among %s; keeping original order.",
+                [f"{s}.{t}" for s, t, _ in remaining],
+            )
+            ready = remaining
+        for table in ready:
+            ordered.append(table)
+            placed.add((table[0], table[1]))
+        remaining = [t for t in remaining if (t[0], t[1]) not in placed]
+    return ordered
+
+
+def get_insertable_columns(cur, schema: str, table: str) -> List[str]:
+    """Returns the columns of a table, excluding identity/serial/generated ones."""
+    cur.execute(
+        """
+        SELECT column_name
+        FROM information_schema.columns
+        WHERE table_schema = %s AND table_name = %s
+          AND is_identity = 'NO'
+          AND is_generated = 'NEVER'
+          AND COALESCE(column_default, '') NOT LIKE 'nextval(%%'
+        ORDER BY ordinal_position;
+        """,
+        [schema, table],
+    )
+    return [row[0] for row in cur.fetchall()]
+
+
+def compute_key_stride(cur, tables: List[Tuple[str, str, str]], key_column: str) -> int:
+    """
+    Returns a power of ten strictly larger than every numeric key value.
+
+    Shifting replicas by multiples of this stride keeps the original key
+    readable in the low digits and guarantees that no replica collides with
+    an original key.
+    """
+    max_key = 0
+    for schema, table, data_type in tables:
+        if data_type not in NUMERIC_KEY_TYPES:
+            continue
+        cur.execute(
+            sql.SQL("SELECT MAX({}) FROM {}.{}").format(
+                sql.Identifier(key_column),
+                sql.Identifier(schema),
+                sql.Identifier(table),
+            )
+        )
+        value = cur.fetchone()[0]
+        if value is not None:
+            max_key = max(max_key, int(value))
+    return 10 ** (int(math.log10(max_key)) + 1) if max_key > 0 else 10
+
+
+def replicate_table(
+    cur,
+    schema: str,
+    table: str,
+    key_column: str,
+    key_type: str,
+    replicas: int,
+    stride: int,
+) -> int:
+    """
+    Appends ``replicas`` shifted copies of every row in a table.
+
+    The source rows are read from the statement's snapshot, so rows inserted
+    by the statement itself are never replicated again.
+
+    Returns:
+        The number of rows inserted.
+    """
+    columns = get_insertable_columns(cur, schema, table)
+    if key_type in NUMERIC_KEY_TYPES:
+        key_expr = sql.SQL("src.{key} + rep.n * {stride}").format(
+            key=sql.Identifier(key_column), stride=sql.Literal(stride)
+        )
+    else:
+        key_expr = sql.SQL("src.{key} || '-r' || rep.n").format(
+            key=sql.Identifier(key_column)
+        )
+
+    select_exprs = [
+        key_expr if col == key_column else sql.SQL("src.{}").format(sql.Identifier(col))
+        for col in columns
+    ]
+    cur.execute(
+        sql.SQL(
+            "INSERT INTO {schema}.{table} ({columns}) "
+            "SELECT {exprs} FROM {schema}.{table} AS src "
+            "CROSS JOIN generate_series(1, {replicas}) AS rep(n)"
+        ).format(
+            schema=sql.Identifier(schema),
+            table=sql.Identifier(table),
+            columns=sql.SQL(", ").join(sql.Identifier(c) for c in columns),
+            exprs=sql.SQL(", ").join(select_exprs),
+            replicas=sql.Literal(replicas),
+        )
+    )
+    return cur.rowcount
+
+
+def scale_database(db_config: Dict, db_name: str, factor: int, key_column: str) -> bool:
+    """
+    Replicates every key-bearing table of a cloned database ``factor`` times.
+
+    All inserts run in one transaction, so a failure leaves the clone at x1
+    rather than partially scaled; the caller then drops it, since its name
+    still claims scale factor ``factor``.
+    """
+    target_config = db_config.copy()
+    target_config["dbname"] = db_name
+    replicas = factor - 1
+
+    conn = None
+    try:
+        conn = psycopg2.connect(**target_config)
+        with conn.cursor() as cur:
+            tables = order_by_foreign_keys(cur, get_keyed_tables(cur, key_column))
+            if not tables:
+                logging.error(
+                    "No tables with key column '%s' found in '%s'.",
+                    key_column,
+                    db_name,
+                )
+                return False
+            if replicas < 1:
+                logging.info("Scale factor 1: '%s' is a plain clone.", db_name)
+                return True
+
+            stride = compute_key_stride(cur, tables, key_column)
+            logging.info(
+                "Replicating %s tables in '%s' x%s (key stride %s)...",
+                len(tables),
+                db_name,
+                factor,
+                stride,
+            )
+            for schema, table, key_type in tables:
+                start_time = time.monotonic()
+                inserted = replicate_table(
+                    cur, schema, table, key_column, key_type, replicas, stride
+                )
+                logging.info(
+                    "  %s.%s: +%s rows in %.1fs",
+                    schema,
+                    table,
+                    inserted,
+                    time.monotonic() - start_time,
+                )
+        conn.commit()
+
+        # ANALYZE outside the load transaction so statistics reflect the result.
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            cur.execute("ANALYZE")
+    except psycopg2.Error as e:
+        logging.error("Failed to scale database '%s'. Error: %s", db_name, e)
+        return False
+    finally:
+        if conn:
+            conn.close()
+
+    logging.info("Successfully scaled '%s' to x%s.", db_name, factor)
+    return True
+
+
+# --- Main Orchestrator ---
+
+
+def main() -> None:
+    """Main function to orchestrate creation of the scaled databases."""
+    args = parse_arguments()
+    config_path = Path(args.config)
+
+    log_file_path = Path(__file__).parent / LOG_FILE_NAME
+    setup_logging(log_file_path)
+
+    if not config_path.is_file():
+        logging.critical("Configuration file not found: %s", config_path)
+        sys.exit(1)
+
+    config = configparser.ConfigParser()
+    config.read(config_path)
+
+    try:
+        db_config = {
+            "host": config.get("postgresql", "host"),
+            "port": config.get("postgresql", "port"),
+            "user": config.get("postgresql", "user"),
+            "password": config.get("postgresql", "password"),
+            "dbname": config.get("postgresql", "root_db"),
+        }
+        default_sources = [config.get("databases", "benchmark_source_db")] + [
+            db.strip() for db in config.get("databases", "benchmark_dbs").split(",")
+        ]
+        source_dbs = [
+            db.strip()
+            for db in config.get(
+                "scaling", "source_dbs", fallback=",".join(default_sources)
+            ).split(",")
+            if db.strip()
+        ]
+        scale_factors = parse_scale_factors(
+            config.get("scaling", "scale_factors", fallback="")
+        )
+        key_column = config.get("scaling", "key_column", fallback=DEFAULT_KEY_COLUMN)
+    except (configparser.NoSectionError, configparser.NoOptionError, ValueError) as e:
+        logging.critical("Config file is missing a required section or option: %s", e)
+        sys.exit(1)
+
+    logging.info("Starting scaled database creation process...")
+    summary = []
+    for source_db in source_dbs:
+        for factor in scale_factors:
+            target_db = SCALED_DB_NAME_TEMPLATE.format(source=source_db, factor=factor)
+            logging.info(
+                "--- Processing: %s (x%s of %s) ---", target_db, factor, source_db
+            )
+            start_time = time.monotonic()
+            if clone_database(db_config, source_db, target_db, args.rebuild):
+                ok = scale_database(db_config, target_db, factor, key_column)
+                if not ok:
+                    # A clone left at x1 would be profiled as scale factor k.
+                    drop_database(db_config, target_db)
+                summary.append((target_db, ok, time.monotonic() - start_time))
+
+    for target_db, ok, elapsed in summary:
+        logging.info(
+            "  %-45s %-8s %.1fs", target_db, "OK" if ok else "FAILED", elapsed
+        )
+    logging.info("--- Scaled database creation process complete. ---")
+
+
+if __name__ == "__main__":
+    main()
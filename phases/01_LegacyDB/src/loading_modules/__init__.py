@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""
+Loading Modules Package for Digital TMP.
+
+This package contains the reusable bulk-loading logic behind the database
+setup and build scripts (`00_setup_databases.py`, `01_create_benchmark_dbs.py`).
+The orchestrator scripts own configuration, logging and the order of work;
+the modules here move data between PostgreSQL databases as fast as the
+server allows.
+
+Package Structure:
+    - copy_loader.py: Streams a query result into a table via COPY FROM STDIN.
+    - compact_frame.py: Chunked DataFrame reads with nullable, compact dtypes.
+    - statement_stream.py: Resumable statement-by-statement dump execution.
+    - load_ledger.py: Per-database record of the dump each one was loaded from.
+    - insert_rewriter.py: Rewrites literal INSERT runs into COPY text rows.
+    - fast_load.py: Bulk-load settings, UNLOGGED tables and deferred DDL.
+    - template_clone.py: Frozen template databases and fast clones of them.
+    - direct_transfer.py: Server-to-server transfer (dblink or piped COPY).
+    - parallel_build.py: Concurrent key-range slices of one extraction query.
+    - table_schema.py: Target table DDL from a query's result descriptor.
+    - post_load.py: Type narrowing, keys, indexes, CLUSTER and VACUUM ANALYZE.
+    - build_ledger.py: Source fingerprints for skipped or in-place rebuilds.
+    - parquet_export.py: Partitioned, compressed Parquet export via Arrow.
+    - materialized_view.py: Wide-table variant as a view in the source database.
+
+"""
@@ -0,0 +1,361 @@
+# -*- coding: utf-8 -*-
+"""Fingerprint ledger for incremental rebuilds of the benchmark databases."""
+
+import hashlib
+import io
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from psycopg2 import sql
+from sqlalchemy.engine import Engine
+
+from .table_schema import get_table_columns, strip_statement
+
+# --- Constants ---
+DEFAULT_LEDGER_PATH = "../outputs/history/benchmark_build_ledger.json"
+DEFAULT_MAX_DELTA_FRACTION = 0.2
+# ``checksum`` hashes every row (and every key's rows) of the source tables;
+# ``markers`` only compares cheap catalog/statistics markers, so any change
+# forces a full rebuild.
+FINGERPRINT_CHECKSUM = "checksum"
+FINGERPRINT_MARKERS = "markers"
+
+ACTION_SKIP = "skip"
+ACTION_DELTA = "delta"
+ACTION_FULL = "full"
+
+# Order-independent digest of a set of rows: md5 of the sorted row md5s.
+ROWS_DIGEST_SQL = "md5(string_agg(md5(t::text), '' ORDER BY md5(t::text)))"
+
+BuildPlan = Tuple[str, str, List[str]]  # (action, reason, changed keys)
+
+
+def file_sha256(path: Path) -> str:
+    """Returns the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def options_sha256(options: Dict[str, Any]) -> str:
+    """Returns a stable digest of the build options that shape the table."""
+    return hashlib.sha256(
+        json.dumps(options, sort_keys=True, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+def _list_tables(cursor, schema: str, key_column: str) -> List[Tuple[str, bool]]:
+    """Lists the base tables of a schema and whether each has the key column."""
+    cursor.execute(
+        """
+        SELECT t.table_name,
+               EXISTS (
+                   SELECT 1 FROM information_schema.columns AS c
+                   WHERE c.table_schema = t.table_schema
+                     AND c.table_name = t.table_name
+                     AND c.column_name = %s
+               )
+        FROM information_schema.tables AS t
+        WHERE t.table_schema = %s AND t.table_type = 'BASE TABLE'
+        ORDER BY t.table_name
+        """,
+        [key_column, schema],
+    )
+    return cursor.fetchall()
+
+
+def _table_markers(cursor, schema: str, table: str) -> Dict[str, Any]:
+    """Reads the storage and write-activity markers of a table."""
+    cursor.execute(
+        """
+        SELECT c.relfilenode, s.n_live_tup, s.n_tup_ins, s.n_tup_upd, s.n_tup_del
+        FROM pg_class AS c
+        JOIN pg_namespace AS n ON n.oid = c.relnamespace
+        LEFT JOIN pg_stat_user_tables AS s ON s.relid = c.oid
+        WHERE n.nspname = %s AND c.relname = %s
+        """,
+        [schema, table],
+    )
+    names = ["relfilenode", "live_rows", "inserts", "updates", "deletes"]
+    row = cursor.fetchone()
+    if row is None:
+        # The table was dropped after the tables were listed.
+        return dict.fromkeys(names)
+    return dict(zip(names, row, strict=True))
+
+
+def fingerprint_source(
+    source_engine: Engine,
+    schema: str,
+    key_column: str,
+    mode: str = FINGERPRINT_CHECKSUM,
+) -> Dict[str, Any]:
+    """
+    Fingerprints the tables of the source schema.
+
+    In ``checksum`` mode, tables without the key column get a row count and
+    content digest. Tables with the key column contribute to a digest per
+    key value instead (rows with a NULL key get a table-level digest), so a
+    later comparison can tell exactly which keys changed. In ``markers``
+    mode, every table records ``relfilenode`` plus its live-row and
+    insert/update/delete counters; this costs no scans but cannot localize
+    changes.
+
+    Returns:
+        ``{"mode", "tables": {table: {...}}, "keys": {key: digest} | None}``
+    """
+    tables: Dict[str, Any] = {}
+    key_parts: Dict[str, List[str]] = {}
+    conn = source_engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            for table, has_key in _list_tables(cur, schema, key_column):
+                relation = sql.SQL("{}.{} AS t").format(
+                    sql.Identifier(schema), sql.Identifier(table)
+                )
+                if mode == FINGERPRINT_MARKERS:
+                    tables[table] = _table_markers(cur, schema, table)
+                    continue
+                key = sql.Identifier(key_column)
+                where = sql.SQL("")
+                if has_key:
+                    where = sql.SQL(" WHERE t.{} IS NULL").format(key)
+                cur.execute(
+                    sql.SQL("SELECT count(*), {} FROM {}{}").format(
+                        sql.SQL(ROWS_DIGEST_SQL), relation, where
+                    )
+                )
+                rows, digest = cur.fetchone()
+                if not has_key:
+                    tables[table] = {"rows": rows, "checksum": digest}
+                    continue
+                tables[table] = {"null_key_rows": rows, "null_key_checksum": digest}
+                cur.execute(
+                    sql.SQL(
+                        "SELECT t.{key}::text, {digest} FROM {relation} "
+                        "WHERE t.{key} IS NOT NULL GROUP BY t.{key}"
+                    ).format(
+                        key=key, digest=sql.SQL(ROWS_DIGEST_SQL), relation=relation
+                    )
+                )
+                for key_value, key_digest in cur.fetchall():
+                    key_parts.setdefault(key_value, []).append(f"{table}:{key_digest}")
+    finally:
+        conn.rollback()
+        conn.close()
+
+    keys = None
+    if mode != FINGERPRINT_MARKERS:
+        keys = {
+            key_value: hashlib.md5("|".join(sorted(parts)).encode("utf-8")).hexdigest()
+            for key_value, parts in key_parts.items()
+        }
+    return {"mode": mode, "tables": tables, "keys": keys}
+
+
+def load_ledger(ledger_path: Path) -> Dict[str, Any]:
+    """Reads the ledger; a missing or unreadable file yields an empty ledger."""
+    if not ledger_path.is_file():
+        return {}
+    try:
+        with open(ledger_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning("Ignoring unreadable build ledger '%s': %s", ledger_path, e)
+        return {}
+
+
+def save_ledger(ledger_path: Path, ledger: Dict[str, Any]) -> None:
+    """Writes the ledger atomically (write to a temp file, then rename)."""
+    ledger_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = ledger_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(ledger, f, indent=1, sort_keys=True)
+    tmp_path.replace(ledger_path)
+
+
+def invalidate_entries(
+    ledger_path: Path, ledger: Dict[str, Any], targets: Iterable[str]
+) -> None:
+    """
+    Removes the targets' entries and saves the ledger before they are built.
+
+    A build that fails or is interrupted can leave an empty or partial table
+    behind. Without an entry, the next run rebuilds such a target in full
+    instead of skipping or patching it. :func:`record_build` restores the
+    entry of each target whose build succeeded.
+    """
+    for target in targets:
+        ledger.pop(target, None)
+    save_ledger(ledger_path, ledger)
+
+
+def record_build(
+    ledger: Dict[str, Any],
+    target: str,
+    entries: Tuple[Optional[Dict[str, Any]], Dict[str, Any]],
+    report: Optional[Dict[str, Any]],
+) -> None:
+    """
+    Stores a target's entry once its build has succeeded.
+
+    Args:
+        ledger: The ledger to update.
+        target: The built target.
+        entries: (previous, current) entries of the target.
+        report: The build report, or None if the build failed, in which
+            case the target keeps no entry.
+    """
+    if report is None:
+        ledger.pop(target, None)
+        return
+    previous, current = entries
+    skipped = report["action"] == ACTION_SKIP and previous is not None
+    ledger[target] = previous if skipped else current
+
+
+def make_entry(
+    fingerprint: Dict[str, Any], sql_sha256: str, options: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Builds the ledger entry describing one target's inputs."""
+    return {
+        "built_at": datetime.now().isoformat(timespec="seconds"),
+        "sql_sha256": sql_sha256,
+        "options_sha256": options_sha256(options),
+        "source": fingerprint,
+    }
+
+
+def plan_build(
+    previous: Optional[Dict[str, Any]],
+    current: Dict[str, Any],
+    target_ready: bool,
+    max_delta_fraction: float = DEFAULT_MAX_DELTA_FRACTION,
+) -> BuildPlan:
+    """
+    Decides how to bring a target up to date with its inputs.
+
+    Returns:
+        ``("skip", reason, [])`` when nothing changed, ``("delta", reason,
+        keys)`` when only keyed rows changed and they are at most
+        ``max_delta_fraction`` of all keys, and ``("full", reason, [])``
+        otherwise.
+    """
+    if not target_ready:
+        return ACTION_FULL, "target table missing", []
+    if not previous:
+        return ACTION_FULL, "no ledger entry", []
+    if previous["sql_sha256"] != current["sql_sha256"]:
+        return ACTION_FULL, "SQL file changed", []
+    if previous["options_sha256"] != current["options_sha256"]:
+        return ACTION_FULL, "build options changed", []
+
+    before, after = previous["source"], current["source"]
+    if before["mode"] != after["mode"]:
+        return ACTION_FULL, "fingerprint mode changed", []
+    if before["tables"] != after["tables"]:
+        changed = sorted(
+            set(before["tables"]) ^ set(after["tables"])
+            | {
+                t
+                for t in set(before["tables"]) & set(after["tables"])
+                if before["tables"][t] != after["tables"][t]
+            }
+        )
+        return ACTION_FULL, f"source tables changed: {', '.join(changed)}", []
+    if before["keys"] == after["keys"]:
+        return ACTION_SKIP, "source and SQL unchanged", []
+
+    old_keys, new_keys = before["keys"] or {}, after["keys"] or {}
+    changed_keys = sorted(
+        k for k in set(old_keys) | set(new_keys) if old_keys.get(k) != new_keys.get(k)
+    )
+    if len(changed_keys) > max_delta_fraction * max(len(new_keys), 1):
+        return ACTION_FULL, f"{len(changed_keys)} keys changed (too many)", []
+    return ACTION_DELTA, f"{len(changed_keys)} keys changed", changed_keys
+
+
+def target_table_exists(target_engine: Engine, table_name: str) -> bool:
+    """Returns True if the target table exists in the target database."""
+    conn = target_engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT to_regclass(%s) IS NOT NULL", [table_name])
+            return cur.fetchone()[0]
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def apply_key_delta(
+    source_engine: Engine,
+    query_sql: str,
+    target_engine: Engine,
+    table_name: str,
+    key_column: str,
+    keys: List[str],
+) -> Dict[str, int]:
+    """
+    Replaces the target rows of the given keys with fresh query output.
+
+    The query is restricted to the changed keys and copied out of the source
+    (``COPY ... TO STDOUT``, held in memory: deltas are small by design);
+    the target then deletes those keys and copies the new rows in, in one
+    transaction, so readers never see a half-applied delta. Keys are passed
+    as text and cast to the target key column's type, so the key index is
+    used for the delete.
+
+    Returns:
+        ``{"deleted": n, "inserted": n}``
+    """
+    target_conn = target_engine.raw_connection()
+    source_conn = source_engine.raw_connection()
+    try:
+        with target_conn.cursor() as target_cur:
+            key_type = dict(get_table_columns(target_cur, table_name))[key_column]
+            key_list = sql.SQL("CAST(CAST({} AS text[]) AS {}[])").format(
+                sql.Literal(keys), sql.SQL(key_type)
+            )
+            key = sql.Identifier(key_column)
+
+            buffer = io.BytesIO()
+            with source_conn.cursor() as source_cur:
+                source_cur.copy_expert(
+                    sql.SQL(
+                        "COPY (SELECT * FROM ({query}) AS q "
+                        "WHERE q.{key} = ANY({keys})) TO STDOUT"
+                    ).format(
+                        query=sql.SQL(strip_statement(query_sql)),
+                        key=key,
+                        keys=key_list,
+                    ),
+                    buffer,
+                )
+            buffer.seek(0)
+
+            target_cur.execute(
+                sql.SQL("DELETE FROM {} WHERE {} = ANY({})").format(
+                    sql.Identifier(table_name), key, key_list
+                )
+            )
+            deleted = target_cur.rowcount
+            target_cur.copy_expert(
+                sql.SQL("COPY {} FROM STDIN").format(sql.Identifier(table_name)),
+                buffer,
+            )
+            inserted = target_cur.rowcount
+        target_conn.commit()
+    except Exception:
+        target_conn.rollback()
+        raise
+    finally:
+        source_conn.rollback()
+        source_conn.close()
+        target_conn.close()
+
+    return {"deleted": deleted, "inserted": inserted}
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Reads a query into a DataFrame with compact, nullable column dtypes."""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import pandas as pd
+from pandas.api.types import is_integer_dtype, is_string_dtype
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .copy_loader import DEFAULT_CHUNK_ROWS, peak_rss_mb
+
+# --- Constants ---
+# "numpy_nullable" keeps NULL-bearing integer codes as Int64 (not float64) and
+# text as pandas strings; "pyarrow" stores every column in Arrow arrays.
+DEFAULT_DTYPE_BACKEND = "numpy_nullable"
+DTYPE_BACKENDS = ("numpy_nullable", "pyarrow")
+# A text column becomes categorical when its distinct values are at most this
+# fraction of its non-null values in the first chunk.
+DEFAULT_CATEGORY_MAX_RATIO = 0.5
+# Nullable integer dtypes from narrowest to widest, with their value ranges.
+NULLABLE_INTEGER_TYPES = [
+    ("Int8", -(2**7), 2**7 - 1),
+    ("Int16", -(2**15), 2**15 - 1),
+    ("Int32", -(2**31), 2**31 - 1),
+]
+
+
+def choose_category_columns(chunk: pd.DataFrame, max_ratio: float) -> Set[str]:
+    """Returns the low-cardinality text columns of a sample chunk."""
+    columns = set()
+    for name in chunk.columns:
+        series = chunk[name]
+        if not is_string_dtype(series.dtype) or isinstance(
+            series.dtype, pd.CategoricalDtype
+        ):
+            continue
+        non_null = series.count()
+        if non_null and series.nunique() <= max_ratio * non_null:
+            columns.add(name)
+    return columns
+
+
+def downcast_integers(chunk: pd.DataFrame) -> pd.DataFrame:
+    """Narrows each integer column to the smallest nullable type that fits."""
+    for name in chunk.columns:
+        series = chunk[name]
+        if not is_integer_dtype(series.dtype) or series.isna().all():
+            continue
+        min_value, max_value = series.min(), series.max()
+        for type_name, low, high in NULLABLE_INTEGER_TYPES:
+            if low <= min_value and max_value <= high:
+                chunk[name] = series.astype(type_name)
+                break
+    return chunk
+
+
+def compact_chunk(chunk: pd.DataFrame, category_columns: Set[str]) -> pd.DataFrame:
+    """Applies categoricals and integer downcasting to one chunk."""
+    for name in category_columns:
+        chunk[name] = chunk[name].astype("category")
+    return downcast_integers(chunk)
+
+
+def concat_chunks(
+    chunks: List[pd.DataFrame], category_columns: Set[str]
+) -> pd.DataFrame:
+    """
+    Concatenates compacted chunks without losing their compact dtypes.
+
+    Each chunk's categoricals only know the values seen in that chunk, and
+    ``pd.concat`` falls back to object columns when categories differ, so
+    every chunk is first given the union of categories.
+    """
+    if not chunks:
+        return pd.DataFrame()
+    for name in category_columns:
+        categories = pd.api.types.union_categoricals([
+            chunk[name] for chunk in chunks
+        ]).categories
+        for chunk in chunks:
+            chunk[name] = chunk[name].cat.set_categories(categories)
+    return pd.concat(chunks, ignore_index=True)
+
+
+def frame_memory_bytes(df: pd.DataFrame) -> int:
+    """Returns the deep in-memory size of a DataFrame in bytes."""
+    return int(df.memory_usage(deep=True).sum())
+
+
+def read_compact_frame(
+    engine: Engine,
+    query_sql: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    dtype_backend: str = DEFAULT_DTYPE_BACKEND,
+    category_max_ratio: float = DEFAULT_CATEGORY_MAX_RATIO,
+) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+    """
+    Reads a query result in chunks, compacting each chunk as it arrives.
+
+    Rows are streamed with a server-side cursor in chunks of ``chunk_rows``
+    and decoded straight into nullable (or Arrow-backed) dtypes, so integer
+    codes with NULLs stay integers instead of float64. Low-cardinality text
+    columns, chosen from the first chunk, become categoricals and integer
+    columns are downcast, before the next chunk is read. Only compact
+    chunks are ever held together.
+
+    Args:
+        engine: Engine connected to the source database.
+        query_sql: Query to read.
+        chunk_rows: Rows decoded and compacted per step.
+        dtype_backend: ``numpy_nullable`` or ``pyarrow``.
+        category_max_ratio: Maximum distinct/non-null ratio of a text column
+            for it to become categorical.
+
+    Returns:
+        The DataFrame and statistics: rows, raw_bytes (the chunks as
+        decoded), compact_bytes, category_columns, seconds and the peak RSS
+        in MB before and after reading.
+    """
+    if dtype_backend not in DTYPE_BACKENDS:
+        raise ValueError(
+            f"Unknown dtype backend '{dtype_backend}'; expected {DTYPE_BACKENDS}"
+        )
+
+    start_time = time.monotonic()
+    rss_before = peak_rss_mb()
+    chunks: List[pd.DataFrame] = []
+    category_columns: Optional[Set[str]] = None
+    raw_bytes = 0
+    with engine.connect() as connection:
+        connection = connection.execution_options(stream_results=True)
+        for chunk in pd.read_sql_query(
+            sql=text(query_sql),
+            con=connection,
+            chunksize=chunk_rows,
+            dtype_backend=dtype_backend,
+        ):
+            raw_bytes += frame_memory_bytes(chunk)
+            if category_columns is None:
+                category_columns = choose_category_columns(chunk, category_max_ratio)
+            chunks.append(compact_chunk(chunk, category_columns))
+            logging.info("  Read %s rows...", sum(len(c) for c in chunks))
+
+    df = concat_chunks(chunks, category_columns or set())
+    stats = {
+        "rows": len(df),
+        "raw_bytes": raw_bytes,
+        "compact_bytes": frame_memory_bytes(df),
+        "category_columns": len(category_columns or ()),
+        "seconds": round(time.monotonic() - start_time, 2),
+        "peak_rss_before_mb": rss_before,
+        "peak_rss_after_mb": peak_rss_mb(),
+    }
+    return df, stats
@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Streams a query result from one database into a table via COPY FROM STDIN."""
+
+import io
+import logging
+import time
+from typing import Any, Dict, Iterable, Optional
+
+from psycopg2 import sql
+from sqlalchemy.engine import Engine
+
+from .table_schema import create_typed_table, strip_statement
+
+try:  # Peak-RSS reporting is POSIX-only; it is simply omitted elsewhere.
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+# --- Constants ---
+DEFAULT_CHUNK_ROWS = 50_000
+STREAM_CURSOR_NAME = "benchmark_extract"
+COPY_NULL = "\\N"
+# Escapes for COPY's text format: backslash first, then the delimiters.
+COPY_TEXT_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Returns the peak resident set size of this process in MB, if available."""
+    if resource is None:
+        return None
+    # ru_maxrss is in kilobytes on Linux (bytes on macOS; close enough here).
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def format_copy_rows(rows: Iterable[tuple]) -> str:
+    """
+    Serializes rows into PostgreSQL's COPY text format.
+
+    NULLs become ``\\N`` and backslashes, tabs and newlines are escaped, so
+    every value round-trips exactly. Values are rendered with ``str()``,
+    which PostgreSQL's input functions accept for the scalar types the
+    flattening queries produce (numbers, text, booleans, dates).
+    """
+    return "".join(
+        "\t".join(
+            COPY_NULL if value is None else str(value).translate(COPY_TEXT_ESCAPES)
+            for value in row
+        )
+        + "\n"
+        for row in rows
+    )
+
+
+def stream_query_to_table(
+    source_engine: Engine,
+    query_sql: str,
+    target_engine: Engine,
+    table_name: str,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    unlogged: bool = False,
+) -> Dict[str, Any]:
+    """
+    Copies the result of a query into a table in another database.
+
+    The source query is read through a server-side (named) cursor in chunks
+    of ``chunk_rows``; each chunk is serialized and sent to the target with
+    ``COPY ... FROM STDIN``. Only one chunk is held in memory at a time, so
+    peak memory is bounded by the chunk size rather than the result size.
+    The target table takes the exact column types of the query's result.
+    The load runs in a single target transaction and is committed at the end.
+
+    Args:
+        source_engine: Engine connected to the source database.
+        query_sql: The extract query (a trailing semicolon is allowed).
+        target_engine: Engine connected to the target database.
+        table_name: Name of the table to (re)create and fill in the target.
+        chunk_rows: Number of rows fetched and copied per round trip.
+        unlogged: Whether to create the target table UNLOGGED.
+
+    Returns:
+        Load statistics: rows, chunks, seconds, rows_per_s and peak_rss_mb.
+    """
+    start_time = time.monotonic()
+    total_rows = 0
+    chunks = 0
+
+    columns = create_typed_table(
+        source_engine, query_sql, target_engine, table_name, unlogged=unlogged
+    )
+    copy_statement = sql.SQL("COPY {} ({}) FROM STDIN").format(
+        sql.Identifier(table_name),
+        sql.SQL(", ").join(sql.Identifier(name) for name, _ in columns),
+    )
+
+    source_conn = source_engine.raw_connection()
+    target_conn = target_engine.raw_connection()
+    try:
+        with source_conn.cursor(name=STREAM_CURSOR_NAME) as source_cur:
+            source_cur.execute(strip_statement(query_sql))
+            rows = source_cur.fetchmany(chunk_rows)
+            with target_conn.cursor() as target_cur:
+                while rows:
+                    target_cur.copy_expert(
+                        copy_statement, io.StringIO(format_copy_rows(rows))
+                    )
+                    total_rows += len(rows)
+                    chunks += 1
+                    logging.info("  Copied %s rows (%s chunks)...", total_rows, chunks)
+                    rows = source_cur.fetchmany(chunk_rows)
+        target_conn.commit()
+    except Exception:
+        target_conn.rollback()
+        raise
+    finally:
+        source_conn.rollback()
+        source_conn.close()
+        target_conn.close()
+
+    elapsed_s = time.monotonic() - start_time
+    return {
+        "rows": total_rows,
+        "chunks": chunks,
+        "seconds": round(elapsed_s, 2),
+        "rows_per_s": round(total_rows / elapsed_s, 1) if elapsed_s > 0 else None,
+        "peak_rss_mb": peak_rss_mb(),
+    }
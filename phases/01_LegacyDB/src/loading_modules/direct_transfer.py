@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+"""Server-to-server transfer of a query result without decoding rows in Python."""
+
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from psycopg2 import sql
+from sqlalchemy.engine import URL, Engine
+
+from .table_schema import (
+    Column,
+    create_table,
+    describe_query_columns,
+    strip_statement,
+)
+
+# --- Constants ---
+STRATEGY_DBLINK = "dblink"
+STRATEGY_PIPE = "pipe"
+COPY_BUFFER_BYTES = 1024 * 1024
+
+
+def libpq_conninfo(url: URL) -> str:
+    """Builds a libpq connection string (for dblink) from a SQLAlchemy URL."""
+    parts = {
+        "host": url.host,
+        "port": url.port,
+        "dbname": url.database,
+        "user": url.username,
+        "password": url.password,
+    }
+    return " ".join(
+        "{}='{}'".format(key, str(value).replace("\\", "\\\\").replace("'", "\\'"))
+        for key, value in parts.items()
+        if value is not None
+    )
+
+
+def is_same_server(source_engine: Engine, target_engine: Engine) -> bool:
+    """Returns True if both engines point at the same host and port."""
+    source, target = source_engine.url, target_engine.url
+    return (source.host, source.port) == (target.host, target.port)
+
+
+def ensure_dblink(target_engine: Engine) -> bool:
+    """Returns True if dblink is (or can be) installed in the target database."""
+    conn = target_engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'dblink'")
+            if cur.fetchone() is None:
+                return False
+            cur.execute("CREATE EXTENSION IF NOT EXISTS dblink")
+        conn.commit()
+        return True
+    except Exception as e:
+        logging.info("  dblink unavailable in target: %s", e)
+        conn.rollback()
+        return False
+    finally:
+        conn.close()
+
+
+def choose_strategy(source_engine: Engine, target_engine: Engine) -> str:
+    """
+    Picks the fastest transfer path available for a source/target pair.
+
+    On the same server, ``dblink`` keeps every byte inside PostgreSQL: the
+    target backend pulls the rows from the source and inserts them locally,
+    so nothing crosses the client's network link. Otherwise the piped COPY
+    is used, which still never decodes rows in Python.
+    """
+    if is_same_server(source_engine, target_engine) and ensure_dblink(target_engine):
+        return STRATEGY_DBLINK
+    return STRATEGY_PIPE
+
+
+def transfer_stats(rows: int, start_time: float, strategy: str) -> Dict[str, Any]:
+    """Builds the statistics record returned by the transfer functions."""
+    elapsed_s = time.monotonic() - start_time
+    return {
+        "strategy": strategy,
+        "rows": rows,
+        "seconds": round(elapsed_s, 2),
+        "rows_per_s": round(rows / elapsed_s, 1) if elapsed_s > 0 else None,
+    }
+
+
+def pipe_copy(
+    source_engine: Engine,
+    query_sql: str,
+    target_engine: Engine,
+    table_name: str,
+    columns: List[Column],
+    create_target: bool = True,
+    unlogged: bool = False,
+) -> Dict[str, Any]:
+    """
+    Pipes ``COPY (query) TO STDOUT`` into ``COPY table FROM STDIN``.
+
+    A producer thread writes the source's COPY stream into an OS pipe while
+    the main thread feeds the other end to the target, so both servers work
+    concurrently and the data passes through Python only as raw bytes. The
+    target transaction is committed only if the producer finished cleanly.
+    With ``create_target=False`` the rows are appended to an existing table.
+    """
+    start_time = time.monotonic()
+    source_conn = source_engine.raw_connection()
+    target_conn = target_engine.raw_connection()
+    producer_errors: List[BaseException] = []
+
+    def _produce(write_fd: int) -> None:
+        try:
+            with os.fdopen(write_fd, "wb") as writer:
+                with source_conn.cursor() as source_cur:
+                    source_cur.copy_expert(
+                        sql.SQL("COPY ({}) TO STDOUT").format(
+                            sql.SQL(strip_statement(query_sql))
+                        ),
+                        writer,
+                        size=COPY_BUFFER_BYTES,
+                    )
+        except BaseException as e:  # Re-raised in the main thread below.
+            producer_errors.append(e)
+
+    try:
+        with target_conn.cursor() as target_cur:
+            if create_target:
+                create_table(target_cur, table_name, columns, unlogged=unlogged)
+            read_fd, write_fd = os.pipe()
+            producer = threading.Thread(target=_produce, args=(write_fd,), daemon=True)
+            producer.start()
+            with os.fdopen(read_fd, "rb") as reader:
+                target_cur.copy_expert(
+                    sql.SQL("COPY {} FROM STDIN").format(sql.Identifier(table_name)),
+                    reader,
+                    size=COPY_BUFFER_BYTES,
+                )
+            producer.join()
+            if producer_errors:
+                raise producer_errors[0]
+            rows = target_cur.rowcount
+        target_conn.commit()
+    except Exception:
+        target_conn.rollback()
+        raise
+    finally:
+        source_conn.rollback()
+        source_conn.close()
+        target_conn.close()
+
+    return transfer_stats(rows, start_time, STRATEGY_PIPE)
+
+
+def dblink_insert_select(
+    source_engine: Engine,
+    query_sql: str,
+    target_engine: Engine,
+    table_name: str,
+    columns: List[Column],
+    create_target: bool = True,
+    unlogged: bool = False,
+) -> Dict[str, Any]:
+    """
+    Loads the table with ``INSERT ... SELECT * FROM dblink(source, query)``.
+
+    The target backend connects to the source database itself, so rows never
+    leave the server. Requires the dblink extension in the target database.
+    With ``create_target=False`` the rows are appended to an existing table.
+    """
+    start_time = time.monotonic()
+    target_conn = target_engine.raw_connection()
+    try:
+        with target_conn.cursor() as cur:
+            if create_target:
+                create_table(cur, table_name, columns, unlogged=unlogged)
+            cur.execute(
+                sql.SQL(
+                    "INSERT INTO {table} SELECT * FROM dblink(%s, %s) AS t ({cols})"
+                ).format(
+                    table=sql.Identifier(table_name),
+                    cols=sql.SQL(", ").join(
+                        sql.SQL("{} {}").format(sql.Identifier(name), sql.SQL(type_sql))
+                        for name, type_sql in columns
+                    ),
+                ),
+                [libpq_conninfo(source_engine.url), strip_statement(query_sql)],
+            )
+            rows = cur.rowcount
+        target_conn.commit()
+    except Exception:
+        target_conn.rollback()
+        raise
+    finally:
+        target_conn.close()
+
+    return transfer_stats(rows, start_time, STRATEGY_DBLINK)
+
+
+def transfer_query_to_table(
+    source_engine: Engine,
+    query_sql: str,
+    target_engine: Engine,
+    table_name: str,
+    strategy: Optional[str] = None,
+    unlogged: bool = False,
+) -> Dict[str, Any]:
+    """
+    Moves a query result into a table without materializing rows in Python.
+
+    Args:
+        source_engine: Engine connected to the source database.
+        query_sql: The extract query (a trailing semicolon is allowed).
+        target_engine: Engine connected to the target database.
+        table_name: Name of the table to (re)create and fill in the target.
+        strategy: ``dblink`` or ``pipe``; chosen automatically when None.
+        unlogged: Whether to create the target table UNLOGGED.
+
+    Returns:
+        Load statistics: strategy, rows, seconds and rows_per_s.
+    """
+    if strategy is None:
+        strategy = choose_strategy(source_engine, target_engine)
+    logging.info("  Using '%s' transfer strategy.", strategy)
+
+    columns = describe_query_columns(source_engine, query_sql)
+    if strategy == STRATEGY_DBLINK:
+        return dblink_insert_select(
+            source_engine,
+            query_sql,
+            target_engine,
+            table_name,
+            columns,
+            unlogged=unlogged,
+        )
+    if strategy == STRATEGY_PIPE:
+        return pipe_copy(
+            source_engine,
+            query_sql,
+            target_engine,
+            table_name,
+            columns,
+            unlogged=unlogged,
+        )
+    raise ValueError(f"Unknown transfer strategy '{strategy}'")
@@ -0,0 +1,190 @@
+# -*- coding: utf-8 -*-
+"""Bulk-load profile: relaxed durability, UNLOGGED tables, deferred DDL."""
+
+import logging
+import re
+import time
+from typing import Dict, List, Optional
+
+from psycopg2 import sql
+from sqlalchemy.engine import Engine
+
+from .insert_rewriter import IDENTIFIER, LEADING_COMMENTS
+
+# --- Constants ---
+# Only durability and sort memory are relaxed: a crash during the load loses
+# the most recent commits (and UNLOGGED tables), never consistency.
+DEFAULT_MAINTENANCE_WORK_MEM = "1GB"
+CREATE_TABLE = re.compile(
+    rf"(?P<create>CREATE\s+TABLE)\s+(?:IF\s+NOT\s+EXISTS\s+)?"
+    rf"(?P<table>{IDENTIFIER}(?:\s*\.\s*{IDENTIFIER})?)",
+    re.IGNORECASE,
+)
+# Partitioned tables and partitions are created as written.
+NOT_UNLOGGABLE = re.compile(r"\bPARTITION\s+(?:BY|OF)\b", re.IGNORECASE)
+CREATE_INDEX = re.compile(r"CREATE\s+(?:UNIQUE\s+)?INDEX\b", re.IGNORECASE)
+ALTER_TABLE_ADD = re.compile(
+    r"ALTER\s+TABLE\s+(?:ONLY\s+)?.+?\s+ADD\s+(?:CONSTRAINT\s+\S+\s+)?"
+    r"(?P<kind>PRIMARY\s+KEY|UNIQUE|FOREIGN\s+KEY|CHECK|EXCLUDE)\b",
+    re.IGNORECASE | re.DOTALL,
+)
+UNLOGGED_TABLES_QUERY = """
+    SELECT count(*) FROM pg_class
+    WHERE relkind = 'r' AND relpersistence = 'u'
+"""
+
+# Load phases, in the order they run.
+PHASE_LOAD = "load"
+PHASE_LOGGED = "set_logged"
+PHASE_INDEXES = "indexes"
+PHASE_FOREIGN_KEYS = "foreign_keys"
+PHASE_VALIDATE = "validate"
+
+
+def session_settings(
+    maintenance_work_mem: str = DEFAULT_MAINTENANCE_WORK_MEM,
+) -> Dict[str, str]:
+    """Returns the server settings of the fast-load profile."""
+    return {
+        "synchronous_commit": "off",
+        "maintenance_work_mem": maintenance_work_mem,
+    }
+
+
+def apply_session_settings(cursor, settings: Dict[str, str]) -> None:
+    """Applies settings to the cursor's session (until it disconnects)."""
+    for name, value in settings.items():
+        cursor.execute("SELECT set_config(%s, %s, false)", [name, value])
+
+
+def set_database_settings(engine: Engine, settings: Optional[Dict[str, str]]) -> None:
+    """
+    Makes settings the defaults of the engine's database, or resets them.
+
+    Unlike session settings, these reach every connection the loaders open
+    (parallel slices, dblink, post-load steps). ``None`` restores the
+    server defaults for the keys of :func:`session_settings`.
+    """
+    database = sql.Identifier(engine.url.database)
+    conn = engine.raw_connection()
+    try:
+        conn.autocommit = True
+        with conn.cursor() as cur:
+            for name, value in (settings or session_settings()).items():
+                if settings is None:
+                    statement = sql.SQL("ALTER DATABASE {} RESET {}").format(
+                        database, sql.Identifier(name)
+                    )
+                else:
+                    statement = sql.SQL("ALTER DATABASE {} SET {} = {}").format(
+                        database, sql.Identifier(name), sql.Literal(value)
+                    )
+                cur.execute(statement)
+    finally:
+        conn.close()
+
+
+class DumpProfile:
+    """
+    Rewrites a dump's DDL for bulk loading and replays the deferred parts.
+
+    Used as the statement filter of a dump execution: plain ``CREATE TABLE``
+    statements become ``CREATE UNLOGGED TABLE`` (no WAL for their data), and
+    ``CREATE INDEX`` and ``ALTER TABLE ... ADD`` constraint statements are
+    held back, so rows are neither indexed nor checked one at a time.
+    :meth:`finish` then restores the dump's definitions after the data is
+    in. Constraints written inline in ``CREATE TABLE`` are left in place.
+    """
+
+    def __init__(self) -> None:
+        self.unlogged_tables: List[str] = []
+        self.deferred: List[str] = []
+        self.deferred_foreign_keys: List[str] = []
+
+    def rewrite(self, statement: str) -> Optional[str]:
+        """Returns the statement to execute now, or None if it is deferred."""
+        start = LEADING_COMMENTS.match(statement).end()
+        if CREATE_INDEX.match(statement, start):
+            self.deferred.append(statement)
+            return None
+        constraint = ALTER_TABLE_ADD.match(statement, start)
+        if constraint:
+            if constraint.group("kind").upper().startswith("FOREIGN"):
+                self.deferred_foreign_keys.append(statement)
+            else:
+                self.deferred.append(statement)
+            return None
+        table = CREATE_TABLE.match(statement, start)
+        if table and not NOT_UNLOGGABLE.search(statement, table.end()):
+            self.unlogged_tables.append(table.group("table"))
+            return (
+                f"{statement[:start]}CREATE UNLOGGED TABLE"
+                f"{statement[table.end('create') :]}"
+            )
+        return statement
+
+    def finish(self, conn) -> Dict[str, float]:
+        """
+        Restores durability and the deferred definitions, phase by phase.
+
+        ``SET LOGGED`` rewrites a table together with its indexes, so tables
+        are switched back before the deferred indexes are built (each index
+        is then built once). Tables referencing other unlogged tables can
+        only be switched after them, so failures are retried until no
+        progress is made. Foreign keys come last; adding one checks every
+        existing row. The run ends by counting tables still UNLOGGED.
+
+        Args:
+            conn: psycopg2 connection the dump was executed on; used in
+                autocommit mode.
+
+        Returns:
+            Seconds per phase (``set_logged``, ``indexes``, ``foreign_keys``,
+            ``validate``).
+
+        Raises:
+            psycopg2.Error: From a deferred statement, or a table that could
+                not be switched back to LOGGED.
+        """
+        conn.autocommit = True
+        timings: Dict[str, float] = {}
+        with conn.cursor() as cur:
+            start_time = time.monotonic()
+            pending = list(self.unlogged_tables)
+            while pending:
+                failed, last_error = [], None
+                for table in pending:
+                    try:
+                        cur.execute(f"ALTER TABLE {table} SET LOGGED")
+                    except Exception as e:
+                        failed.append(table)
+                        last_error = e
+                if len(failed) == len(pending):
+                    raise last_error
+                pending = failed
+            timings[PHASE_LOGGED] = round(time.monotonic() - start_time, 2)
+
+            for phase, statements in (
+                (PHASE_INDEXES, self.deferred),
+                (PHASE_FOREIGN_KEYS, self.deferred_foreign_keys),
+            ):
+                start_time = time.monotonic()
+                for statement in statements:
+                    cur.execute(statement)
+                timings[phase] = round(time.monotonic() - start_time, 2)
+
+            start_time = time.monotonic()
+            cur.execute(UNLOGGED_TABLES_QUERY)
+            unlogged = cur.fetchone()[0]
+            if unlogged:
+                logging.warning("  %s tables are still UNLOGGED.", unlogged)
+            timings[PHASE_VALIDATE] = round(time.monotonic() - start_time, 2)
+
+        logging.info(
+            "  Fast load: %s tables set LOGGED, %s indexes/constraints and %s "
+            "foreign keys created after the data.",
+            len(self.unlogged_tables),
+            len(self.deferred),
+            len(self.deferred_foreign_keys),
+        )
+        return timings
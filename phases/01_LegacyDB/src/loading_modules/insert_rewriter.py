@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+"""Rewrites plain INSERT ... VALUES statements into COPY text-format rows."""
+
+import re
+from typing import List, Optional, Tuple
+
+from .copy_loader import COPY_NULL, COPY_TEXT_ESCAPES
+
+# --- Constants ---
+LEADING_COMMENTS = re.compile(r"\A(?:\s+|--[^\n]*(?:\n|\Z)|/\*.*?\*/)*", re.DOTALL)
+IDENTIFIER = r'(?:"(?:[^"]|"")+"|[A-Za-z_][A-Za-z0-9_$]*)'
+INSERT_HEADER = re.compile(
+    rf"INSERT\s+INTO\s+(?P<target>{IDENTIFIER}(?:\s*\.\s*{IDENTIFIER})?)\s*"
+    r"(?P<columns>\([^()]*\))?\s*VALUES\s*",
+    re.IGNORECASE,
+)
+# Literals that COPY can take verbatim (after unquoting strings). Anything
+# else (E'' strings, casts, function calls, DEFAULT) is left to the server.
+VALUE = re.compile(
+    r"\s*(?:(?P<string>'(?:[^']|'')*')"
+    r"|(?P<number>[+-]?(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?)"
+    r"|(?P<null>NULL)|(?P<boolean>TRUE|FALSE))\s*(?=[,)])",
+    re.IGNORECASE,
+)
+
+ParsedInsert = Tuple[str, List[str]]  # (COPY statement, COPY text lines)
+
+
+def _copy_value(match: re.Match) -> str:
+    """Renders one matched SQL literal as a COPY text-format field."""
+    if match.group("string") is not None:
+        text = match.group("string")[1:-1].replace("''", "'")
+        return text.translate(COPY_TEXT_ESCAPES)
+    if match.group("null") is not None:
+        return COPY_NULL
+    if match.group("boolean") is not None:
+        return match.group("boolean").lower()
+    return match.group("number")
+
+
+def parse_insert(statement: str) -> Optional[ParsedInsert]:
+    """
+    Converts a single- or multi-row ``INSERT ... VALUES`` into COPY input.
+
+    Only statements whose values are all plain literals (quoted strings,
+    numbers, NULL, TRUE/FALSE) with the same number of values per row are
+    rewritten; ``ON CONFLICT``, ``RETURNING``, ``E''`` strings, casts and
+    expressions make the statement unsuitable.
+
+    Returns:
+        ``("COPY target (columns) FROM STDIN", lines)`` with one
+        tab-separated line per row, or None if the statement must be
+        executed as is.
+    """
+    body_start = LEADING_COMMENTS.match(statement).end()
+    header = INSERT_HEADER.match(statement, body_start)
+    if not header:
+        return None
+
+    lines: List[str] = []
+    width = None
+    pos, end = header.end(), len(statement)
+    while True:
+        if statement[pos : pos + 1] != "(":
+            return None
+        pos += 1
+        fields = []
+        while True:
+            value = VALUE.match(statement, pos)
+            if not value:
+                return None
+            fields.append(_copy_value(value))
+            pos = value.end()
+            if statement[pos] == ")":
+                pos += 1
+                break
+            pos += 1  # the comma
+        if width is None:
+            width = len(fields)
+        elif len(fields) != width:
+            return None
+        lines.append("\t".join(fields) + "\n")
+
+        while pos < end and statement[pos].isspace():
+            pos += 1
+        if pos == end:
+            break
+        if statement[pos] != ",":
+            return None
+        pos += 1
+        while pos < end and statement[pos].isspace():
+            pos += 1
+
+    columns = f" {header.group('columns')}" if header.group("columns") else ""
+    return f"COPY {header.group('target')}{columns} FROM STDIN", lines
@@ -0,0 +1,328 @@
+# -*- coding: utf-8 -*-
+"""Load-state ledger kept inside each restored database."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import psycopg2
+from psycopg2 import sql
+
+from .build_ledger import file_sha256
+from .statement_stream import file_signature
+from .template_clone import database_exists
+
+# --- Constants ---
+# The ledger lives in its own schema so that it never mixes with (or is
+# counted among) the dump's tables, and is carried along by template clones.
+LEDGER_SCHEMA = "setup_ledger"
+LEDGER_TABLE = "dump_loads"
+# One row per load that has started but not completed; a database with such
+# a row holds an interrupted restore, whatever its tables look like.
+MARKER_TABLE = "loads_in_progress"
+
+ACTION_SKIP = "skip"
+ACTION_LOAD = "load"
+ACTION_RESUME = "resume"
+ACTION_RELOAD = "reload"
+ACTION_ADOPT = "adopt"
+
+LoadPlan = Tuple[str, str, Optional[str]]  # (action, reason, dump SHA-256)
+
+
+def _ledger_table(table: str = LEDGER_TABLE) -> sql.Composable:
+    """Returns the qualified name of a table of the ledger schema."""
+    return sql.SQL("{}.{}").format(sql.Identifier(LEDGER_SCHEMA), sql.Identifier(table))
+
+
+def _create_ledger_tables(cursor) -> None:
+    """Creates the ledger schema and its tables if they do not exist."""
+    cursor.execute(
+        sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(LEDGER_SCHEMA))
+    )
+    cursor.execute(
+        sql.SQL(
+            """
+            CREATE TABLE IF NOT EXISTS {} (
+                dump text NOT NULL,
+                sha256 text NOT NULL,
+                size_bytes bigint NOT NULL,
+                mtime_ns bigint NOT NULL,
+                load_seconds double precision,
+                table_rows jsonb NOT NULL,
+                loaded_at timestamptz NOT NULL DEFAULT now()
+            )
+            """
+        ).format(_ledger_table())
+    )
+    cursor.execute(
+        sql.SQL(
+            """
+            CREATE TABLE IF NOT EXISTS {} (
+                dump text NOT NULL,
+                started_at timestamptz NOT NULL DEFAULT now()
+            )
+            """
+        ).format(_ledger_table(MARKER_TABLE))
+    )
+
+
+def read_load_state(db_config: Dict, db_name: str) -> Optional[Dict[str, Any]]:
+    """
+    Returns the latest ledger entry of a database.
+
+    Returns:
+        The entry (dump, sha256, size_bytes, mtime_ns, load_seconds,
+        table_rows, loaded_at), ``{}`` if the database exists without a
+        ledger entry, or None if the database does not exist.
+    """
+    conn = psycopg2.connect(**db_config)
+    try:
+        with conn.cursor() as cur:
+            if not database_exists(cur, db_name):
+                return None
+    finally:
+        conn.close()
+
+    conn = psycopg2.connect(**{**db_config, "dbname": db_name})
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT to_regclass(%s)",
+                [_ledger_table().as_string(cur)],
+            )
+            if cur.fetchone()[0] is None:
+                return {}
+            cur.execute(
+                sql.SQL(
+                    "SELECT dump, sha256, size_bytes, mtime_ns, load_seconds, "
+                    "table_rows, loaded_at FROM {} "
+                    "ORDER BY loaded_at DESC LIMIT 1"
+                ).format(_ledger_table())
+            )
+            row = cur.fetchone()
+            if row is None:
+                return {}
+            return dict(zip([c.name for c in cur.description], row, strict=True))
+    finally:
+        conn.close()
+
+
+def mark_load_started(db_config: Dict, db_name: str, sql_file_path: Path) -> None:
+    """
+    Records that a load of the dump into the database has started.
+
+    The marker is removed by :func:`record_load` in the transaction that
+    records the completed load, so it outlives any failure in between, such
+    as a fast load that stops while building the deferred indexes.
+    """
+    conn = psycopg2.connect(**{**db_config, "dbname": db_name})
+    try:
+        with conn.cursor() as cur:
+            _create_ledger_tables(cur)
+            cur.execute(
+                sql.SQL("INSERT INTO {} (dump) VALUES (%s)").format(
+                    _ledger_table(MARKER_TABLE)
+                ),
+                [sql_file_path.name],
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def is_adoptable(db_config: Dict, db_name: str) -> bool:
+    """
+    Returns True if an untracked database can be adopted as it is.
+
+    That is a database restored before the ledger existed: it has user
+    tables, and no load into it was ever started (see
+    :func:`mark_load_started`) without completing.
+    """
+    conn = psycopg2.connect(**{**db_config, "dbname": db_name})
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT to_regclass(%s)",
+                [_ledger_table(MARKER_TABLE).as_string(cur)],
+            )
+            if cur.fetchone()[0] is not None:
+                cur.execute(
+                    sql.SQL("SELECT EXISTS (SELECT 1 FROM {})").format(
+                        _ledger_table(MARKER_TABLE)
+                    )
+                )
+                if cur.fetchone()[0]:
+                    return False
+            return bool(count_user_tables(cur))
+    finally:
+        conn.close()
+
+
+def plan_load(
+    state: Optional[Dict[str, Any]],
+    sql_file_path: Path,
+    resumable: bool = False,
+    adoptable: bool = False,
+) -> LoadPlan:
+    """
+    Decides whether a dump must be (re)loaded into its database.
+
+    An entry whose file size and modification time match is trusted
+    without reading the dump, so unchanged dumps are skipped in constant
+    time; otherwise the dump is hashed and only a different SHA-256 forces
+    a reload. A database without an entry is never dropped if it can be
+    adopted: it is assumed to hold the current dump.
+
+    Args:
+        state: Result of :func:`read_load_state`.
+        sql_file_path: The dump to load.
+        resumable: Whether an interrupted load left a checkpoint, so an
+            untracked database is resumed rather than rebuilt.
+        adoptable: Whether an untracked database was restored before the
+            ledger existed (see :func:`is_adoptable`), so it is adopted
+            rather than rebuilt.
+
+    Returns:
+        (action, reason, SHA-256 of the dump if it was computed).
+    """
+    if state is None:
+        return ACTION_LOAD, "database does not exist", None
+    if not state:
+        if resumable:
+            return ACTION_RESUME, "interrupted load has a checkpoint", None
+        if adoptable:
+            return ACTION_ADOPT, "database has no load ledger entry", None
+        return ACTION_RELOAD, "database holds no completed load", None
+
+    signature = file_signature(sql_file_path)
+    if (
+        state["dump"] == signature["file"]
+        and state["size_bytes"] == signature["size"]
+        and state["mtime_ns"] == signature["mtime_ns"]
+    ):
+        return ACTION_SKIP, "dump size and modification time unchanged", None
+
+    sha256 = file_sha256(sql_file_path)
+    if state["sha256"] == sha256:
+        return ACTION_SKIP, "dump content unchanged (SHA-256 match)", sha256
+    return ACTION_RELOAD, "dump SHA-256 changed", sha256
+
+
+def refresh_signature(db_config: Dict, db_name: str, sql_file_path: Path) -> None:
+    """
+    Stores the dump's current modification time in the latest entry.
+
+    Called when a touched but unchanged dump was verified by its hash, so
+    the next run can skip it without hashing again.
+    """
+    conn = psycopg2.connect(**{**db_config, "dbname": db_name})
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                sql.SQL(
+                    "UPDATE {table} SET mtime_ns = %s WHERE loaded_at = "
+                    "(SELECT max(loaded_at) FROM {table})"
+                ).format(table=_ledger_table()),
+                [file_signature(sql_file_path)["mtime_ns"]],
+            )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _list_user_tables(cursor) -> List[Tuple[str, str]]:
+    """Lists the (schema, table) of every user table outside the ledger."""
+    cursor.execute(
+        """
+        SELECT n.nspname, c.relname
+        FROM pg_class AS c
+        JOIN pg_namespace AS n ON n.oid = c.relnamespace
+        WHERE c.relkind IN ('r', 'p')
+          AND n.nspname NOT IN ('pg_catalog', 'information_schema', %s)
+          AND n.nspname NOT LIKE 'pg\\_%%'
+        ORDER BY 1, 2
+        """,
+        [LEDGER_SCHEMA],
+    )
+    return cursor.fetchall()
+
+
+def count_user_tables(cursor) -> int:
+    """Returns the number of user tables outside the ledger."""
+    return len(_list_user_tables(cursor))
+
+
+def count_table_rows(cursor) -> Dict[str, int]:
+    """Returns the exact row count of every user table, by qualified name."""
+    counts = {}
+    for schema, table in _list_user_tables(cursor):
+        cursor.execute(
+            sql.SQL("SELECT count(*) FROM {}.{}").format(
+                sql.Identifier(schema), sql.Identifier(table)
+            )
+        )
+        counts[f"{schema}.{table}"] = cursor.fetchone()[0]
+    return counts
+
+
+def record_load(
+    db_config: Dict,
+    db_name: str,
+    sql_file_path: Path,
+    load_seconds: Optional[float],
+    sha256: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Appends a ledger entry for a completed load of a dump.
+
+    The same transaction clears the database's load-in-progress markers.
+
+    ``load_seconds`` is None for an adopted database, whose load was not
+    timed.
+
+    Returns:
+        The recorded entry.
+    """
+    signature = file_signature(sql_file_path)
+    entry = {
+        "dump": signature["file"],
+        "sha256": sha256 or file_sha256(sql_file_path),
+        "size_bytes": signature["size"],
+        "mtime_ns": signature["mtime_ns"],
+        "load_seconds": load_seconds,
+    }
+    conn = psycopg2.connect(**{**db_config, "dbname": db_name})
+    try:
+        with conn.cursor() as cur:
+            entry["table_rows"] = count_table_rows(cur)
+            _create_ledger_tables(cur)
+            cur.execute(
+                sql.SQL(
+                    "INSERT INTO {} (dump, sha256, size_bytes, mtime_ns, "
+                    "load_seconds, table_rows) VALUES (%s, %s, %s, %s, %s, %s)"
+                ).format(_ledger_table()),
+                [
+                    entry["dump"],
+                    entry["sha256"],
+                    entry["size_bytes"],
+                    entry["mtime_ns"],
+                    load_seconds,
+                    json.dumps(entry["table_rows"]),
+                ],
+            )
+            cur.execute(sql.SQL("DELETE FROM {}").format(_ledger_table(MARKER_TABLE)))
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    logging.info(
+        "Recorded load of '%s' (%s tables, %s rows) in the ledger.",
+        entry["dump"],
+        len(entry["table_rows"]),
+        sum(entry["table_rows"].values()),
+    )
+    return entry
@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""Wide-table benchmark variant as a materialized view inside the source DB."""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from psycopg2 import sql
+from sqlalchemy.engine import Engine
+
+from .table_schema import strip_statement
+
+# --- Constants ---
+# Same relation name as the wide benchmark table; each variant lives in its
+# own schema of the source database, named after its benchmark database.
+MATVIEW_NAME = "wide_format_data"
+# Benchmark results of a materialized view are saved as ``<schema>_matview``.
+MATVIEW_DB_SUFFIX = "_matview"
+
+
+def _timed(cursor, statement: sql.Composable) -> float:
+    """Executes one statement and returns its duration in seconds."""
+    start_time = time.monotonic()
+    cursor.execute(statement)
+    return round(time.monotonic() - start_time, 2)
+
+
+def get_relation_storage(cursor, relation: sql.Composable) -> Dict[str, int]:
+    """Returns the heap, index and total on-disk size of a relation in bytes."""
+    cursor.execute(
+        sql.SQL(
+            "SELECT pg_table_size(r), pg_indexes_size(r), pg_total_relation_size(r) "
+            "FROM CAST({} AS regclass) AS r"
+        ).format(sql.Literal(relation.as_string(cursor)))
+    )
+    table_bytes, index_bytes, total_bytes = cursor.fetchone()
+    return {
+        "table_bytes": table_bytes,
+        "index_bytes": index_bytes,
+        "total_bytes": total_bytes,
+    }
+
+
+def build_materialized_view(
+    engine: Engine,
+    schema: str,
+    query_sql: str,
+    unique_key: str,
+    index_columns: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """
+    (Re)creates a materialized view of a query and times a concurrent refresh.
+
+    The view ``<schema>.wide_format_data`` is created from the query, given
+    a unique index on ``unique_key`` (required by ``REFRESH MATERIALIZED
+    VIEW CONCURRENTLY``) and plain indexes on ``index_columns``, and
+    analyzed. It is then refreshed once concurrently, which re-runs the
+    query and applies only the differences while readers keep working, so
+    the refresh time is what keeping the view current costs.
+
+    Args:
+        engine: Engine connected to the database holding the source tables.
+        schema: Schema for the view (created if missing).
+        query_sql: Flattening query that defines the view.
+        unique_key: Column that uniquely identifies a row of the result.
+        index_columns: Further columns to index, e.g. the benchmark filters.
+
+    Returns:
+        ``{"schema", "view", "rows", "create_seconds", "index_seconds",
+        "refresh_seconds", "table_bytes", "index_bytes", "total_bytes"}``
+    """
+    if not unique_key:
+        raise ValueError("A unique key is required for concurrent refreshes")
+
+    view = sql.Identifier(schema, MATVIEW_NAME)
+    conn = engine.raw_connection()
+    conn.autocommit = True
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                sql.SQL("CREATE SCHEMA IF NOT EXISTS {}").format(sql.Identifier(schema))
+            )
+            cur.execute(sql.SQL("DROP MATERIALIZED VIEW IF EXISTS {}").format(view))
+            create_seconds = _timed(
+                cur,
+                sql.SQL("CREATE MATERIALIZED VIEW {} AS {} WITH DATA").format(
+                    view, sql.SQL(strip_statement(query_sql))
+                ),
+            )
+            logging.info(
+                "  Created %s.%s in %ss.", schema, MATVIEW_NAME, create_seconds
+            )
+
+            index_start = time.monotonic()
+            cur.execute(
+                sql.SQL("CREATE UNIQUE INDEX ON {} ({})").format(
+                    view, sql.Identifier(unique_key)
+                )
+            )
+            for column in index_columns or []:
+                cur.execute(
+                    sql.SQL("CREATE INDEX ON {} ({})").format(
+                        view, sql.Identifier(column)
+                    )
+                )
+            cur.execute(sql.SQL("ANALYZE {}").format(view))
+            index_seconds = round(time.monotonic() - index_start, 2)
+
+            refresh_seconds = _timed(
+                cur,
+                sql.SQL("REFRESH MATERIALIZED VIEW CONCURRENTLY {}").format(view),
+            )
+            logging.info("  Concurrent refresh took %ss.", refresh_seconds)
+
+            cur.execute(sql.SQL("SELECT count(*) FROM {}").format(view))
+            rows = cur.fetchone()[0]
+            storage = get_relation_storage(cur, view)
+    finally:
+        conn.close()
+
+    return {
+        "schema": schema,
+        "view": MATVIEW_NAME,
+        "rows": rows,
+        "create_seconds": create_seconds,
+        "index_seconds": index_seconds,
+        "refresh_seconds": refresh_seconds,
+        **storage,
+    }
+
+
+def list_materialized_views(engine: Engine) -> List[str]:
+    """Returns the schemas holding a benchmark materialized view, sorted."""
+    conn = engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT schemaname FROM pg_matviews WHERE matviewname = %s "
+                "AND ispopulated ORDER BY schemaname",
+                [MATVIEW_NAME],
+            )
+            return [schema for (schema,) in cur.fetchall()]
+    finally:
+        conn.rollback()
+        conn.close()
@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+"""Range-partitioned, concurrent extraction of a query into one target table."""
+
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from itertools import pairwise
+from typing import Any, Dict, List, Optional, Tuple
+
+from psycopg2 import sql
+from psycopg2.extensions import adapt
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import NullPool
+
+from . import direct_transfer
+from .table_schema import create_typed_table, strip_statement
+
+# --- Constants ---
+DEFAULT_PARTITION_KEY = "SSN"
+# Slices per worker; more, smaller slices even out skewed key ranges.
+SLICES_PER_WORKER = 2
+
+# Comments, literals and quoted identifiers are single tokens, so a FROM or a
+# parenthesis inside them is never mistaken for query structure.
+SQL_TOKEN_PATTERN = re.compile(
+    r"--[^\n]*|/\*.*?\*/|'(?:[^']|'')*'|\"(?:[^\"]|\"\")*\"|[\w$]+|\S",
+    re.DOTALL,
+)
+NAME = r'(?:"(?:[^"]|"")+"|[A-Za-z_][\w$]*)'
+RELATION_PATTERN = re.compile(rf"\s*({NAME}(?:\s*\.\s*{NAME})?)")
+
+KeyRange = Tuple[Optional[Any], Optional[Any]]  # [lower, upper); None = open
+
+
+def find_root_table(query_sql: str) -> Optional[str]:
+    """
+    Returns the first table of a query's outermost FROM clause.
+
+    CTE bodies and subqueries sit inside parentheses and are skipped, so for
+    the flattening queries this is the table every other one is LEFT JOINed
+    to, which holds exactly one row per key.
+
+    Returns:
+        The table as written in the query (an SQL fragment, e.g.
+        ``tmp_df9."location"``), or None if the outermost FROM does not
+        start with a table.
+    """
+    depth = 0
+    previous = ""
+    for match in SQL_TOKEN_PATTERN.finditer(query_sql):
+        token = match.group()
+        if token.startswith(("--", "/*")):
+            continue
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0 and token.upper() == "FROM" and previous != "DISTINCT":
+            relation = RELATION_PATTERN.match(query_sql, match.end())
+            return relation.group(1) if relation else None
+        previous = token.upper()
+    return None
+
+
+def get_key_ranges(
+    source_engine: Engine, key_table: str, key_column: str, partitions: int
+) -> List[KeyRange]:
+    """
+    Splits the key domain of a table into ``partitions`` equal-count ranges.
+
+    Boundaries are the ``percentile_disc`` quantiles of the key column, so
+    each range covers roughly the same number of root rows whatever the key
+    type (numeric or text). The first range is open below and the last open
+    above, so every key, including ones added after sampling, is covered.
+
+    Args:
+        source_engine: Engine connected to the source database.
+        key_table: Table holding one row per key (an SQL fragment, e.g.
+            ``tmp_df9."location"``).
+        key_column: Name of the key column in ``key_table``.
+        partitions: Requested number of ranges.
+
+    Returns:
+        A list of ``(lower, upper)`` bounds; fewer than requested when the
+        key has fewer distinct quantiles.
+    """
+    if partitions <= 1:
+        return [(None, None)]
+
+    fractions = [i / partitions for i in range(1, partitions)]
+    conn = source_engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                sql.SQL(
+                    "SELECT percentile_disc(%s::float8[]) "
+                    "WITHIN GROUP (ORDER BY {key}) FROM {table}"
+                ).format(key=sql.Identifier(key_column), table=sql.SQL(key_table)),
+                [fractions],
+            )
+            quantiles = cur.fetchone()[0] or []
+    finally:
+        conn.rollback()
+        conn.close()
+
+    boundaries = sorted({q for q in quantiles if q is not None})
+    bounds: List[Optional[Any]] = [None, *boundaries, None]
+    return list(pairwise(bounds))
+
+
+def partition_query(query_sql: str, key_column: str, key_range: KeyRange) -> str:
+    """
+    Restricts a query to the rows whose key falls inside a range.
+
+    The query is wrapped as a subquery and filtered on its output key column;
+    PostgreSQL pushes the predicate down to the scan of the key's base table.
+    Rows with a NULL key are assigned to the first range.
+    """
+    lower, upper = key_range
+    key = '"{}"'.format(key_column.replace('"', '""'))
+    conditions = []
+    if lower is not None:
+        conditions.append(f"q.{key} >= {adapt(lower).getquoted().decode()}")
+    if upper is not None:
+        conditions.append(f"q.{key} < {adapt(upper).getquoted().decode()}")
+    where = " AND ".join(conditions) or "TRUE"
+    if lower is None:
+        where = f"({where}) OR q.{key} IS NULL"
+    return f"SELECT * FROM (\n{strip_statement(query_sql)}\n) AS q WHERE {where}"
+
+
+def parallel_transfer(
+    source_engine: Engine,
+    query_sql: str,
+    target_engine: Engine,
+    table_name: str,
+    workers: int,
+    key_table: Optional[str] = None,
+    key_column: str = DEFAULT_PARTITION_KEY,
+    strategy: Optional[str] = None,
+    unlogged: bool = False,
+) -> Dict[str, Any]:
+    """
+    Loads a query result by running key-range slices of it concurrently.
+
+    The target table is created once from the query's result types; each
+    slice is then moved with its own source and target connections
+    (``dblink`` or piped COPY), up to ``workers`` slices at a time. Each
+    slice commits on its own, so a failed slice leaves a partial table and
+    the error is raised after the remaining slices finish. Physical row order
+    follows slice completion, not the query's ORDER BY.
+
+    Args:
+        source_engine: Engine connected to the source database.
+        query_sql: The extract query (a trailing semicolon is allowed).
+        target_engine: Engine connected to the target database.
+        table_name: Name of the table to (re)create and fill in the target.
+        workers: Maximum number of slices loading at the same time.
+        key_table: Table whose key quantiles define the slices; defaults to
+            the query's root table (see :func:`find_root_table`).
+        key_column: Key column in both ``key_table`` and the query output.
+        strategy: ``dblink`` or ``pipe``; chosen automatically when None.
+        unlogged: Whether to create the target table UNLOGGED.
+
+    Returns:
+        Load statistics: strategy, rows, seconds, rows_per_s, plus the
+        number of slices and workers.
+    """
+    start_time = time.monotonic()
+    if strategy is None:
+        strategy = direct_transfer.choose_strategy(source_engine, target_engine)
+    load_slice = {
+        direct_transfer.STRATEGY_DBLINK: direct_transfer.dblink_insert_select,
+        direct_transfer.STRATEGY_PIPE: direct_transfer.pipe_copy,
+    }.get(strategy)
+    if load_slice is None:
+        raise ValueError(f"Unknown transfer strategy '{strategy}'")
+
+    if key_table is None:
+        key_table = find_root_table(query_sql)
+        if key_table is None:
+            raise ValueError(
+                "Cannot find the root table of the query; set partition_table"
+            )
+    key_ranges = get_key_ranges(
+        source_engine, key_table, key_column, workers * SLICES_PER_WORKER
+    )
+    logging.info(
+        "  Loading %s key-range slices of %s with %s workers ('%s' strategy).",
+        len(key_ranges),
+        key_table,
+        workers,
+        strategy,
+    )
+
+    columns = create_typed_table(
+        source_engine, query_sql, target_engine, table_name, unlogged=unlogged
+    )
+
+    # One connection per worker and side; pooling would only cap concurrency.
+    slice_source = create_engine(source_engine.url, poolclass=NullPool)
+    slice_target = create_engine(target_engine.url, poolclass=NullPool)
+    total_rows = 0
+    errors: List[Exception] = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(
+                    load_slice,
+                    slice_source,
+                    partition_query(query_sql, key_column, key_range),
+                    slice_target,
+                    table_name,
+                    columns,
+                    create_target=False,
+                ): key_range
+                for key_range in key_ranges
+            }
+            for future in as_completed(futures):
+                try:
+                    stats = future.result()
+                except Exception as e:
+                    logging.error("  Slice %s failed: %s", futures[future], e)
+                    errors.append(e)
+                    continue
+                total_rows += stats["rows"]
+                logging.info(
+                    "  Slice %s: %s rows in %ss.",
+                    futures[future],
+                    stats["rows"],
+                    stats["seconds"],
+                )
+    finally:
+        slice_source.dispose()
+        slice_target.dispose()
+
+    if errors:
+        raise errors[0]
+
+    stats = direct_transfer.transfer_stats(total_rows, start_time, strategy)
+    stats.update({"slices": len(key_ranges), "workers": workers})
+    return stats
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+"""Exports a table to a partitioned, compressed Parquet dataset via Arrow."""
+
+import logging
+import shutil
+import time
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from psycopg2 import sql
+from sqlalchemy.engine import Engine
+
+from .copy_loader import DEFAULT_CHUNK_ROWS
+from .table_schema import Column, get_table_columns
+
+try:  # Columnar export is optional; pyarrow is only needed when enabled.
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - depends on the environment
+    pa = None
+    pq = None
+
+# --- Constants ---
+DEFAULT_COMPRESSION = "zstd"
+EXPORT_CURSOR_NAME = "benchmark_parquet_export"
+
+
+def _arrow_type(type_sql: str) -> Tuple[Any, Optional[Callable[[Any], Any]]]:
+    """
+    Maps a PostgreSQL column type to an Arrow type and a value converter.
+
+    ``numeric`` becomes float64 (analytical engines aggregate it as double);
+    types without a direct Arrow counterpart are written as strings.
+    """
+    exact = {
+        "boolean": pa.bool_(),
+        "smallint": pa.int16(),
+        "integer": pa.int32(),
+        "bigint": pa.int64(),
+        "real": pa.float32(),
+        "double precision": pa.float64(),
+        "date": pa.date32(),
+    }
+    if type_sql in exact:
+        return exact[type_sql], None
+    if type_sql.startswith("numeric"):
+        return pa.float64(), lambda v: float(v) if isinstance(v, Decimal) else v
+    if type_sql.startswith("timestamp"):
+        tz = "UTC" if "with time zone" in type_sql else None
+        return pa.timestamp("us", tz=tz), None
+    return pa.string(), str
+
+
+def _rows_to_table(
+    rows: List[tuple], columns: List[Column], schema: "pa.Schema"
+) -> "pa.Table":
+    """Builds an Arrow table from row tuples using the fixed schema."""
+    arrays = []
+    for i, (_, type_sql) in enumerate(columns):
+        arrow_type, convert = _arrow_type(type_sql)
+        values = [row[i] for row in rows]
+        if convert is not None:
+            values = [None if v is None else convert(v) for v in values]
+        arrays.append(pa.array(values, type=arrow_type))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def export_table_to_parquet(
+    engine: Engine,
+    table_name: str,
+    output_dir: Path,
+    partition_column: Optional[str] = None,
+    chunk_rows: int = DEFAULT_CHUNK_ROWS,
+    compression: str = DEFAULT_COMPRESSION,
+) -> Dict[str, Any]:
+    """
+    Writes a table to a (Hive-)partitioned, compressed Parquet dataset.
+
+    The table is read through a server-side cursor in chunks of
+    ``chunk_rows``; each chunk is converted to Arrow with a schema derived
+    from the table's PostgreSQL column types (so every file agrees on the
+    types, even for all-NULL chunks) and appended to the dataset under
+    ``output_dir``. Any previous dataset in ``output_dir`` is replaced.
+
+    Args:
+        engine: Engine connected to the database holding the table.
+        table_name: Table to export.
+        output_dir: Dataset root directory.
+        partition_column: Column to partition the files by (``col=value``
+            directories), or None for an unpartitioned dataset.
+        chunk_rows: Number of rows converted and written per step.
+        compression: Parquet compression codec (e.g. ``zstd``, ``snappy``).
+
+    Returns:
+        Export statistics: rows, files, bytes, seconds and rows_per_s.
+    """
+    if pa is None:
+        raise ImportError("pyarrow is required for the Parquet export")
+
+    start_time = time.monotonic()
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    output_dir.mkdir(parents=True)
+
+    conn = engine.raw_connection()
+    total_rows = 0
+    try:
+        with conn.cursor() as cur:
+            columns = get_table_columns(cur, table_name)
+        if partition_column and partition_column not in dict(columns):
+            raise ValueError(f"Partition column '{partition_column}' not in table")
+        schema = pa.schema((name, _arrow_type(t)[0]) for name, t in columns)
+
+        with conn.cursor(name=EXPORT_CURSOR_NAME) as cur:
+            cur.execute(sql.SQL("SELECT * FROM {}").format(sql.Identifier(table_name)))
+            chunk = 0
+            while rows := cur.fetchmany(chunk_rows):
+                pq.write_to_dataset(
+                    _rows_to_table(rows, columns, schema),
+                    root_path=str(output_dir),
+                    partition_cols=[partition_column] if partition_column else None,
+                    compression=compression,
+                    basename_template=f"part-{chunk:05d}-{{i}}.parquet",
+                    existing_data_behavior="overwrite_or_ignore",
+                )
+                total_rows += len(rows)
+                chunk += 1
+                logging.info("  Exported %s rows (%s chunks)...", total_rows, chunk)
+    finally:
+        conn.rollback()
+        conn.close()
+
+    files = list(output_dir.rglob("*.parquet"))
+    elapsed_s = time.monotonic() - start_time
+    return {
+        "rows": total_rows,
+        "files": len(files),
+        "bytes": sum(f.stat().st_size for f in files),
+        "seconds": round(elapsed_s, 2),
+        "rows_per_s": round(total_rows / elapsed_s, 1) if elapsed_s > 0 else None,
+    }
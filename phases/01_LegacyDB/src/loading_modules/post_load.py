@@ -0,0 +1,258 @@
+# -*- coding: utf-8 -*-
+"""Physical optimization of a freshly loaded table: types, keys, stats, order."""
+
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from psycopg2 import sql
+from sqlalchemy.engine import Engine
+
+from .table_schema import Column, get_table_columns
+
+# --- Constants ---
+# Integer types from narrowest to widest, with their inclusive value ranges.
+INTEGER_TYPES = [
+    ("smallint", -(2**15), 2**15 - 1),
+    ("integer", -(2**31), 2**31 - 1),
+    ("bigint", -(2**63), 2**63 - 1),
+]
+# Result types worth narrowing: aggregates such as COUNT and SUM widen codes
+# to bigint or numeric even when every value fits a smaller integer.
+NARROWABLE_TYPES = {"integer", "bigint", "numeric"}
+MAX_IDENTIFIER_LENGTH = 63
+
+
+def narrowest_integer_type(min_value: Any, max_value: Any) -> Optional[str]:
+    """Returns the smallest integer type holding both bounds, if any does."""
+    for type_name, low, high in INTEGER_TYPES:
+        if low <= min_value and max_value <= high:
+            return type_name
+    return None
+
+
+def narrow_column_types(
+    cursor, table_name: str, columns: List[Column]
+) -> Dict[str, str]:
+    """
+    Shrinks integer-valued columns to the smallest integer type that fits.
+
+    One scan reads the range of every candidate column (and, for
+    ``numeric``, whether all values are whole numbers); all changes are then
+    applied in a single ``ALTER TABLE``, i.e. one table rewrite. Columns
+    that are entirely NULL, fractional or already narrowest are left alone.
+
+    Returns:
+        ``{column: new_type}`` for every column that was changed.
+    """
+    candidates = [(name, t) for name, t in columns if t in NARROWABLE_TYPES]
+    if not candidates:
+        return {}
+
+    probes = []
+    for name, type_sql in candidates:
+        ident = sql.Identifier(name)
+        integral = (
+            sql.SQL("bool_and({c} = trunc({c}))").format(c=ident)
+            if type_sql == "numeric"
+            else sql.SQL("TRUE")
+        )
+        probes.append(
+            sql.SQL("min({c}), max({c}), {integral}").format(c=ident, integral=integral)
+        )
+    cursor.execute(
+        sql.SQL("SELECT {} FROM {}").format(
+            sql.SQL(", ").join(probes), sql.Identifier(table_name)
+        )
+    )
+    row = cursor.fetchone()
+
+    changes: Dict[str, str] = {}
+    for i, (name, type_sql) in enumerate(candidates):
+        min_value, max_value, integral = row[3 * i : 3 * i + 3]
+        if min_value is None or not integral:
+            continue
+        new_type = narrowest_integer_type(min_value, max_value)
+        if new_type and new_type != type_sql:
+            changes[name] = new_type
+
+    if changes:
+        cursor.execute(
+            sql.SQL("ALTER TABLE {} {}").format(
+                sql.Identifier(table_name),
+                sql.SQL(", ").join(
+                    sql.SQL("ALTER COLUMN {c} TYPE {t}").format(
+                        c=sql.Identifier(name), t=sql.SQL(new_type)
+                    )
+                    for name, new_type in changes.items()
+                ),
+            )
+        )
+    return changes
+
+
+def _index_name(table_name: str, column: str) -> str:
+    """Builds an index name within PostgreSQL's identifier length limit."""
+    return f"{table_name}_{column}_idx"[:MAX_IDENTIFIER_LENGTH]
+
+
+def optimize_table(
+    target_engine: Engine,
+    table_name: str,
+    primary_key: Optional[str] = None,
+    index_columns: Optional[List[str]] = None,
+    narrow_types: bool = True,
+    cluster: bool = False,
+    set_logged: bool = False,
+) -> Dict[str, Any]:
+    """
+    Applies the post-load physical steps to a benchmark table.
+
+    Steps, each logged and recorded in the returned report:
+    1. narrow integer-valued columns (``narrow_types``);
+    2. switch an UNLOGGED table back to LOGGED (``set_logged``), after the
+       narrowing rewrite and before any index exists to be rebuilt;
+    3. add the primary key; recorded as failed, with the server's error, if
+       the key column is not unique and non-NULL;
+    4. create a B-tree index per filter column that exists in the table;
+    5. ``CLUSTER`` on the primary key (``cluster``), restoring key order
+       lost by parallel loads;
+    6. ``VACUUM (ANALYZE)`` for fresh statistics and visibility map.
+
+    The connection runs in autocommit mode, so every step is its own
+    transaction and a failure in one (recorded in the report) does not undo
+    the others.
+
+    Args:
+        target_engine: Engine connected to the database holding the table.
+        table_name: Name of the loaded table.
+        primary_key: Column to make the primary key; None to skip.
+        index_columns: Columns to index; missing columns are reported.
+        narrow_types: Whether to shrink integer-valued columns.
+        cluster: Whether to physically reorder the table by primary key.
+        set_logged: Whether the table was loaded UNLOGGED.
+
+    Returns:
+        A report of what was applied, skipped or failed, with timings.
+    """
+    report: Dict[str, Any] = {"table": table_name, "steps": []}
+    table = sql.Identifier(table_name)
+
+    conn = target_engine.raw_connection()
+    conn.autocommit = True  # VACUUM cannot run inside a transaction block.
+    with conn.cursor() as cur:
+        columns = get_table_columns(cur, table_name)
+    column_names = {name for name, _ in columns}
+
+    def _record(entry: Dict[str, Any], start_time: float) -> bool:
+        entry["seconds"] = round(time.monotonic() - start_time, 2)
+        report["steps"].append(entry)
+        logging.info(
+            "  %-14s %-16s %s (%ss)%s",
+            entry["step"],
+            entry["detail"],
+            entry["status"],
+            entry["seconds"],
+            f" {entry['changes']}" if entry.get("changes") else "",
+        )
+        return entry["status"] == "applied"
+
+    def _run_step(step: str, detail: str, statement: sql.Composable) -> bool:
+        start_time = time.monotonic()
+        entry: Dict[str, Any] = {"step": step, "detail": detail}
+        try:
+            with conn.cursor() as cur:
+                cur.execute(statement)
+            entry["status"] = "applied"
+        except Exception as e:
+            logging.warning("  %s (%s) failed: %s", step, detail, e)
+            entry.update({"status": "failed", "error": str(e).strip()})
+        return _record(entry, start_time)
+
+    try:
+        if narrow_types:
+            start_time = time.monotonic()
+            entry = {"step": "narrow_types", "detail": table_name}
+            try:
+                with conn.cursor() as cur:
+                    changes = narrow_column_types(cur, table_name, columns)
+                entry.update({"status": "applied", "changes": changes})
+            except Exception as e:
+                logging.warning("  narrow_types (%s) failed: %s", table_name, e)
+                entry.update({"status": "failed", "error": str(e).strip()})
+            _record(entry, start_time)
+
+        if set_logged:
+            _run_step(
+                "set_logged",
+                table_name,
+                sql.SQL("ALTER TABLE {} SET LOGGED").format(table),
+            )
+
+        has_primary_key = False
+        if primary_key and primary_key in column_names:
+            has_primary_key = _run_step(
+                "primary_key",
+                primary_key,
+                sql.SQL("ALTER TABLE {} ADD PRIMARY KEY ({})").format(
+                    table, sql.Identifier(primary_key)
+                ),
+            )
+        elif primary_key:
+            _record(
+                {
+                    "step": "primary_key",
+                    "detail": primary_key,
+                    "status": "missing",
+                },
+                time.monotonic(),
+            )
+
+        for column in index_columns or []:
+            if column not in column_names:
+                _record(
+                    {
+                        "step": "index",
+                        "detail": column,
+                        "status": "missing",
+                    },
+                    time.monotonic(),
+                )
+                continue
+            _run_step(
+                "index",
+                column,
+                sql.SQL("CREATE INDEX {} ON {} ({})").format(
+                    sql.Identifier(_index_name(table_name, column)),
+                    table,
+                    sql.Identifier(column),
+                ),
+            )
+
+        if cluster and has_primary_key:
+            _run_step(
+                "cluster",
+                primary_key,
+                sql.SQL("CLUSTER {} USING {}").format(
+                    table, sql.Identifier(f"{table_name}_pkey")
+                ),
+            )
+        elif cluster:
+            _record(
+                {
+                    "step": "cluster",
+                    "detail": "no primary key",
+                    "status": "skipped",
+                },
+                time.monotonic(),
+            )
+
+        _run_step(
+            "vacuum_analyze",
+            table_name,
+            sql.SQL("VACUUM (ANALYZE) {}").format(table),
+        )
+    finally:
+        conn.close()
+
+    return report
@@ -0,0 +1,418 @@
+# -*- coding: utf-8 -*-
+"""Streams a SQL dump statement by statement, with batching and checkpoints."""
+
+import io
+import json
+import logging
+import re
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from .copy_loader import DEFAULT_CHUNK_ROWS
+from .insert_rewriter import parse_insert
+
+# --- Constants ---
+READ_BLOCK_CHARS = 1024 * 1024
+DEFAULT_BATCH_STATEMENTS = 100
+DEFAULT_COMMIT_STATEMENTS = 5000
+COPY_SAVEPOINT = "insert_copy_run"
+
+# Scanner states
+NORMAL = "normal"
+SINGLE_QUOTE = "single_quote"
+DOUBLE_QUOTE = "double_quote"
+LINE_COMMENT = "line_comment"
+BLOCK_COMMENT = "block_comment"
+DOLLAR_QUOTE = "dollar_quote"
+
+NORMAL_SPECIALS = re.compile(r"[;'\"$/-]")
+DOLLAR_TAG = re.compile(r"\$(?:[A-Za-z_][A-Za-z0-9_]*)?\$")
+PARTIAL_DOLLAR_TAG = re.compile(r"\$[A-Za-z0-9_]*\Z")
+IDENTIFIER_CHAR = re.compile(r"[A-Za-z0-9_$]")
+QUOTE_ENDS = {
+    SINGLE_QUOTE: re.compile("'"),
+    DOUBLE_QUOTE: re.compile('"'),
+}
+ESCAPED_QUOTE_END = re.compile(r"[\\']")
+BLOCK_DELIMITERS = re.compile(r"/\*|\*/")
+# Statements are re-joined for batching; the newline keeps a trailing line
+# comment from swallowing the separator.
+BATCH_SEPARATOR = "\n;\n"
+
+
+class StatementSplitter:
+    """
+    Incrementally splits SQL text into statements at top-level semicolons.
+
+    Text is fed in arbitrary pieces; semicolons inside single-quoted strings
+    (including ``E'...'`` backslash escapes and doubled quotes), quoted
+    identifiers, ``--`` and nested ``/* */`` comments and dollar-quoted
+    bodies (``$$...$$``, ``$tag$...$tag$``) do not end a statement. When a
+    piece ends in the middle of a token that needs lookahead (``-`` or
+    ``''``, say), scanning pauses there until more text arrives. Statements
+    consisting only of comments and whitespace are dropped.
+    """
+
+    def __init__(self) -> None:
+        self._buffer = ""
+        self._pos = 0
+        self._state = NORMAL
+        self._escapes = False
+        self._depth = 0
+        self._tag = ""
+        self._has_code = False
+
+    def feed(self, text: str) -> List[str]:
+        """Adds text and returns the statements it completed."""
+        self._buffer += text
+        return self._scan(final=False)
+
+    def finish(self) -> List[str]:
+        """Returns the remaining statements, including one without a ``;``."""
+        statements = self._scan(final=True)
+        if self._has_code and self._buffer.strip():
+            statements.append(self._buffer.strip())
+        self._buffer, self._pos, self._has_code = "", 0, False
+        return statements
+
+    def _emit(self, end: int, statements: List[str]) -> None:
+        """Ends the current statement at ``end`` (the semicolon)."""
+        if self._has_code:
+            statements.append(self._buffer[:end].strip())
+        self._buffer = self._buffer[end + 1 :]
+        self._pos = 0
+        self._has_code = False
+
+    def _scan(self, final: bool) -> List[str]:
+        statements: List[str] = []
+        buf_len = len(self._buffer)
+        while self._pos < buf_len:
+            buf = self._buffer
+            if self._state == NORMAL:
+                match = NORMAL_SPECIALS.search(buf, self._pos)
+                end = match.start() if match else buf_len
+                if buf[self._pos : end].strip():
+                    self._has_code = True
+                if not match:
+                    self._pos = buf_len
+                    break
+                i, char = end, match.group()
+                nxt = buf[i + 1] if i + 1 < buf_len else ""
+                if char in "-/" and not nxt and not final:
+                    self._pos = i  # need the next character
+                    break
+                if char == ";":
+                    self._emit(i, statements)
+                    buf_len = len(self._buffer)
+                    continue
+                if char == "-" and nxt == "-":
+                    self._state, self._pos = LINE_COMMENT, i + 2
+                    continue
+                if char == "/" and nxt == "*":
+                    self._state, self._depth, self._pos = BLOCK_COMMENT, 1, i + 2
+                    continue
+                self._has_code = True
+                if char == "'":
+                    prefix = buf[max(i - 2, 0) : i]
+                    self._escapes = prefix[-1:] in ("E", "e") and not (
+                        len(prefix) == 2 and IDENTIFIER_CHAR.match(prefix[0])
+                    )
+                    self._state, self._pos = SINGLE_QUOTE, i + 1
+                elif char == '"':
+                    self._state, self._pos = DOUBLE_QUOTE, i + 1
+                elif char == "$":
+                    tag = DOLLAR_TAG.match(buf, i)
+                    after_identifier = i > 0 and IDENTIFIER_CHAR.match(buf[i - 1])
+                    if tag and not after_identifier:
+                        self._state, self._tag = DOLLAR_QUOTE, tag.group()
+                        self._pos = tag.end()
+                    elif (
+                        not final
+                        and not after_identifier
+                        and PARTIAL_DOLLAR_TAG.match(buf, i)
+                    ):
+                        self._pos = i  # the tag may continue in the next piece
+                        break
+                    else:
+                        self._pos = i + 1
+                else:
+                    self._pos = i + 1
+            elif self._state in (SINGLE_QUOTE, DOUBLE_QUOTE):
+                quote = "'" if self._state == SINGLE_QUOTE else '"'
+                pattern = QUOTE_ENDS[self._state]
+                if self._escapes and self._state == SINGLE_QUOTE:
+                    pattern = ESCAPED_QUOTE_END
+                match = pattern.search(buf, self._pos)
+                if not match:
+                    self._pos = buf_len
+                    break
+                i = match.start()
+                if i + 1 >= buf_len and not final:
+                    self._pos = i  # a doubled quote or escape may follow
+                    break
+                if match.group() == "\\":
+                    self._pos = i + 2
+                elif buf[i + 1 : i + 2] == quote:
+                    self._pos = i + 2
+                else:
+                    self._state, self._pos = NORMAL, i + 1
+            elif self._state == LINE_COMMENT:
+                i = buf.find("\n", self._pos)
+                if i < 0:
+                    self._pos = buf_len
+                    break
+                self._state, self._pos = NORMAL, i + 1
+            elif self._state == BLOCK_COMMENT:
+                match = BLOCK_DELIMITERS.search(buf, self._pos)
+                if not match:
+                    # Keep a trailing "/" or "*" that may start a delimiter.
+                    self._pos = max(self._pos, buf_len - 1)
+                    break
+                self._depth += 1 if match.group() == "/*" else -1
+                self._pos = match.end()
+                if self._depth == 0:
+                    self._state = NORMAL
+            else:  # DOLLAR_QUOTE
+                i = buf.find(self._tag, self._pos)
+                if i < 0:
+                    self._pos = max(self._pos, buf_len - len(self._tag) + 1)
+                    break
+                self._state, self._pos = NORMAL, i + len(self._tag)
+        return statements
+
+
+def iter_statements(sql_file_path: Path) -> Iterator[str]:
+    """Yields the statements of a SQL file without reading it all at once."""
+    splitter = StatementSplitter()
+    with open(sql_file_path, "r", encoding="utf-8") as f:
+        for block in iter(lambda: f.read(READ_BLOCK_CHARS), ""):
+            yield from splitter.feed(block)
+    yield from splitter.finish()
+
+
+def file_signature(sql_file_path: Path) -> Dict[str, Any]:
+    """Identifies a dump version by name, size and modification time."""
+    stat = sql_file_path.stat()
+    return {
+        "file": sql_file_path.name,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def load_checkpoint(checkpoint_path: Path, sql_file_path: Path) -> int:
+    """
+    Returns the number of statements already committed from this dump.
+
+    A checkpoint written for a different version of the file is ignored.
+    """
+    if not checkpoint_path.is_file():
+        return 0
+    try:
+        with open(checkpoint_path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        logging.warning("Ignoring unreadable checkpoint '%s': %s", checkpoint_path, e)
+        return 0
+    if checkpoint.get("signature") != file_signature(sql_file_path):
+        logging.warning("Ignoring checkpoint for a different version of the dump.")
+        return 0
+    return int(checkpoint.get("statements_committed", 0))
+
+
+def save_checkpoint(
+    checkpoint_path: Path, sql_file_path: Path, statements_committed: int
+) -> None:
+    """Records how many statements of the dump are committed (atomically)."""
+    checkpoint_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = checkpoint_path.with_suffix(".tmp")
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "signature": file_signature(sql_file_path),
+                "statements_committed": statements_committed,
+            },
+            f,
+        )
+    tmp_path.replace(checkpoint_path)
+
+
+def execute_dump(
+    conn,
+    sql_file_path: Path,
+    batch_statements: int = DEFAULT_BATCH_STATEMENTS,
+    commit_statements: int = DEFAULT_COMMIT_STATEMENTS,
+    checkpoint_path: Optional[Path] = None,
+    copy_inserts: bool = False,
+    copy_rows: int = DEFAULT_CHUNK_ROWS,
+    statement_filter: Optional[Callable[[str], Optional[str]]] = None,
+) -> Dict[str, Any]:
+    """
+    Executes a SQL dump statement by statement on an open connection.
+
+    Statements are sent ``batch_statements`` at a time (one round trip per
+    batch) and committed every ``commit_statements`` statements, so memory
+    stays bounded and a late failure only loses the open transaction. With
+    a ``checkpoint_path``, the committed statement count is recorded after
+    every commit; a later run skips that many statements, resuming after
+    the last commit. The checkpoint is removed once the dump completes.
+
+    With ``copy_inserts``, consecutive INSERTs of plain literals into the
+    same table and columns are rewritten on the fly into one ``COPY ...
+    FROM STDIN`` stream (up to ``copy_rows`` rows each). Each COPY runs
+    under a savepoint; if the server rejects it (e.g. a literal COPY parses
+    differently from INSERT), the run's statements are executed verbatim
+    instead. Statements that cannot be rewritten are always run verbatim.
+
+    A ``statement_filter`` sees every statement first and returns the
+    statement to execute (possibly rewritten) or None to skip it, e.g. to
+    defer it until after the data is loaded.
+
+    Args:
+        conn: psycopg2 connection to the target database.
+        sql_file_path: Dump file to execute.
+        batch_statements: Statements sent per ``execute`` call.
+        commit_statements: Statements per transaction (rounded up to whole
+            batches).
+        checkpoint_path: Optional JSON file for resuming interrupted runs.
+        copy_inserts: Whether to load runs of INSERTs via COPY.
+        copy_rows: Maximum rows per rewritten COPY stream.
+        statement_filter: Optional rewrite/skip hook applied to each
+            statement.
+
+    Returns:
+        Statistics: statements (executed this run), resumed_from, commits,
+        seconds, statements_per_s, and for ``copy_inserts`` the
+        statements_copied, rows_copied and copy_fallbacks.
+
+    Raises:
+        psycopg2.Error: From the failing batch, after the open transaction
+            is rolled back; the error message names the statement range.
+    """
+    resumed_from = 0
+    if checkpoint_path is not None:
+        resumed_from = load_checkpoint(checkpoint_path, sql_file_path)
+        if resumed_from:
+            logging.info("Resuming after %s committed statements.", resumed_from)
+
+    start_time = time.monotonic()
+    executed = commits = uncommitted = 0
+    statements_copied = rows_copied = copy_fallbacks = 0
+    batch: List[str] = []
+    copy_sql: Optional[str] = None
+    copy_lines: List[str] = []
+    copy_statements: List[str] = []
+
+    def _flush() -> None:
+        nonlocal executed, uncommitted
+        if not batch:
+            return
+        first = resumed_from + executed + 1
+        try:
+            with conn.cursor() as cur:
+                cur.execute(BATCH_SEPARATOR.join(batch))
+        except Exception:
+            conn.rollback()
+            logging.error(
+                "Statements %s-%s failed; first: %.200s",
+                first,
+                first + len(batch) - 1,
+                batch[0],
+            )
+            raise
+        executed += len(batch)
+        uncommitted += len(batch)
+        batch.clear()
+
+    def _flush_copy() -> None:
+        nonlocal executed, uncommitted, statements_copied, rows_copied
+        nonlocal copy_fallbacks
+        if not copy_statements:
+            return
+        with conn.cursor() as cur:
+            cur.execute(f"SAVEPOINT {COPY_SAVEPOINT}")
+            try:
+                cur.copy_expert(copy_sql, io.StringIO("".join(copy_lines)))
+                cur.execute(f"RELEASE SAVEPOINT {COPY_SAVEPOINT}")
+            except Exception as e:
+                cur.execute(f"ROLLBACK TO SAVEPOINT {COPY_SAVEPOINT}")
+                logging.warning(
+                    "  COPY of %s rewritten INSERTs failed (%s); "
+                    "executing them verbatim.",
+                    len(copy_statements),
+                    str(e).strip().splitlines()[0],
+                )
+                copy_fallbacks += 1
+                verbatim = list(copy_statements)
+            else:
+                executed += len(copy_statements)
+                uncommitted += len(copy_statements)
+                statements_copied += len(copy_statements)
+                rows_copied += len(copy_lines)
+                verbatim = []
+        copy_lines.clear()
+        copy_statements.clear()
+        for start in range(0, len(verbatim), batch_statements):
+            batch.extend(verbatim[start : start + batch_statements])
+            _flush()
+
+    def _commit() -> None:
+        nonlocal commits, uncommitted
+        conn.commit()
+        commits += 1
+        uncommitted = 0
+        if checkpoint_path is not None:
+            save_checkpoint(checkpoint_path, sql_file_path, resumed_from + executed)
+        elapsed_s = time.monotonic() - start_time
+        logging.info(
+            "  %s statements committed (%.0f statements/s).",
+            resumed_from + executed,
+            executed / elapsed_s if elapsed_s > 0 else 0,
+        )
+
+    for index, statement in enumerate(iter_statements(sql_file_path), 1):
+        if index <= resumed_from:
+            continue
+        if statement_filter is not None:
+            statement = statement_filter(statement)
+            if statement is None:
+                continue
+        parsed = parse_insert(statement) if copy_inserts else None
+        if parsed is not None:
+            _flush()
+            if parsed[0] != copy_sql or len(copy_lines) >= copy_rows:
+                _flush_copy()
+                copy_sql = parsed[0]
+            copy_lines.extend(parsed[1])
+            copy_statements.append(statement)
+        else:
+            _flush_copy()
+            batch.append(statement)
+            if len(batch) >= batch_statements:
+                _flush()
+        if uncommitted + len(batch) + len(copy_statements) >= commit_statements:
+            _flush()
+            _flush_copy()
+            _commit()
+    _flush()
+    _flush_copy()
+    _commit()
+    if checkpoint_path is not None:
+        checkpoint_path.unlink(missing_ok=True)
+
+    elapsed_s = time.monotonic() - start_time
+    stats = {
+        "statements": executed,
+        "resumed_from": resumed_from,
+        "commits": commits,
+        "seconds": round(elapsed_s, 2),
+        "statements_per_s": round(executed / elapsed_s, 1) if elapsed_s > 0 else None,
+    }
+    if copy_inserts:
+        stats.update({
+            "statements_copied": statements_copied,
+            "rows_copied": rows_copied,
+            "copy_fallbacks": copy_fallbacks,
+        })
+    return stats
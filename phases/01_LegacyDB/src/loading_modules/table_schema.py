@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Target table definitions derived from a source query's result descriptor."""
+
+from typing import List, Tuple
+
+from psycopg2 import sql
+from sqlalchemy.engine import Engine
+
+# --- Constants ---
+DESCRIBE_VIEW_NAME = "benchmark_extract_describe"
+
+Column = Tuple[str, str]  # (name, SQL type)
+
+
+def strip_statement(query_sql: str) -> str:
+    """Removes the trailing semicolon so the query can be wrapped in a cursor."""
+    return query_sql.strip().rstrip(";").rstrip()
+
+
+def describe_query_columns(source_engine: Engine, query_sql: str) -> List[Column]:
+    """
+    Returns the exact column names and types of a query's result.
+
+    The query is wrapped in a temporary view (created and rolled back, never
+    executed) so that ``format_type`` can report each column's full type,
+    including length and precision modifiers.
+    """
+    conn = source_engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                sql.SQL("CREATE TEMP VIEW {} AS {}").format(
+                    sql.Identifier(DESCRIBE_VIEW_NAME),
+                    sql.SQL(strip_statement(query_sql)),
+                )
+            )
+            return get_table_columns(cur, DESCRIBE_VIEW_NAME)
+    finally:
+        conn.rollback()
+        conn.close()
+
+
+def get_table_columns(cursor, table_name: str) -> List[Column]:
+    """Returns the column names and full types of a table or view."""
+    cursor.execute(
+        """
+        SELECT attname, format_type(atttypid, atttypmod)
+        FROM pg_attribute
+        WHERE attrelid = CAST(%s AS regclass) AND attnum > 0
+          AND NOT attisdropped
+        ORDER BY attnum
+        """,
+        [sql.Identifier(table_name).as_string(cursor)],
+    )
+    return [(name, type_sql) for name, type_sql in cursor.fetchall()]
+
+
+def create_table(
+    cursor, table_name: str, columns: List[Column], unlogged: bool = False
+) -> None:
+    """(Re)creates a table with the given column names and types."""
+    cursor.execute(
+        sql.SQL("DROP TABLE IF EXISTS {}").format(sql.Identifier(table_name))
+    )
+    cursor.execute(
+        sql.SQL("CREATE {}TABLE {} ({})").format(
+            sql.SQL("UNLOGGED " if unlogged else ""),
+            sql.Identifier(table_name),
+            sql.SQL(", ").join(
+                sql.SQL("{} {}").format(sql.Identifier(name), sql.SQL(type_sql))
+                for name, type_sql in columns
+            ),
+        )
+    )
+
+
+def create_typed_table(
+    source_engine: Engine,
+    query_sql: str,
+    target_engine: Engine,
+    table_name: str,
+    unlogged: bool = False,
+) -> List[Column]:
+    """
+    (Re)creates the target table with the types of the query's result.
+
+    With ``unlogged``, the table is created UNLOGGED (its data skips the
+    WAL) and must be switched to LOGGED once loaded.
+
+    Returns:
+        The column definitions used, in result order.
+    """
+    columns = describe_query_columns(source_engine, query_sql)
+    conn = target_engine.raw_connection()
+    try:
+        with conn.cursor() as cur:
+            create_table(cur, table_name, columns, unlogged=unlogged)
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+    return columns
@@ -0,0 +1,148 @@
+# -*- coding: utf-8 -*-
+"""Frozen template databases and fast working copies cloned from them."""
+
+import logging
+import time
+from typing import Dict
+
+import psycopg2
+from psycopg2 import sql
+from psycopg2.extensions import ISOLATION_LEVEL_AUTOCOMMIT
+
+# --- Constants ---
+TEMPLATE_DB_SUFFIX = "_template"
+# CREATE DATABASE ... STRATEGY exists from PostgreSQL 15. FILE_COPY copies
+# the template's files and checkpoints once, which is much faster for large
+# databases than the WAL_LOG default (block-by-block through the WAL).
+STRATEGY_MIN_SERVER_VERSION = 150000
+STRATEGY_FILE_COPY = "file_copy"
+STRATEGY_WAL_LOG = "wal_log"
+CLONE_STRATEGIES = (STRATEGY_FILE_COPY, STRATEGY_WAL_LOG)
+
+
+def template_name(db_name: str) -> str:
+    """Returns the name of a database's frozen template."""
+    return f"{db_name}{TEMPLATE_DB_SUFFIX}"
+
+
+def database_exists(cursor, db_name: str) -> bool:
+    """Returns True if the database exists on the server."""
+    cursor.execute("SELECT 1 FROM pg_database WHERE datname = %s", [db_name])
+    return cursor.fetchone() is not None
+
+
+def has_template(db_config: Dict, db_name: str) -> bool:
+    """
+    Returns True if the database's frozen template exists.
+
+    A template database that was never frozen (e.g. an interrupted restore)
+    does not count.
+    """
+    conn = psycopg2.connect(**db_config)
+    try:
+        with conn.cursor() as cur:
+            cur.execute(
+                "SELECT datistemplate FROM pg_database WHERE datname = %s",
+                [template_name(db_name)],
+            )
+            row = cur.fetchone()
+            return bool(row and row[0])
+    finally:
+        conn.close()
+
+
+def terminate_sessions(cursor, db_name: str) -> None:
+    """Ends other sessions on a database, which block cloning and dropping."""
+    cursor.execute(
+        "SELECT pg_terminate_backend(pid) FROM pg_stat_activity "
+        "WHERE datname = %s AND pid <> pg_backend_pid()",
+        [db_name],
+    )
+
+
+def drop_database(cursor, db_name: str) -> None:
+    """Drops a database (template or not) if it exists."""
+    if not database_exists(cursor, db_name):
+        return
+    cursor.execute(
+        sql.SQL("ALTER DATABASE {} WITH IS_TEMPLATE false").format(
+            sql.Identifier(db_name)
+        )
+    )
+    terminate_sessions(cursor, db_name)
+    cursor.execute(sql.SQL("DROP DATABASE {}").format(sql.Identifier(db_name)))
+
+
+def freeze_template(db_config: Dict, db_name: str) -> None:
+    """
+    Marks a database as a template that no one can connect to.
+
+    ``ALLOW_CONNECTIONS false`` keeps the template pristine (nothing can
+    modify it) and guarantees that cloning is never blocked by a session.
+    """
+    conn = psycopg2.connect(**db_config)
+    try:
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            terminate_sessions(cur, db_name)
+            cur.execute(
+                sql.SQL(
+                    "ALTER DATABASE {} WITH IS_TEMPLATE true ALLOW_CONNECTIONS false"
+                ).format(sql.Identifier(db_name))
+            )
+    finally:
+        conn.close()
+    logging.info("Froze '%s' as a template.", db_name)
+
+
+def clone_database(
+    db_config: Dict,
+    source_db: str,
+    target_db: str,
+    strategy: str = STRATEGY_FILE_COPY,
+) -> float:
+    """
+    (Re)creates ``target_db`` as a copy of ``source_db``.
+
+    An existing target is dropped first. The source must have no other
+    sessions, so they are terminated (frozen templates have none). The
+    ``STRATEGY`` clause is only sent to servers that support it.
+
+    Returns:
+        The time the clone took, in seconds.
+    """
+    if strategy not in CLONE_STRATEGIES:
+        raise ValueError(f"Unknown clone strategy '{strategy}'")
+
+    start_time = time.monotonic()
+    conn = psycopg2.connect(**db_config)
+    try:
+        conn.set_isolation_level(ISOLATION_LEVEL_AUTOCOMMIT)
+        with conn.cursor() as cur:
+            drop_database(cur, target_db)
+            terminate_sessions(cur, source_db)
+            statement = sql.SQL("CREATE DATABASE {} TEMPLATE {}").format(
+                sql.Identifier(target_db), sql.Identifier(source_db)
+            )
+            if conn.server_version >= STRATEGY_MIN_SERVER_VERSION:
+                statement += sql.SQL(" STRATEGY {}").format(sql.SQL(strategy.upper()))
+            cur.execute(statement)
+    finally:
+        conn.close()
+    seconds = round(time.monotonic() - start_time, 2)
+    logging.info("Cloned '%s' into '%s' in %ss.", source_db, target_db, seconds)
+    return seconds
+
+
+def snapshot_template(
+    db_config: Dict, db_name: str, strategy: str = STRATEGY_FILE_COPY
+) -> float:
+    """
+    Replaces a database's template with a copy of its current state.
+
+    Returns:
+        The time the copy took, in seconds.
+    """
+    seconds = clone_database(db_config, db_name, template_name(db_name), strategy)
+    freeze_template(db_config, template_name(db_name))
+    return seconds
@@ -13,10 +13,19 @@ to the functions within.
 
 Package Structure:
     - base.py: Core utility functions for discovering database objects.
+    - timing.py: Trial timing and latency-distribution statistics.
     - metrics_basic.py: Database and schema-level summary statistics.
     - metrics_schema.py: Structural metrics for tables and columns.
     - metrics_profile.py: Data content profiling (NULLs, cardinality).
     - metrics_interop.py: Custom heuristic metrics (JDI, LIF, NF).
     - metrics_performance.py: Canonical query performance benchmarking.
+    - metrics_plans.py: EXPLAIN ANALYZE plan capture for canonical queries.
+    - metrics_load.py: Concurrent load generation (throughput, tail latency).
+    - metrics_cache.py: Cold/warm buffer-cache preparation for benchmarks.
+    - metrics_sweeps.py: Parameter sweeps of templated queries (selectivity).
+    - metrics_indexes.py: Candidate-index experiments on a scratch copy.
+    - metrics_statements.py: pg_stat_statements counters per canonical query.
+    - metrics_columnar.py: Canonical queries on Parquet exports via DuckDB.
+    - benchmark_history.py: Persistent run history and regression detection.
 
 """
@@ -0,0 +1,255 @@
+# -*- coding: utf-8 -*-
+"""Persistent SQLite history of benchmark runs and regression detection."""
+
+import json
+import logging
+import sqlite3
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+
+from .timing import bootstrap_median_ratio_ci, parse_latency_samples
+
+# --- Constants ---
+DEFAULT_HISTORY_PATH = "outputs/history/benchmark_history.sqlite"
+DEFAULT_BASELINE_RUNS = 5
+DEFAULT_MIN_SLOWDOWN = 1.10
+RUNS_TABLE = "benchmark_runs"
+RESULTS_TABLE = "benchmark_results"
+# Server settings that commonly change query latency; recorded per run so that
+# a regression can be traced back to a configuration change.
+TRACKED_SETTINGS = [
+    "shared_buffers",
+    "work_mem",
+    "effective_cache_size",
+    "random_page_cost",
+    "max_parallel_workers_per_gather",
+    "jit",
+]
+# Benchmark result columns stored per query; anything else stays in the CSVs.
+RESULT_COLUMNS = [
+    "category",
+    "query_id",
+    "cache_state",
+    "fetch_mode",
+    "warmup_runs",
+    "trials",
+    "latency_median_ms",
+    "latency_p95_ms",
+    "latency_p99_ms",
+    "latency_samples_ms",
+    "rows_returned",
+    "status",
+]
+REGRESSION_KEYS = ["database", "query_id", "cache_state", "fetch_mode"]
+
+_SCHEMA_SQL = f"""
+CREATE TABLE IF NOT EXISTS {RUNS_TABLE} (
+    run_id TEXT PRIMARY KEY,
+    started_at TEXT NOT NULL,
+    pipeline_settings TEXT
+);
+CREATE TABLE IF NOT EXISTS {RESULTS_TABLE} (
+    run_id TEXT NOT NULL REFERENCES {RUNS_TABLE} (run_id),
+    database TEXT NOT NULL,
+    server_version TEXT,
+    server_settings TEXT,
+    {", ".join(f"{col} TEXT" for col in RESULT_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS idx_{RESULTS_TABLE}_key
+    ON {RESULTS_TABLE} (database, query_id, cache_state, fetch_mode);
+"""
+
+
+def _connect(history_path: Path) -> sqlite3.Connection:
+    """Opens the history database, creating it and its tables if needed."""
+    history_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(history_path)
+    conn.executescript(_SCHEMA_SQL)
+    return conn
+
+
+def new_run_id() -> str:
+    """Returns a sortable, unique identifier for a pipeline run."""
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+
+
+def get_server_info(engine: Engine) -> Dict[str, Any]:
+    """Reads the server version and the tracked planner/memory settings."""
+    with engine.connect() as connection:
+        version = connection.execute(text("SHOW server_version")).scalar_one()
+        rows = connection.execute(
+            text(
+                "SELECT name, setting, unit FROM pg_settings WHERE name = ANY(:names)"
+            ),
+            {"names": TRACKED_SETTINGS},
+        )
+        settings = {
+            name: f"{setting} {unit}" if unit else setting
+            for name, setting, unit in rows
+        }
+    return {"server_version": version, "server_settings": json.dumps(settings)}
+
+
+def record_run(
+    history_path: Path, run_id: str, pipeline_settings: Dict[str, Any]
+) -> None:
+    """Registers a pipeline run and the benchmark settings it used."""
+    with _connect(history_path) as conn:
+        conn.execute(
+            f"INSERT OR IGNORE INTO {RUNS_TABLE} VALUES (?, ?, ?)",
+            (
+                run_id,
+                datetime.now().isoformat(timespec="seconds"),
+                json.dumps(pipeline_settings, default=str),
+            ),
+        )
+    conn.close()
+
+
+def append_benchmark_results(
+    history_path: Path,
+    run_id: str,
+    db_name: str,
+    results: List[Dict[str, Any]],
+    server_info: Dict[str, Any],
+) -> int:
+    """
+    Appends one database's benchmark results to the history store.
+
+    Returns:
+        The number of rows written.
+    """
+    rows = [
+        (
+            run_id,
+            db_name,
+            server_info.get("server_version"),
+            server_info.get("server_settings"),
+            *(
+                None if result.get(col) is None else str(result.get(col))
+                for col in RESULT_COLUMNS
+            ),
+        )
+        for result in results
+    ]
+    placeholders = ", ".join("?" * (4 + len(RESULT_COLUMNS)))
+    with _connect(history_path) as conn:
+        conn.executemany(f"INSERT INTO {RESULTS_TABLE} VALUES ({placeholders})", rows)
+    conn.close()
+    return len(rows)
+
+
+def load_history(history_path: Path) -> pd.DataFrame:
+    """Loads every stored benchmark result together with its run timestamp."""
+    if not history_path.is_file():
+        return pd.DataFrame()
+
+    conn = _connect(history_path)
+    try:
+        history = pd.read_sql_query(
+            f"""
+            SELECT r.started_at, b.*
+            FROM {RESULTS_TABLE} AS b
+            JOIN {RUNS_TABLE} AS r USING (run_id)
+            ORDER BY r.started_at
+            """,
+            conn,
+        )
+    finally:
+        conn.close()
+
+    for col in ["latency_median_ms", "latency_p95_ms", "latency_p99_ms"]:
+        history[col] = pd.to_numeric(history[col], errors="coerce")
+    return history
+
+
+def detect_regressions(
+    history: pd.DataFrame,
+    baseline_runs: int = DEFAULT_BASELINE_RUNS,
+    min_slowdown: float = DEFAULT_MIN_SLOWDOWN,
+) -> pd.DataFrame:
+    """
+    Compares the newest run against a window of earlier runs, per query.
+
+    For each (database, query, cache state, fetch mode) measured in the newest
+    run, the raw samples of up to ``baseline_runs`` earlier runs are pooled
+    into a baseline. A query is flagged as a regression when the bootstrap
+    confidence interval of median(newest) / median(baseline) lies entirely
+    above 1 and the point estimate is at least ``min_slowdown``. Single-trial
+    runs carry no variability information and are never flagged.
+
+    Returns:
+        One row per compared query, with the slowdown ratio, its confidence
+        interval, the server versions involved and a ``regression`` flag.
+    """
+    if history.empty:
+        return pd.DataFrame()
+
+    df = history[history["status"] == "Success"]
+    run_order = df.groupby("run_id")["started_at"].min().sort_values()
+    if len(run_order) < 2:
+        logging.info("Benchmark history has fewer than two runs; nothing to compare.")
+        return pd.DataFrame()
+
+    newest_run = run_order.index[-1]
+    run_rank = {run_id: rank for rank, run_id in enumerate(run_order.index)}
+    df = df.assign(run_rank=df["run_id"].map(run_rank))
+
+    comparisons = []
+    for key, group in df.groupby(REGRESSION_KEYS):
+        newest = group[group["run_id"] == newest_run]
+        earlier = group[group["run_rank"] < run_rank[newest_run]]
+        window_runs = sorted(earlier["run_rank"].unique())[-baseline_runs:]
+        baseline = earlier[earlier["run_rank"].isin(window_runs)]
+        if newest.empty or baseline.empty:
+            continue
+
+        latest = newest.iloc[-1]
+        baseline_samples = [
+            sample
+            for raw in baseline["latency_samples_ms"]
+            for sample in parse_latency_samples(raw)
+        ]
+        baseline_median = (
+            float(np.median(baseline_samples))
+            if baseline_samples
+            else float(baseline["latency_median_ms"].median())
+        )
+        ratio = (
+            latest["latency_median_ms"] / baseline_median if baseline_median else None
+        )
+        ci_low, ci_high = bootstrap_median_ratio_ci(
+            parse_latency_samples(latest["latency_samples_ms"]), baseline_samples
+        )
+
+        comparisons.append(
+            {
+                **dict(zip(REGRESSION_KEYS, key, strict=True)),
+                "run_id": newest_run,
+                "baseline_runs": len(window_runs),
+                "latency_median_ms": latest["latency_median_ms"],
+                "baseline_latency_median_ms": round(baseline_median, 2),
+                "slowdown_ratio": None if ratio is None else round(ratio, 2),
+                "ratio_ci_low": ci_low,
+                "ratio_ci_high": ci_high,
+                "server_version": latest["server_version"],
+                "baseline_server_versions": ", ".join(
+                    sorted(baseline["server_version"].dropna().unique())
+                ),
+                "regression": bool(
+                    ci_low is not None
+                    and ci_low > 1
+                    and ratio is not None
+                    and ratio >= min_slowdown
+                ),
+            }
+        )
+
+    return pd.DataFrame(comparisons)
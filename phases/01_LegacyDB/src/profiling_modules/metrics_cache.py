@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Helpers for controlling buffer-cache state around benchmark queries."""
+
+import json
+import logging
+import shlex
+import subprocess
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+# --- Constants ---
+CACHE_MODE_UNMANAGED = "unmanaged"
+CACHE_MODE_COLD = "cold"
+CACHE_MODE_WARM = "warm"
+CACHE_MODES = [CACHE_MODE_UNMANAGED, CACHE_MODE_COLD, CACHE_MODE_WARM]
+EVICT_HOOK_TIMEOUT_S = 300
+
+
+def quote_ident(identifier: str) -> str:
+    """Quotes an identifier for use in a ``regclass`` literal."""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _collect_relations(node: Dict[str, Any], found: List[str]) -> None:
+    """Appends the qualified tables and indexes referenced by a plan subtree."""
+    schema = node.get("Schema")
+    for key in ("Relation Name", "Index Name"):
+        name = node.get(key)
+        if name and schema:
+            qualified = f"{quote_ident(schema)}.{quote_ident(name)}"
+            if qualified not in found:
+                found.append(qualified)
+    for child in node.get("Plans", []):
+        _collect_relations(child, found)
+
+
+def get_query_relations(connection: Connection, query_sql: str) -> List[str]:
+    """
+    Lists the tables and indexes a query touches, according to its plan.
+
+    Uses plain ``EXPLAIN (VERBOSE, FORMAT JSON)``, which does not execute the
+    query, so it does not disturb the cache state being prepared.
+
+    Returns:
+        Quoted, schema-qualified relation names usable as ``regclass`` input.
+    """
+    raw = connection.execute(
+        text("EXPLAIN (VERBOSE, FORMAT JSON) " + query_sql)
+    ).scalar_one()
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    relations: List[str] = []
+    _collect_relations(plan[0]["Plan"], relations)
+    return relations
+
+
+def has_extension(connection: Connection, extension_name: str) -> bool:
+    """Returns True if an extension is installed in the current database."""
+    result = connection.execute(
+        text("SELECT 1 FROM pg_extension WHERE extname = :name"),
+        {"name": extension_name},
+    )
+    return result.first() is not None
+
+
+def prewarm_relations(
+    connection: Connection, relations: List[str], query_sql: str
+) -> str:
+    """
+    Loads a query's relations into shared buffers before measurement.
+
+    Uses ``pg_prewarm`` when the extension is installed; otherwise the query
+    itself is executed once, untimed, as a best-effort warm-up.
+
+    Returns:
+        The preparation method used, recorded as ``cache_preparation``.
+    """
+    if relations and has_extension(connection, "pg_prewarm"):
+        for relation in relations:
+            connection.execute(
+                text("SELECT pg_prewarm(CAST(:rel AS regclass))"), {"rel": relation}
+            )
+        return "pg_prewarm"
+
+    connection.execute(text(query_sql)).fetchall()
+    return "query_warmup"
+
+
+def evict_relations(
+    connection: Connection, relations: List[str], evict_hook: Optional[str] = None
+) -> str:
+    """
+    Best-effort eviction of a query's relations before a cold measurement.
+
+    If a local admin hook is configured, it is run with the relation names as
+    arguments (e.g. a script that restarts the server and drops the OS page
+    cache). Otherwise ``pg_buffercache_evict`` (PostgreSQL 17+) is used to
+    drop the relations' pages from shared buffers; the OS page cache is left
+    untouched in that case. If neither is available, the cold state rests on
+    the fresh connection and ``DISCARD ALL`` alone.
+
+    Returns:
+        The eviction method used, recorded as ``cache_preparation``.
+    """
+    if evict_hook:
+        try:
+            subprocess.run(
+                shlex.split(evict_hook) + relations,
+                check=True,
+                timeout=EVICT_HOOK_TIMEOUT_S,
+            )
+            return "evict_hook"
+        except (OSError, subprocess.SubprocessError) as e:
+            logging.warning("  Cache eviction hook failed: %s", e)
+
+    if relations and has_extension(connection, "pg_buffercache"):
+        try:
+            connection.execute(
+                text(
+                    """
+                    SELECT count(*) FILTER (WHERE pg_buffercache_evict(b.bufferid))
+                    FROM pg_buffercache AS b
+                    WHERE b.reldatabase = (
+                        SELECT oid FROM pg_database WHERE datname = current_database()
+                    )
+                    AND b.relfilenode IN (
+                        SELECT pg_relation_filenode(CAST(rel AS regclass))
+                        FROM unnest(CAST(:relations AS text[])) AS rel
+                    );
+                    """
+                ),
+                {"relations": relations},
+            )
+            return "pg_buffercache_evict"
+        except Exception as e:
+            logging.warning("  pg_buffercache_evict unavailable: %s", e)
+            connection.rollback()
+
+    return "discard_only"
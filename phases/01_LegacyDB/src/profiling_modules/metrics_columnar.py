@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+"""Canonical benchmark queries against Parquet exports with in-process DuckDB."""
+
+import logging
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from .metrics_cache import CACHE_MODE_UNMANAGED
+from .metrics_performance import (
+    load_benchmark_queries,
+    load_query_metadata,
+    resolve_query_filename,
+)
+from .timing import (
+    DEFAULT_TRIALS,
+    DEFAULT_WARMUP_RUNS,
+    FETCH_MODE_DATAFRAME,
+    FETCH_MODE_EXECUTE,
+    FETCH_MODE_STREAM,
+    FETCH_MODES,
+    STREAM_BATCH_ROWS,
+    normalize_latency,
+    summarize_latencies,
+)
+
+try:  # The columnar target is optional; duckdb is only needed when enabled.
+    import duckdb
+except ImportError:  # pragma: no cover - depends on the environment
+    duckdb = None
+
+# --- Constants ---
+# Results are saved as a pseudo-database ``<benchmark db>_parquet`` so the
+# comparison report lists the columnar files next to the Postgres databases.
+COLUMNAR_DB_SUFFIX = "_parquet"
+STORAGE_ENGINE = "duckdb"
+BENCHMARK_SCHEMA = "public"
+BENCHMARK_TABLE_NAME = "wide_format_data"
+
+
+def open_parquet_database(dataset_dir: Path) -> "duckdb.DuckDBPyConnection":
+    """
+    Opens an in-memory DuckDB database exposing a Parquet dataset as a view.
+
+    The view is named ``public.wide_format_data`` so the canonical benchmark
+    queries run unchanged; Hive partition directories become columns.
+    """
+    if duckdb is None:
+        raise ImportError("duckdb is required for the columnar benchmarks")
+    if not any(dataset_dir.rglob("*.parquet")):
+        raise FileNotFoundError(f"No Parquet files under '{dataset_dir}'")
+
+    connection = duckdb.connect(":memory:")
+    pattern = str(dataset_dir / "**" / "*.parquet").replace("'", "''")
+    connection.execute(f"CREATE SCHEMA {BENCHMARK_SCHEMA}")
+    connection.execute(
+        f"CREATE VIEW {BENCHMARK_SCHEMA}.{BENCHMARK_TABLE_NAME} AS "
+        f"SELECT * FROM read_parquet('{pattern}', hive_partitioning = true)"
+    )
+    return connection
+
+
+def execute_and_materialize(
+    connection: "duckdb.DuckDBPyConnection", query_sql: str, fetch_mode: str
+) -> Optional[int]:
+    """
+    Executes a query and consumes its result like ``timing.execute_and_materialize``.
+
+    DuckDB computes the full result on ``execute``; ``stream`` additionally
+    fetches it into Python tuples in batches and ``dataframe`` converts it
+    to a pandas DataFrame.
+
+    Returns:
+        The number of rows fetched, or None in ``execute`` mode.
+    """
+    result = connection.execute(query_sql)
+    if fetch_mode == FETCH_MODE_STREAM:
+        rows = 0
+        while batch := result.fetchmany(STREAM_BATCH_ROWS):
+            rows += len(batch)
+        return rows
+    if fetch_mode == FETCH_MODE_DATAFRAME:
+        return len(result.df())
+    return None
+
+
+def run_columnar_benchmarks(
+    dataset_dir: Path,
+    db_name: str,
+    sql_queries_dir: Path,
+    trials: int = DEFAULT_TRIALS,
+    warmup_runs: int = DEFAULT_WARMUP_RUNS,
+    fetch_mode: str = FETCH_MODE_EXECUTE,
+) -> List[Dict[str, Any]]:
+    """
+    Times a benchmark database's canonical queries on its Parquet export.
+
+    Rows use the schema of ``metrics_performance.run_performance_benchmarks``
+    (``storage_engine`` is ``duckdb``, ``cache_state`` is ``unmanaged``, the
+    database is ``<db_name>_parquet``), so they can be saved and compared
+    like any other performance benchmark.
+
+    Args:
+        dataset_dir: Root of the Parquet dataset written by the build script
+        db_name: Benchmark database the dataset was exported from
+        sql_queries_dir: Path to directory containing query files
+        trials: Number of measured executions per query
+        warmup_runs: Number of untimed executions per query before measuring
+        fetch_mode: One of ``execute``, ``stream`` or ``dataframe``
+
+    Returns:
+        List of benchmark results with query metadata
+    """
+    if fetch_mode not in FETCH_MODES:
+        raise ValueError(f"Unknown fetch mode '{fetch_mode}'; expected {FETCH_MODES}")
+
+    benchmarks: List[Dict[str, Any]] = []
+    metadata = load_query_metadata(sql_queries_dir)
+    categories = metadata.get("categories", {})
+    query_filename = resolve_query_filename(metadata, db_name)
+    if not query_filename:
+        logging.warning("No canonical queries for '%s'; skipping columnar.", db_name)
+        return benchmarks
+    queries = load_benchmark_queries(sql_queries_dir / query_filename)
+
+    connection = open_parquet_database(dataset_dir)
+    logging.info(
+        "Running %s columnar benchmark queries on '%s' (%s fetch)...",
+        len(queries),
+        dataset_dir,
+        fetch_mode,
+    )
+    try:
+        for category, query_id, query_sql in queries:
+            category_name = categories.get(category, {}).get("name", category)
+            query_name = f"{category_name} - Query {query_id}"
+            result_entry = {
+                "database": f"{db_name}{COLUMNAR_DB_SUFFIX}",
+                "schema": BENCHMARK_SCHEMA,
+                "storage_engine": STORAGE_ENGINE,
+                "category": category,
+                "query_id": query_id,
+                "query_name": query_name,
+                "sql_query": query_sql,
+                "cache_state": CACHE_MODE_UNMANAGED,
+                "cache_preparation": None,
+                "fetch_mode": fetch_mode,
+                "warmup_runs": warmup_runs,
+                "trials": trials,
+                "latency_ms": None,
+                "status": "Failed",
+            }
+            try:
+                for _ in range(warmup_runs):
+                    execute_and_materialize(connection, query_sql, fetch_mode)
+                samples_ms = []
+                for _ in range(trials):
+                    start_time = time.monotonic()
+                    execute_and_materialize(connection, query_sql, fetch_mode)
+                    samples_ms.append((time.monotonic() - start_time) * 1000)
+                result_entry.update(summarize_latencies(samples_ms))
+                result_entry["latency_ms"] = result_entry["latency_median_ms"]
+
+                rows = connection.execute(
+                    f"SELECT COUNT(*) FROM ({query_sql.rstrip().rstrip(';')}) AS q"
+                ).fetchone()[0]
+                result_entry["rows_returned"] = rows
+                result_entry["result_bytes"] = None
+                result_entry.update(
+                    normalize_latency(result_entry["latency_ms"], rows, None)
+                )
+                result_entry["status"] = "Success"
+                logging.info(
+                    "  %s: median %s ms (p95 %s ms)",
+                    query_name,
+                    result_entry["latency_median_ms"],
+                    result_entry["latency_p95_ms"],
+                )
+            except Exception as e:
+                logging.error("  Query '%s' failed: %s", query_name, e)
+                result_entry["error_message"] = str(e)
+            benchmarks.append(result_entry)
+    finally:
+        connection.close()
+
+    return benchmarks
@@ -0,0 +1,337 @@
+# -*- coding: utf-8 -*-
+"""Index experiments: candidate indexes for canonical queries on a scratch copy."""
+
+import json
+import logging
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Set, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+
+from .metrics_cache import quote_ident
+from .metrics_performance import (
+    load_benchmark_queries,
+    load_query_metadata,
+    resolve_query_filename,
+)
+from .metrics_plans import iter_plan_nodes
+from .timing import DEFAULT_TRIALS, DEFAULT_WARMUP_RUNS, run_timed_trials
+
+# --- Constants ---
+SCRATCH_DB_SUFFIX = "_idx_scratch"
+# Plan keys whose expressions name the columns a query joins or filters on.
+CONDITION_KEYS = ["Filter", "Join Filter", "Hash Cond", "Merge Cond"]
+# ``alias.column`` references in EXPLAIN VERBOSE expressions, quoted or not.
+COLUMN_REF_PATTERN = re.compile(r'("(?:[^"]|"")+"|\w+)\.("(?:[^"]|"")+"|\w+)')
+MAX_IDENTIFIER_LENGTH = 63
+
+Candidate = Tuple[str, str, str]  # (schema, table, column)
+
+
+def _unquote_ident(token: str) -> str:
+    """Reverses ``quote_ident`` for a token taken from EXPLAIN output."""
+    if token.startswith('"') and token.endswith('"'):
+        return token[1:-1].replace('""', '"')
+    return token
+
+
+def derive_candidate_columns(
+    connection: Connection, query_sql: str
+) -> List[Candidate]:
+    """
+    Lists the base-table columns a query joins or filters on.
+
+    The query is planned (not executed) with ``EXPLAIN (VERBOSE, FORMAT
+    JSON)``. Every ``alias.column`` reference in a filter or join condition is
+    resolved to its table through the aliases of the plan's scan nodes;
+    references to CTEs and subqueries have no base table and are skipped.
+    """
+    raw = connection.execute(
+        text("EXPLAIN (VERBOSE, FORMAT JSON) " + query_sql)
+    ).scalar_one()
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    nodes = list(iter_plan_nodes(plan[0]["Plan"]))
+
+    aliases = {
+        node["Alias"]: (node["Schema"], node["Relation Name"])
+        for node in nodes
+        if "Relation Name" in node and "Schema" in node and "Alias" in node
+    }
+
+    candidates: List[Candidate] = []
+    for node in nodes:
+        for key in CONDITION_KEYS:
+            for alias_token, column_token in COLUMN_REF_PATTERN.findall(
+                node.get(key, "")
+            ):
+                relation = aliases.get(_unquote_ident(alias_token))
+                if not relation:
+                    continue
+                candidate = (*relation, _unquote_ident(column_token))
+                if candidate not in candidates:
+                    candidates.append(candidate)
+    return candidates
+
+
+def is_already_indexed(connection: Connection, candidate: Candidate) -> bool:
+    """Returns True if an existing index has the column as its leading key."""
+    schema, table, column = candidate
+    result = connection.execute(
+        text(
+            """
+            SELECT 1
+            FROM pg_index AS i
+            JOIN pg_class AS c ON c.oid = i.indrelid
+            JOIN pg_namespace AS n ON n.oid = c.relnamespace
+            JOIN pg_attribute AS a
+              ON a.attrelid = i.indrelid AND a.attnum = i.indkey[0]
+            WHERE n.nspname = :schema AND c.relname = :table
+              AND a.attname = :column
+            """
+        ),
+        {"schema": schema, "table": table, "column": column},
+    )
+    return result.first() is not None
+
+
+def _index_name(candidate: Candidate) -> str:
+    """Builds a readable, length-limited name for a candidate index."""
+    _, table, column = candidate
+    name = re.sub(r"\W+", "_", f"idxlab_{table}_{column}").lower()
+    return name[:MAX_IDENTIFIER_LENGTH]
+
+
+def _median_latency(
+    connection: Connection, query_sql: str, trials: int, warmup_runs: int
+) -> float:
+    """Returns the median latency (ms) of a query over the configured trials."""
+    return statistics.median(
+        run_timed_trials(connection, query_sql, trials, warmup_runs)
+    )
+
+
+def _recreate_scratch_database(
+    admin_engine: Engine, source_db: str, scratch_db: str
+) -> None:
+    """Drops and recreates the scratch database as a template copy."""
+    with admin_engine.connect() as admin:
+        admin.execute(text(f"DROP DATABASE IF EXISTS {quote_ident(scratch_db)}"))
+        admin.execute(
+            text(
+                f"CREATE DATABASE {quote_ident(scratch_db)} "
+                f"TEMPLATE {quote_ident(source_db)}"
+            )
+        )
+
+
+def run_index_experiments(
+    engine: Engine,
+    db_name: str,
+    schema_name: str,
+    sql_queries_dir: Path,
+    root_db: str,
+    trials: int = DEFAULT_TRIALS,
+    warmup_runs: int = DEFAULT_WARMUP_RUNS,
+) -> List[Dict[str, Any]]:
+    """
+    Measures the effect of each candidate index on the canonical queries.
+
+    Candidates are the join and filter columns of the canonical queries that
+    are not already the leading column of an index. The database is cloned
+    into ``<db>_idx_scratch`` (``CREATE DATABASE ... TEMPLATE``), so the
+    original is never modified. Each candidate is then built on its own,
+    the table re-analyzed, the queries that reference it re-timed, and the
+    index dropped again, so every delta is measured against the same
+    baseline.
+
+    Args:
+        engine: SQLAlchemy engine of the database being profiled
+        db_name: Name of the database being profiled
+        schema_name: Schema name for the database
+        sql_queries_dir: Path to directory containing query files
+        root_db: Maintenance database used to create/drop the scratch copy
+        trials: Number of measured executions per query and candidate
+        warmup_runs: Number of untimed executions before measuring
+
+    Returns:
+        One record per (candidate index, affected query) with baseline and
+        indexed median latency, the delta, build time and index size.
+    """
+    experiments: List[Dict[str, Any]] = []
+
+    metadata = load_query_metadata(sql_queries_dir)
+    query_filename = resolve_query_filename(metadata, db_name)
+    if not query_filename:
+        logging.warning(
+            "No canonical query mapping for '%s'; skipping index experiments.",
+            db_name,
+        )
+        return experiments
+    queries = load_benchmark_queries(sql_queries_dir / query_filename)
+
+    scratch_db = f"{db_name}{SCRATCH_DB_SUFFIX}"
+    admin_engine = create_engine(
+        engine.url.set(database=root_db), isolation_level="AUTOCOMMIT"
+    )
+    # The source cannot be used as a template while it has open sessions.
+    engine.dispose()
+    _recreate_scratch_database(admin_engine, db_name, scratch_db)
+    scratch_engine = create_engine(engine.url.set(database=scratch_db))
+    logging.info("Running index experiments for '%s' in '%s'...", db_name, scratch_db)
+
+    try:
+        with scratch_engine.connect() as connection:
+            affected: Dict[Candidate, List[Tuple[str, str]]] = {}
+            for _, query_id, query_sql in queries:
+                try:
+                    columns = derive_candidate_columns(connection, query_sql)
+                except Exception as e:
+                    logging.warning("  Could not plan query %s: %s", query_id, e)
+                    connection.rollback()
+                    continue
+                for candidate in columns:
+                    affected.setdefault(candidate, []).append((query_id, query_sql))
+
+            candidates = [c for c in affected if not is_already_indexed(connection, c)]
+            logging.info(
+                "  %s candidate indexes from %s join/filter columns.",
+                len(candidates),
+                len(affected),
+            )
+            connection.commit()
+
+            # A query whose baseline cannot be measured is left out of every
+            # candidate's comparison rather than aborting the experiments.
+            baseline_ms: Dict[str, float] = {}
+            attempted: Set[str] = set()
+            for candidate in candidates:
+                for query_id, query_sql in affected[candidate]:
+                    if query_id in attempted:
+                        continue
+                    attempted.add(query_id)
+                    try:
+                        baseline_ms[query_id] = _median_latency(
+                            connection, query_sql, trials, warmup_runs
+                        )
+                    except Exception as e:
+                        logging.error(
+                            "  Could not measure the baseline of query %s: %s",
+                            query_id,
+                            e,
+                        )
+                        connection.rollback()
+
+            for candidate in candidates:
+                measurable = [q for q in affected[candidate] if q[0] in baseline_ms]
+                if not measurable:
+                    continue
+                experiments.extend(
+                    _measure_candidate(
+                        connection,
+                        candidate,
+                        measurable,
+                        baseline_ms,
+                        trials,
+                        warmup_runs,
+                        {"database": db_name, "schema": schema_name},
+                    )
+                )
+    finally:
+        scratch_engine.dispose()
+        with admin_engine.connect() as admin:
+            admin.execute(text(f"DROP DATABASE IF EXISTS {quote_ident(scratch_db)}"))
+        admin_engine.dispose()
+
+    return experiments
+
+
+def _measure_candidate(
+    connection: Connection,
+    candidate: Candidate,
+    queries: List[Tuple[str, str]],
+    baseline_ms: Dict[str, float],
+    trials: int,
+    warmup_runs: int,
+    context: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """Builds one candidate index, re-times its queries and drops it again."""
+    schema, table, column = candidate
+    index_name = _index_name(candidate)
+    qualified_table = f"{quote_ident(schema)}.{quote_ident(table)}"
+    ddl = (
+        f"CREATE INDEX {quote_ident(index_name)} "
+        f"ON {qualified_table} ({quote_ident(column)})"
+    )
+    base_entry = {
+        **context,
+        "index_table": f"{schema}.{table}",
+        "index_column": column,
+        "index_ddl": ddl,
+    }
+
+    try:
+        start_time = time.monotonic()
+        connection.execute(text(ddl))
+        connection.execute(text(f"ANALYZE {qualified_table}"))
+        connection.commit()
+        build_ms = (time.monotonic() - start_time) * 1000
+        index_size = connection.execute(
+            text("SELECT pg_relation_size(CAST(:idx AS regclass))"),
+            {"idx": f"{quote_ident(schema)}.{quote_ident(index_name)}"},
+        ).scalar_one()
+    except Exception as e:
+        logging.error("  Could not build candidate %s: %s", ddl, e)
+        connection.rollback()
+        return [{**base_entry, "status": "Failed", "error_message": str(e)}]
+
+    results = []
+    try:
+        for query_id, query_sql in queries:
+            entry = {
+                **base_entry,
+                "query_id": query_id,
+                "index_build_ms": round(build_ms, 2),
+                "index_size_bytes": index_size,
+                "baseline_latency_ms": round(baseline_ms[query_id], 2),
+                "status": "Failed",
+            }
+            try:
+                indexed_ms = _median_latency(connection, query_sql, trials, warmup_runs)
+                entry["indexed_latency_ms"] = round(indexed_ms, 2)
+                entry["latency_delta_ms"] = round(indexed_ms - baseline_ms[query_id], 2)
+                entry["speedup"] = (
+                    round(baseline_ms[query_id] / indexed_ms, 2) if indexed_ms else None
+                )
+                entry["status"] = "Success"
+                logging.info(
+                    "  %s -> query %s: %.2f ms -> %.2f ms",
+                    index_name,
+                    query_id,
+                    baseline_ms[query_id],
+                    indexed_ms,
+                )
+            except Exception as e:
+                logging.error("  Query %s with %s failed: %s", query_id, index_name, e)
+                entry["error_message"] = str(e)
+                connection.rollback()
+            results.append(entry)
+    finally:
+        # The index must not outlive its candidate; if it does, the later
+        # candidates are timed with it in place.
+        try:
+            connection.execute(
+                text(f"DROP INDEX {quote_ident(schema)}.{quote_ident(index_name)}")
+            )
+            connection.execute(text(f"ANALYZE {qualified_table}"))
+            connection.commit()
+        except Exception as e:
+            logging.error("  Could not drop candidate %s: %s", index_name, e)
+            connection.rollback()
+            for entry in results:
+                entry["status"] = "Failed"
+                entry["error_message"] = f"Could not drop candidate index: {e}"
+    return results
@@ -0,0 +1,231 @@
+# -*- coding: utf-8 -*-
+"""Functions for concurrent load generation against the canonical query mix."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Engine
+
+from .metrics_performance import (
+    load_benchmark_queries,
+    load_query_metadata,
+    resolve_query_filename,
+)
+from .timing import percentile
+
+# --- Constants ---
+DEFAULT_CONCURRENCY_LEVELS = [1, 4, 16]
+DEFAULT_DURATION_SECONDS = 30.0
+
+
+def _client_worker(
+    engine: Engine,
+    queries: List[Tuple[str, str, str]],
+    client_index: int,
+    start_barrier: threading.Barrier,
+    deadline: List[float],
+    max_requests: Optional[int],
+) -> Tuple[List[float], int]:
+    """
+    Runs the query mix on one pooled connection until the deadline or quota.
+
+    Each client starts at a different offset in the query mix so that the
+    clients do not issue the same statement in lockstep. Result sets are fully
+    fetched, as a real reader would.
+
+    Returns:
+        A tuple of (latencies in ms of successful requests, error count).
+    """
+    latencies_ms: List[float] = []
+    errors = 0
+    statements = [text(sql) for _, _, sql in queries]
+
+    try:
+        connection = engine.connect()
+    except Exception:
+        # Release the other clients instead of leaving them at the barrier.
+        start_barrier.abort()
+        raise
+
+    with connection:
+        start_barrier.wait()
+        request_index = client_index
+        while True:
+            issued = len(latencies_ms) + errors
+            if max_requests is not None and issued >= max_requests:
+                break
+            if max_requests is None and time.monotonic() >= deadline[0]:
+                break
+
+            statement = statements[request_index % len(statements)]
+            request_index += 1
+            start_time = time.monotonic()
+            try:
+                connection.execute(statement).fetchall()
+                latencies_ms.append((time.monotonic() - start_time) * 1000)
+            except Exception as e:
+                errors += 1
+                logging.debug("  Client %s request failed: %s", client_index, e)
+                connection.rollback()
+
+    return latencies_ms, errors
+
+
+def run_concurrency_level(
+    engine: Engine,
+    queries: List[Tuple[str, str, str]],
+    clients: int,
+    duration_s: float,
+    requests_per_client: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Drives the query mix from ``clients`` concurrent threads.
+
+    Each thread holds its own connection from a dedicated pool sized to the
+    number of clients. psycopg2 releases the GIL while waiting on the server,
+    so threads generate genuinely concurrent load.
+
+    Args:
+        engine: Engine whose URL identifies the target database.
+        queries: The ``(category, query_id, sql)`` mix to replay.
+        clients: Number of concurrent clients.
+        duration_s: Run length in seconds (ignored if ``requests_per_client``).
+        requests_per_client: Fixed request count per client, if set.
+
+    Returns:
+        Throughput, latency percentiles and error rate for this level.
+    """
+    load_engine = create_engine(engine.url, pool_size=clients, max_overflow=0)
+    # All clients connect before the clock starts; the deadline is set by the
+    # last thread to arrive at the barrier.
+    deadline = [0.0]
+    started_at = [0.0]
+
+    def _start_clock() -> None:
+        started_at[0] = time.monotonic()
+        deadline[0] = started_at[0] + duration_s
+
+    start_barrier = threading.Barrier(clients, action=_start_clock)
+
+    try:
+        with ThreadPoolExecutor(max_workers=clients) as executor:
+            futures = [
+                executor.submit(
+                    _client_worker,
+                    load_engine,
+                    queries,
+                    i,
+                    start_barrier,
+                    deadline,
+                    requests_per_client,
+                )
+                for i in range(clients)
+            ]
+            results = [f.result() for f in futures]
+        elapsed_s = time.monotonic() - started_at[0]
+    finally:
+        load_engine.dispose()
+
+    latencies = sorted(lat for client_lats, _ in results for lat in client_lats)
+    errors = sum(client_errors for _, client_errors in results)
+    total_requests = len(latencies) + errors
+
+    level_metrics: Dict[str, Any] = {
+        "concurrency": clients,
+        "elapsed_s": round(elapsed_s, 3),
+        "total_requests": total_requests,
+        "successful_requests": len(latencies),
+        "errors": errors,
+        "error_rate": round(errors / total_requests, 4) if total_requests else None,
+        "qps": round(len(latencies) / elapsed_s, 2) if elapsed_s > 0 else None,
+    }
+    for pct in (50, 95, 99):
+        level_metrics[f"latency_p{pct}_ms"] = (
+            round(percentile(latencies, pct), 2) if latencies else None
+        )
+    return level_metrics
+
+
+def run_load_test(
+    engine: Engine,
+    db_name: str,
+    schema_name: str,
+    sql_queries_dir: Path,
+    concurrency_levels: Optional[List[int]] = None,
+    duration_s: float = DEFAULT_DURATION_SECONDS,
+    requests_per_client: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Measures throughput and tail latency of the canonical query mix under load.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        db_name: Name of the database being profiled
+        schema_name: Schema name for the database
+        sql_queries_dir: Path to directory containing query files
+        concurrency_levels: Numbers of concurrent clients to test in turn
+        duration_s: Length of each level in seconds (time-bounded mode)
+        requests_per_client: Requests per client (count-bounded mode); when
+            set, it takes precedence over ``duration_s``
+
+    Returns:
+        One record per concurrency level.
+    """
+    results: List[Dict[str, Any]] = []
+    levels = concurrency_levels or DEFAULT_CONCURRENCY_LEVELS
+
+    metadata = load_query_metadata(sql_queries_dir)
+    query_filename = resolve_query_filename(metadata, db_name)
+    if not query_filename:
+        logging.warning(
+            "No canonical query mapping for '%s'; skipping load test.", db_name
+        )
+        return results
+
+    queries = load_benchmark_queries(sql_queries_dir / query_filename)
+    if not queries:
+        return results
+
+    if requests_per_client is not None:
+        mode, bound = "requests", f"{requests_per_client} requests each"
+    else:
+        mode, bound = "duration", f"{duration_s}s"
+
+    for clients in levels:
+        logging.info(
+            "  Load test on '%s': %s clients (%s)...", db_name, clients, bound
+        )
+        level_entry: Dict[str, Any] = {
+            "database": db_name,
+            "schema": schema_name,
+            "mode": mode,
+            "query_mix": ",".join(query_id for _, query_id, _ in queries),
+            "concurrency": clients,
+            "status": "Failed",
+        }
+        try:
+            level_entry.update(
+                run_concurrency_level(
+                    engine, queries, clients, duration_s, requests_per_client
+                )
+            )
+            level_entry["status"] = "Success"
+            logging.info(
+                "    %s QPS, p50 %s ms, p99 %s ms, error rate %s",
+                level_entry["qps"],
+                level_entry["latency_p50_ms"],
+                level_entry["latency_p99_ms"],
+                level_entry["error_rate"],
+            )
+        except Exception as e:
+            logging.error("  Load test at %s clients failed: %s", clients, e)
+            level_entry["error_message"] = str(e)
+
+        results.append(level_entry)
+
+    return results
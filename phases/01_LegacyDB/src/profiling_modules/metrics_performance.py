@@ -3,13 +3,36 @@
 
 import json
 import logging
-import time
+import re
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import text
 from sqlalchemy.engine import Engine
 
+from . import metrics_cache, metrics_statements
+from .metrics_cache import CACHE_MODE_COLD, CACHE_MODE_UNMANAGED, CACHE_MODE_WARM
+from .timing import (
+    DEFAULT_TRIALS,
+    DEFAULT_WARMUP_RUNS,
+    FETCH_MODE_EXECUTE,
+    measure_result_size,
+    normalize_latency,
+    run_cold_trials,
+    run_timed_trials,
+    summarize_latencies,
+)
+
+# --- Constants ---
+# Named bind parameters in SQLAlchemy ``text()`` syntax (``:name``), ignoring
+# PostgreSQL ``::type`` casts. Mirrors the pattern SQLAlchemy itself uses.
+BIND_PARAM_PATTERN = re.compile(r"(?<![:\w\\]):(\w+)(?!:)")
+# Synthetically scaled copies created by 05_create_scaled_dbs.py are named
+# ``<source>_x<factor>`` (e.g. ``TMP_DF9_x10``).
+SCALE_SUFFIX_PATTERN = re.compile(r"_x(\d+)$", re.IGNORECASE)
+DEFAULT_SCALE_FACTORS = [1, 10, 100]
+# Recorded per result so row-store and columnar-file runs can be told apart.
+STORAGE_ENGINE = "postgresql"
+
 
 def load_query_metadata(queries_dir: Path) -> Dict[str, Any]:
     """Load query categories and database mappings."""
@@ -86,30 +109,165 @@ def parse_categorized_queries(sql_content: str) -> List[Tuple[str, str, str]]:
     return queries
 
 
+def resolve_query_filename(metadata: Dict[str, Any], db_name: str) -> Optional[str]:
+    """
+    Looks up the canonical query file for a database in the query metadata.
+
+    The ``database_mappings`` keys are lowercase, while legacy database names in
+    ``config.ini`` are uppercase (e.g. ``TMP_DF9``), so the lookup falls back to
+    a case-insensitive match. Scaled copies use their source database's file.
+    """
+    db_mappings = metadata.get("database_mappings", {})
+    base_name, _ = split_scale_factor(db_name)
+    return db_mappings.get(base_name) or db_mappings.get(base_name.lower())
+
+
+def split_scale_factor(db_name: str) -> Tuple[str, int]:
+    """
+    Splits a database name into its source name and synthetic scale factor.
+
+    Returns:
+        ``("TMP_DF9", 10)`` for ``TMP_DF9_x10``; unscaled names get factor 1.
+    """
+    match = SCALE_SUFFIX_PATTERN.search(db_name)
+    if not match:
+        return db_name, 1
+    return db_name[: match.start()], int(match.group(1))
+
+
+def parse_scale_factors(option_value: str) -> List[int]:
+    """
+    Parses the comma-separated ``[scaling] scale_factors`` option.
+
+    An empty option falls back to :data:`DEFAULT_SCALE_FACTORS`.
+    """
+    factors = [int(f) for f in option_value.split(",") if f.strip()]
+    return factors or list(DEFAULT_SCALE_FACTORS)
+
+
+def get_bind_parameters(query_sql: str) -> List[str]:
+    """Returns the names of the ``:name`` bind parameters in a query template."""
+    return list(dict.fromkeys(BIND_PARAM_PATTERN.findall(query_sql)))
+
+
+def load_benchmark_queries(
+    query_file_path: Path, include_templates: bool = False
+) -> List[Tuple[str, str, str]]:
+    """
+    Reads and parses a categorized canonical query file.
+
+    Queries containing bind parameters are templates that can only run with a
+    parameter set (see ``metrics_sweeps``), so they are excluded unless
+    ``include_templates`` is True.
+
+    Args:
+        query_file_path: Path to a ``canonical_queries_*.sql`` file.
+        include_templates: Whether to keep parameterized template queries.
+
+    Returns:
+        A list of ``(category, query_id, sql)`` tuples. Returns an empty list
+        if the file is missing or unreadable.
+    """
+    if not query_file_path.exists():
+        logging.error("Query file not found: %s", query_file_path)
+        return []
+
+    try:
+        with open(query_file_path, "r", encoding="utf-8") as f:
+            sql_content = f.read()
+    except IOError as e:
+        logging.error(
+            "Could not read query file '%s': %s",
+            query_file_path,
+            e,
+        )
+        return []
+
+    queries = parse_categorized_queries(sql_content)
+    if include_templates:
+        return queries
+    return [q for q in queries if not get_bind_parameters(q[2])]
+
+
 def run_performance_benchmarks(
-    engine: Engine, db_name: str, schema_name: str, sql_queries_dir: Path
+    engine: Engine,
+    db_name: str,
+    schema_name: str,
+    sql_queries_dir: Path,
+    trials: int = DEFAULT_TRIALS,
+    warmup_runs: int = DEFAULT_WARMUP_RUNS,
+    cache_mode: str = CACHE_MODE_UNMANAGED,
+    evict_hook: Optional[str] = None,
+    fetch_mode: str = FETCH_MODE_EXECUTE,
+    collect_statement_stats: bool = False,
+    relation_map: Optional[Dict[str, str]] = None,
 ) -> List[Dict[str, Any]]:
     """
     Execute database-specific performance benchmarks.
 
+    Each query is executed ``warmup_runs`` times without timing and then
+    ``trials`` times with timing. ``latency_ms`` holds the median of the
+    measured trials; the full distribution is recorded alongside it.
+
+    ``cache_mode`` controls the buffer-cache state of the measurement and is
+    recorded in the ``cache_state`` column:
+
+    - ``unmanaged``: queries run back to back on one connection (original
+      behaviour; cache state depends on whatever ran before).
+    - ``cold``: every trial runs on a fresh connection after ``DISCARD ALL``
+      and a best-effort eviction of the query's relations.
+    - ``warm``: the query's relations are preloaded (``pg_prewarm`` when
+      available) before the warm-up runs and trials.
+
+    ``fetch_mode`` controls how much of the result set is consumed inside the
+    timed region (``execute``, ``stream`` or ``dataframe``; see
+    ``timing.execute_and_materialize``). Rows returned and the approximate
+    result payload are measured once per query, untimed, so that latency can
+    be normalized per row and per MB.
+
+    With ``collect_statement_stats``, pg_stat_statements counters for the
+    current database are reset before the pass and harvested afterwards
+    (``pgss_*`` columns: calls, plan/exec time, buffer, temp and WAL usage),
+    so client-side latency can be split into planning, execution and I/O.
+    This is skipped with a warning if the extension is not usable.
+
+    ``relation_map`` redirects the canonical queries to other relations by
+    replacing each key in the query text with its value, e.g. to run the
+    wide-table queries against a materialized view in another schema.
+
     Args:
         engine: SQLAlchemy engine instance
         db_name: Name of the database being profiled
         schema_name: Schema name for the database
         sql_queries_dir: Path to directory containing query files
+        trials: Number of measured executions per query
+        warmup_runs: Number of untimed executions per query before measuring
+        cache_mode: One of ``unmanaged``, ``cold`` or ``warm``
+        evict_hook: Optional local admin command used to evict relations in
+            cold mode; the relation names are appended as arguments
+        fetch_mode: One of ``execute``, ``stream`` or ``dataframe``
+        collect_statement_stats: Whether to harvest pg_stat_statements counters
+        relation_map: Optional ``{relation in queries: relation to query}``
 
     Returns:
         List of benchmark results with query metadata
     """
+    if cache_mode not in metrics_cache.CACHE_MODES:
+        raise ValueError(
+            f"Unknown cache mode '{cache_mode}'; expected one of "
+            f"{metrics_cache.CACHE_MODES}"
+        )
+    if cache_mode == CACHE_MODE_COLD:
+        warmup_runs = 0
+
     benchmarks = []
 
     # Load metadata to find appropriate query file
     metadata = load_query_metadata(sql_queries_dir)
-    db_mappings = metadata.get("database_mappings", {})
     categories = metadata.get("categories", {})
 
     # Determine query file
-    query_filename = db_mappings.get(db_name)
+    query_filename = resolve_query_filename(metadata, db_name)
     if not query_filename:
         logging.warning(
             f"No specific queries found for database '{db_name}', using legacy approach"
@@ -117,37 +275,45 @@ def run_performance_benchmarks(
         # Fallback to legacy single file if it exists
         legacy_path = sql_queries_dir.parent / "canonical_queries.sql"
         if legacy_path.exists():
-            return run_legacy_benchmarks(engine, legacy_path)
+            return run_legacy_benchmarks(engine, legacy_path, trials, warmup_runs)
         return benchmarks
 
-    query_file_path = sql_queries_dir / query_filename
-    if not query_file_path.exists():
-        logging.error("Query file not found: %s", query_file_path)
+    # Read and parse categorized queries
+    queries = load_benchmark_queries(sql_queries_dir / query_filename)
+    if not queries:
         return benchmarks
-
-    # Read and parse queries
-    try:
-        with open(query_file_path, "r", encoding="utf-8") as f:
-            sql_content = f.read()
-    except IOError as e:
-        logging.error(
-            "Could not read query file '%s': %s",
-            query_file_path,
-            e,
-        )
-        return benchmarks
-
-    # Parse categorized queries
-    queries = parse_categorized_queries(sql_content)
+    for old_relation, new_relation in (relation_map or {}).items():
+        queries = [
+            (category, query_id, query_sql.replace(old_relation, new_relation))
+            for category, query_id, query_sql in queries
+        ]
 
     logging.info(
-        "Running %s benchmark queries for '%s' from '%s'...",
+        "Running %s benchmark queries for '%s' from '%s' "
+        "(%s cache, %s fetch, %s warm-up runs, %s trials each)...",
         len(queries),
         db_name,
         query_filename,
+        cache_mode,
+        fetch_mode,
+        warmup_runs,
+        trials,
     )
 
     with engine.connect() as connection:
+        statement_ids: Dict[str, int] = {}
+        if collect_statement_stats:
+            statement_ids = metrics_statements.resolve_statement_ids(
+                connection, queries
+            )
+            if not metrics_statements.reset_statement_stats(connection):
+                logging.warning(
+                    "  pg_stat_statements not available in '%s'; "
+                    "skipping server-side statistics.",
+                    db_name,
+                )
+                statement_ids = {}
+
         for category, query_id, query_sql in queries:
             # Build descriptive query name
             category_name = categories.get(category, {}).get("name", category)
@@ -156,34 +322,95 @@ def run_performance_benchmarks(
             result_entry = {
                 "database": db_name,
                 "schema": schema_name,
+                "storage_engine": STORAGE_ENGINE,
                 "category": category,
                 "query_id": query_id,
                 "query_name": query_name,
                 "sql_query": query_sql,
+                "cache_state": cache_mode,
+                "cache_preparation": None,
+                "fetch_mode": fetch_mode,
+                "warmup_runs": warmup_runs,
+                "trials": trials,
                 "latency_ms": None,
                 "status": "Failed",
             }
 
             try:
-                start_time = time.monotonic()
-                connection.execute(text(query_sql))
-                end_time = time.monotonic()
-
-                result_entry["latency_ms"] = round((end_time - start_time) * 1000, 2)
+                if cache_mode == CACHE_MODE_COLD:
+                    samples_ms, preparation = run_cold_trials(
+                        engine, query_sql, trials, evict_hook, fetch_mode
+                    )
+                    result_entry["cache_preparation"] = preparation
+                else:
+                    if cache_mode == CACHE_MODE_WARM:
+                        relations = metrics_cache.get_query_relations(
+                            connection, query_sql
+                        )
+                        result_entry["cache_preparation"] = (
+                            metrics_cache.prewarm_relations(
+                                connection, relations, query_sql
+                            )
+                        )
+                    samples_ms = run_timed_trials(
+                        connection, query_sql, trials, warmup_runs, fetch_mode
+                    )
+                result_entry.update(summarize_latencies(samples_ms))
+                result_entry["latency_ms"] = result_entry["latency_median_ms"]
+
+                # The size is measured by wrapping the query in a subquery,
+                # which can fail where the query itself ran; the timings stand.
+                rows, result_bytes = None, None
+                try:
+                    rows, result_bytes = measure_result_size(connection, query_sql)
+                except Exception as e:
+                    logging.warning(
+                        "  Could not measure the result size of '%s': %s",
+                        query_name,
+                        e,
+                    )
+                    connection.rollback()
+                result_entry["rows_returned"] = rows
+                result_entry["result_bytes"] = result_bytes
+                result_entry.update(
+                    normalize_latency(result_entry["latency_ms"], rows, result_bytes)
+                )
                 result_entry["status"] = "Success"
-                logging.info("  %s: %s ms", query_name, result_entry["latency_ms"])
+                logging.info(
+                    "  %s: median %s ms (p95 %s ms)",
+                    query_name,
+                    result_entry["latency_median_ms"],
+                    result_entry["latency_p95_ms"],
+                )
 
             except Exception as e:
                 logging.exception("  Query '%s' failed: %s", query_name, e)
                 result_entry["error_message"] = str(e)
+                connection.rollback()
 
             benchmarks.append(result_entry)
 
+        if statement_ids:
+            try:
+                statement_stats = metrics_statements.harvest_statement_stats(
+                    connection, statement_ids
+                )
+                for result_entry in benchmarks:
+                    result_entry.update(
+                        statement_stats.get(result_entry["query_id"], {})
+                    )
+            except Exception as e:
+                logging.error("  Could not harvest pg_stat_statements: %s", e)
+                connection.rollback()
+
     return benchmarks
 
 
 def run_legacy_benchmarks(
-    engine: Engine, sql_queries_path: Path
+    engine: Engine,
+    sql_queries_path: Path,
+    trials: int = DEFAULT_TRIALS,
+    warmup_runs: int = DEFAULT_WARMUP_RUNS,
 ) -> List[Dict[str, Any]]:
     """Backward compatibility: Run benchmarks from single SQL file."""
     # Original implementation for backward compatibility
@@ -211,15 +438,15 @@ def run_legacy_benchmarks(
             result_entry = {
                 "query_name": query_name,
                 "sql_query": query,
+                "warmup_runs": warmup_runs,
+                "trials": trials,
                 "latency_ms": None,
                 "status": "Failed",
             }
             try:
-                start_time = time.monotonic()
-                connection.execute(text(query))
-                end_time = time.monotonic()
-
-                result_entry["latency_ms"] = round((end_time - start_time) * 1000, 2)
+                samples_ms = run_timed_trials(connection, query, trials, warmup_runs)
+                result_entry.update(summarize_latencies(samples_ms))
+                result_entry["latency_ms"] = result_entry["latency_median_ms"]
                 result_entry["status"] = "Success"
                 logging.info("  %s: %s ms", query_name, result_entry["latency_ms"])
 
@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""Functions for capturing and summarizing execution plans of canonical queries."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .metrics_performance import (
+    load_benchmark_queries,
+    load_query_metadata,
+    resolve_query_filename,
+)
+
+# --- Constants ---
+EXPLAIN_PREFIX = "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) "
+
+
+def iter_plan_nodes(node: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yields a plan node and all of its descendants (depth-first)."""
+    yield node
+    for child in node.get("Plans", []):
+        yield from iter_plan_nodes(child)
+
+
+def _node_total_time_ms(node: Dict[str, Any]) -> float:
+    """Returns the inclusive wall time of a node across all of its loops."""
+    return node.get("Actual Total Time", 0.0) * node.get("Actual Loops", 1)
+
+
+def _node_exclusive_time_ms(node: Dict[str, Any]) -> float:
+    """Returns the time spent in a node itself, excluding its children."""
+    children_time = sum(_node_total_time_ms(c) for c in node.get("Plans", []))
+    return max(_node_total_time_ms(node) - children_time, 0.0)
+
+
+def summarize_plan(plan_document: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Extracts comparable columns from one ``EXPLAIN (FORMAT JSON)`` document.
+
+    Buffer counters on the root node are cumulative over the whole tree, so
+    they are read from the root only. The slowest node is the one with the
+    largest exclusive time (its own time minus that of its children).
+
+    Args:
+        plan_document: The first element of the JSON array returned by EXPLAIN.
+
+    Returns:
+        A flat dictionary of plan metrics.
+    """
+    root = plan_document.get("Plan", {})
+    nodes = list(iter_plan_nodes(root))
+    slowest = max(nodes, key=_node_exclusive_time_ms)
+
+    return {
+        "planning_time_ms": plan_document.get("Planning Time"),
+        "execution_time_ms": plan_document.get("Execution Time"),
+        "root_node_type": root.get("Node Type"),
+        "plan_rows_estimate": root.get("Plan Rows"),
+        "actual_rows": root.get("Actual Rows"),
+        "shared_hit_blocks": root.get("Shared Hit Blocks"),
+        "shared_read_blocks": root.get("Shared Read Blocks"),
+        "temp_read_blocks": root.get("Temp Read Blocks"),
+        "temp_written_blocks": root.get("Temp Written Blocks"),
+        "seq_scan_count": sum(
+            1 for n in nodes if n.get("Node Type") == "Seq Scan"
+        ),
+        "disk_sort_count": sum(
+            1 for n in nodes if n.get("Sort Space Type") == "Disk"
+        ),
+        "slowest_node_type": slowest.get("Node Type"),
+        "slowest_node_relation": slowest.get("Relation Name"),
+        "slowest_node_time_ms": round(_node_exclusive_time_ms(slowest), 3),
+    }
+
+
+def explain_query(
+    connection: Connection, query_sql: str
+) -> Tuple[Dict[str, Any], str]:
+    """
+    Runs ``EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON)`` for a single statement.
+
+    EXPLAIN ANALYZE executes the statement, so it is wrapped in a transaction
+    that is always rolled back.
+
+    Returns:
+        A tuple of (plan document, JSON text of the full EXPLAIN output).
+    """
+    with connection.begin() as transaction:
+        raw = connection.execute(text(EXPLAIN_PREFIX + query_sql)).scalar_one()
+        transaction.rollback()
+
+    # psycopg2 decodes json columns automatically; tolerate text just in case.
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return plan[0], json.dumps(plan)
+
+
+def capture_query_plans(
+    engine: Engine, db_name: str, schema_name: str, sql_queries_dir: Path
+) -> List[Dict[str, Any]]:
+    """
+    Captures the executed plan of every canonical query for a database.
+
+    Args:
+        engine: SQLAlchemy engine instance
+        db_name: Name of the database being profiled
+        schema_name: Schema name for the database
+        sql_queries_dir: Path to directory containing query files
+
+    Returns:
+        One record per query with the extracted plan metrics and the full
+        JSON plan in ``plan_json``.
+    """
+    plans: List[Dict[str, Any]] = []
+
+    metadata = load_query_metadata(sql_queries_dir)
+    query_filename: Optional[str] = resolve_query_filename(metadata, db_name)
+    if not query_filename:
+        logging.warning(
+            "No canonical query mapping for '%s'; skipping plan capture.", db_name
+        )
+        return plans
+
+    queries = load_benchmark_queries(sql_queries_dir / query_filename)
+    logging.info("Capturing %s query plans for '%s'...", len(queries), db_name)
+
+    with engine.connect() as connection:
+        for category, query_id, query_sql in queries:
+            plan_entry: Dict[str, Any] = {
+                "database": db_name,
+                "schema": schema_name,
+                "category": category,
+                "query_id": query_id,
+                "status": "Failed",
+            }
+            try:
+                plan_document, plan_json = explain_query(connection, query_sql)
+                plan_entry.update(summarize_plan(plan_document))
+                plan_entry["plan_json"] = plan_json
+                plan_entry["status"] = "Success"
+                logging.info(
+                    "  Query %s: exec %s ms, slowest node %s (%s ms)",
+                    query_id,
+                    plan_entry["execution_time_ms"],
+                    plan_entry["slowest_node_type"],
+                    plan_entry["slowest_node_time_ms"],
+                )
+            except Exception as e:
+                logging.error("  Plan capture for query '%s' failed: %s", query_id, e)
+                plan_entry["error_message"] = str(e)
+
+            plans.append(plan_entry)
+
+    return plans
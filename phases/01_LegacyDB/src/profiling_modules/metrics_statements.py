@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+"""Server-side query statistics from the pg_stat_statements extension."""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+from .metrics_cache import has_extension
+
+# --- Constants ---
+# Counters harvested per statement (PostgreSQL 13+ column names), exposed in
+# the benchmark results with a ``pgss_`` prefix.
+STATEMENT_COUNTERS = [
+    "calls",
+    "rows",
+    "total_plan_time",
+    "mean_plan_time",
+    "total_exec_time",
+    "mean_exec_time",
+    "shared_blks_hit",
+    "shared_blks_read",
+    "temp_blks_read",
+    "temp_blks_written",
+    "wal_records",
+    "wal_bytes",
+]
+COLUMN_PREFIX = "pgss_"
+
+
+def get_statement_id(connection: Connection, query_sql: str) -> Optional[int]:
+    """
+    Returns the ``queryid`` pg_stat_statements will assign to a statement.
+
+    The identifier is read from ``EXPLAIN (VERBOSE, FORMAT JSON)``, which
+    reports it whenever query-id computation is active (as it is when
+    pg_stat_statements is loaded). Matching on this id is robust to the
+    constant normalization pg_stat_statements applies to query text.
+    """
+    raw = connection.execute(
+        text("EXPLAIN (VERBOSE, FORMAT JSON) " + query_sql)
+    ).scalar_one()
+    plan = json.loads(raw) if isinstance(raw, str) else raw
+    return plan[0].get("Query Identifier")
+
+
+def reset_statement_stats(connection: Connection) -> bool:
+    """
+    Resets pg_stat_statements counters for the current database.
+
+    Returns:
+        True if the extension is usable and was reset, False otherwise (not
+        installed, not in ``shared_preload_libraries``, or no privilege).
+    """
+    if not has_extension(connection, "pg_stat_statements"):
+        return False
+    try:
+        connection.execute(
+            text(
+                "SELECT pg_stat_statements_reset(0, (SELECT oid FROM pg_database "
+                "WHERE datname = current_database()), 0)"
+            )
+        )
+        return True
+    except Exception as e:
+        logging.warning("  pg_stat_statements is installed but unusable: %s", e)
+        connection.rollback()
+        return False
+
+
+def resolve_statement_ids(
+    connection: Connection, queries: List[Tuple[str, str, str]]
+) -> Dict[str, int]:
+    """Maps each canonical ``query_id`` to its pg_stat_statements ``queryid``."""
+    statement_ids: Dict[str, int] = {}
+    for _, query_id, query_sql in queries:
+        try:
+            statement_id = get_statement_id(connection, query_sql)
+        except Exception as e:
+            logging.debug("  No statement id for query %s: %s", query_id, e)
+            connection.rollback()
+            continue
+        if statement_id is not None:
+            statement_ids[query_id] = statement_id
+    return statement_ids
+
+
+def harvest_statement_stats(
+    connection: Connection, statement_ids: Dict[str, int]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Reads the counters accumulated since the last reset for each query.
+
+    Counters cover every server-side execution of the exact statement,
+    including warm-up runs. Planning time is only tracked when
+    ``pg_stat_statements.track_planning`` is on; otherwise it reads as zero.
+
+    Returns:
+        ``{query_id: {"pgss_calls": ..., ...}}`` for queries that were seen.
+    """
+    if not statement_ids:
+        return {}
+
+    rows = connection.execute(
+        text(
+            f"""
+            SELECT queryid, {", ".join(STATEMENT_COUNTERS)}
+            FROM pg_stat_statements
+            WHERE dbid = (
+                SELECT oid FROM pg_database WHERE datname = current_database()
+            )
+            AND queryid = ANY(:ids)
+            """
+        ),
+        {"ids": list(statement_ids.values())},
+    ).mappings()
+
+    by_statement: Dict[int, Dict[str, Any]] = {}
+    for row in rows:
+        counters = by_statement.setdefault(
+            row["queryid"], {col: 0 for col in STATEMENT_COUNTERS}
+        )
+        # A statement may appear once per user/toplevel flag; sum the counters
+        # and recompute the means below.
+        for col in STATEMENT_COUNTERS:
+            counters[col] += float(row[col] or 0)
+
+    stats: Dict[str, Dict[str, Any]] = {}
+    for query_id, statement_id in statement_ids.items():
+        counters = by_statement.get(statement_id)
+        if not counters or not counters["calls"]:
+            continue
+        calls = counters["calls"]
+        counters["mean_plan_time"] = counters["total_plan_time"] / calls
+        counters["mean_exec_time"] = counters["total_exec_time"] / calls
+        stats[query_id] = {
+            f"{COLUMN_PREFIX}{col}": round(value, 3) for col, value in counters.items()
+        }
+    return stats
@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""Functions for sweeping parameterized canonical queries across data values."""
+
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection, Engine
+
+from .metrics_performance import (
+    get_bind_parameters,
+    load_benchmark_queries,
+    load_query_metadata,
+    resolve_query_filename,
+)
+from .timing import (
+    DEFAULT_TRIALS,
+    DEFAULT_WARMUP_RUNS,
+    run_timed_trials,
+    summarize_latencies,
+)
+
+# --- Constants ---
+FREQUENCY_COLUMN = "frequency"
+
+
+def select_sweep_points(
+    value_rows: List[Dict[str, Any]], max_points: Optional[int]
+) -> List[Dict[str, Any]]:
+    """
+    Orders candidate parameter sets by frequency and thins them if needed.
+
+    When there are more candidates than ``max_points``, points are taken at
+    evenly spaced ranks so the sweep still spans the rarest to the most
+    frequent values, i.e. the whole selectivity range.
+
+    Args:
+        value_rows: Rows from the parameter set's ``values_sql``.
+        max_points: Maximum number of sweep points; ``None`` keeps all.
+
+    Returns:
+        The selected rows, ordered by ascending frequency.
+    """
+    ordered = sorted(value_rows, key=lambda row: row.get(FREQUENCY_COLUMN) or 0)
+    if not max_points or len(ordered) <= max_points:
+        return ordered
+    if max_points == 1:
+        return [ordered[-1]]
+
+    step = (len(ordered) - 1) / (max_points - 1)
+    indices = sorted({round(i * step) for i in range(max_points)})
+    return [ordered[i] for i in indices]
+
+
+def fetch_parameter_values(
+    connection: Connection, values_sql: str, param_names: List[str]
+) -> List[Dict[str, Any]]:
+    """
+    Draws candidate parameter values from the data.
+
+    The ``values_sql`` must return one column per bind parameter (named after
+    it) and may return a ``frequency`` column with the number of rows each
+    value matches. Rows with a NULL parameter are dropped, since ``= NULL``
+    never matches, but still count towards the total used for selectivity.
+
+    Returns:
+        Parameter rows, each with a ``selectivity`` (frequency / total) key
+        when frequencies are available.
+    """
+    rows = [dict(r) for r in connection.execute(text(values_sql)).mappings()]
+    missing = [p for p in param_names if rows and p not in rows[0]]
+    if missing:
+        raise ValueError(f"values_sql does not return parameter columns {missing}")
+
+    total = sum(row.get(FREQUENCY_COLUMN) or 0 for row in rows)
+    candidates = []
+    for row in rows:
+        if any(row[p] is None for p in param_names):
+            continue
+        if total:
+            row["selectivity"] = (row.get(FREQUENCY_COLUMN) or 0) / total
+        candidates.append(row)
+    return candidates
+
+
+def run_parameter_sweeps(
+    engine: Engine,
+    db_name: str,
+    schema_name: str,
+    sql_queries_dir: Path,
+    trials: int = DEFAULT_TRIALS,
+    warmup_runs: int = DEFAULT_WARMUP_RUNS,
+) -> List[Dict[str, Any]]:
+    """
+    Executes each parameterized canonical query across a sweep of values.
+
+    Parameter sets are declared in ``_categories.json`` under
+    ``parameter_sets``, keyed by query file and query id::
+
+        "parameter_sets": {
+            "canonical_queries_df9.sql": {
+                "4.1": {"values_sql": "SELECT unit, COUNT(*) AS frequency ...",
+                        "max_points": 25}
+            }
+        }
+
+    Args:
+        engine: SQLAlchemy engine instance
+        db_name: Name of the database being profiled
+        schema_name: Schema name for the database
+        sql_queries_dir: Path to directory containing query files
+        trials: Number of measured executions per sweep point
+        warmup_runs: Number of untimed executions per sweep point
+
+    Returns:
+        One record per (query, parameter set), forming latency-vs-selectivity
+        curves.
+    """
+    sweeps: List[Dict[str, Any]] = []
+
+    metadata = load_query_metadata(sql_queries_dir)
+    query_filename = resolve_query_filename(metadata, db_name)
+    if not query_filename:
+        logging.warning(
+            "No canonical query mapping for '%s'; skipping parameter sweeps.", db_name
+        )
+        return sweeps
+
+    parameter_sets = metadata.get("parameter_sets", {}).get(query_filename, {})
+    templates = [
+        q
+        for q in load_benchmark_queries(
+            sql_queries_dir / query_filename, include_templates=True
+        )
+        if get_bind_parameters(q[2])
+    ]
+
+    with engine.connect() as connection:
+        for category, query_id, query_sql in templates:
+            param_names = get_bind_parameters(query_sql)
+            declaration = parameter_sets.get(query_id)
+            if not declaration or "values_sql" not in declaration:
+                logging.warning(
+                    "  Template %s has no parameter set declared; skipping.", query_id
+                )
+                continue
+
+            try:
+                candidates = fetch_parameter_values(
+                    connection, declaration["values_sql"], param_names
+                )
+            except Exception as e:
+                logging.error(
+                    "  Could not draw parameter values for %s: %s", query_id, e
+                )
+                connection.rollback()
+                continue
+
+            points = select_sweep_points(candidates, declaration.get("max_points"))
+            logging.info(
+                "  Sweeping query %s over %s of %s parameter sets...",
+                query_id,
+                len(points),
+                len(candidates),
+            )
+
+            for point in points:
+                params = {p: point[p] for p in param_names}
+                sweep_entry: Dict[str, Any] = {
+                    "database": db_name,
+                    "schema": schema_name,
+                    "category": category,
+                    "query_id": query_id,
+                    "parameters": json.dumps(params, default=str),
+                    "frequency": point.get(FREQUENCY_COLUMN),
+                    "selectivity": point.get("selectivity"),
+                    "warmup_runs": warmup_runs,
+                    "trials": trials,
+                    "status": "Failed",
+                }
+                try:
+                    samples_ms = run_timed_trials(
+                        connection, query_sql, trials, warmup_runs, params=params
+                    )
+                    sweep_entry.update(summarize_latencies(samples_ms))
+                    sweep_entry["status"] = "Success"
+                except Exception as e:
+                    logging.error(
+                        "  Sweep point %s of query %s failed: %s", params, query_id, e
+                    )
+                    sweep_entry["error_message"] = str(e)
+                    connection.rollback()
+
+                sweeps.append(sweep_entry)
+
+    return sweeps
@@ -0,0 +1,265 @@
+# -*- coding: utf-8 -*-
+"""Timing and latency-statistics helpers shared by the benchmark modules."""
+
+import json
+import math
+import statistics
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import create_engine, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.sql.elements import TextClause
+
+from . import metrics_cache
+
+# --- Constants ---
+DEFAULT_WARMUP_RUNS = 0
+DEFAULT_TRIALS = 1
+
+# How the result set is consumed inside the timed region.
+FETCH_MODE_EXECUTE = "execute"
+FETCH_MODE_STREAM = "stream"
+FETCH_MODE_DATAFRAME = "dataframe"
+FETCH_MODES = [FETCH_MODE_EXECUTE, FETCH_MODE_STREAM, FETCH_MODE_DATAFRAME]
+STREAM_BATCH_ROWS = 10_000
+BYTES_PER_MB = 1024 * 1024
+BOOTSTRAP_RESAMPLES = 2000
+BOOTSTRAP_SEED = 42
+BOOTSTRAP_CONFIDENCE = 0.95
+
+
+def percentile(sorted_samples: List[float], pct: float) -> float:
+    """Return the ``pct`` percentile of pre-sorted samples (linear interpolation)."""
+    if len(sorted_samples) == 1:
+        return sorted_samples[0]
+    rank = (len(sorted_samples) - 1) * pct / 100.0
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    weight = rank - lower
+    return sorted_samples[lower] * (1 - weight) + sorted_samples[upper] * weight
+
+
+def summarize_latencies(samples_ms: List[float]) -> Dict[str, Any]:
+    """
+    Summarizes a list of latency samples into distribution statistics.
+
+    Args:
+        samples_ms: Measured latencies in milliseconds (warm-up runs excluded).
+
+    Returns:
+        A dictionary with min/median/mean/p95/p99/stddev (ms, rounded to two
+        decimals) and the raw samples encoded as a JSON list so that they
+        survive the round trip through the CSV metric files.
+    """
+    if not samples_ms:
+        return {}
+
+    ordered = sorted(samples_ms)
+    stddev = statistics.stdev(ordered) if len(ordered) > 1 else 0.0
+    return {
+        "latency_min_ms": round(ordered[0], 2),
+        "latency_median_ms": round(statistics.median(ordered), 2),
+        "latency_mean_ms": round(statistics.fmean(ordered), 2),
+        "latency_p95_ms": round(percentile(ordered, 95), 2),
+        "latency_p99_ms": round(percentile(ordered, 99), 2),
+        "latency_stddev_ms": round(stddev, 2),
+        "latency_samples_ms": json.dumps([round(x, 3) for x in samples_ms]),
+    }
+
+
+def execute_and_materialize(
+    connection: Connection, statement: TextClause, fetch_mode: str
+) -> int:
+    """
+    Executes a statement and consumes its result set according to ``fetch_mode``.
+
+    - ``execute``: execute only. With psycopg2's default client-side cursor
+      the rows are transferred into libpq buffers but never decoded into
+      Python objects.
+    - ``stream``: fetch every row through a server-side (named) cursor in
+      batches of ``STREAM_BATCH_ROWS``.
+    - ``dataframe``: load the full result into a pandas DataFrame.
+
+    Returns:
+        The number of rows returned.
+    """
+    if fetch_mode == FETCH_MODE_STREAM:
+        result = connection.execute(statement.execution_options(stream_results=True))
+        return sum(len(batch) for batch in result.partitions(STREAM_BATCH_ROWS))
+    if fetch_mode == FETCH_MODE_DATAFRAME:
+        return len(pd.read_sql_query(statement, connection))
+    return connection.execute(statement).rowcount
+
+
+def measure_result_size(connection: Connection, query_sql: str) -> Tuple[int, int]:
+    """
+    Measures the row count and approximate payload size of a query result.
+
+    The payload is the summed length of each row's text representation, which
+    approximates the bytes psycopg2 receives over the text wire protocol. It
+    is measured in a separate, untimed statement.
+
+    Returns:
+        A tuple of (rows, bytes).
+    """
+    row = connection.execute(
+        text(
+            "SELECT COUNT(*), COALESCE(SUM(OCTET_LENGTH(CAST(q AS text))), 0) "
+            f"FROM ({query_sql}) AS q"
+        )
+    ).one()
+    return int(row[0]), int(row[1])
+
+
+def normalize_latency(
+    latency_ms: float, rows: Optional[int], result_bytes: Optional[int]
+) -> Dict[str, Any]:
+    """Expresses a latency per returned row (microseconds) and per MB (ms)."""
+    normalized: Dict[str, Any] = {"latency_per_row_us": None, "latency_per_mb_ms": None}
+    if rows:
+        normalized["latency_per_row_us"] = round(latency_ms * 1000 / rows, 3)
+    if result_bytes:
+        result_mb = result_bytes / BYTES_PER_MB
+        normalized["latency_per_mb_ms"] = round(latency_ms / result_mb, 3)
+    return normalized
+
+
+def run_timed_trials(
+    connection: Connection,
+    query_sql: str,
+    trials: int,
+    warmup_runs: int,
+    fetch_mode: str = FETCH_MODE_EXECUTE,
+    params: Optional[Dict[str, Any]] = None,
+) -> List[float]:
+    """
+    Executes a query ``warmup_runs`` times untimed, then ``trials`` times timed.
+
+    Args:
+        connection: An open SQLAlchemy connection.
+        query_sql: The SQL statement to execute.
+        trials: Number of measured executions (must be >= 1).
+        warmup_runs: Number of discarded executions run before measuring.
+        fetch_mode: How the result is consumed inside the timed region.
+        params: Values for the bind parameters of a query template.
+
+    Returns:
+        The measured latencies in milliseconds, in execution order.
+    """
+    if trials < 1:
+        raise ValueError(f"trials must be >= 1, got {trials}")
+    if warmup_runs < 0:
+        raise ValueError(f"warmup_runs must be >= 0, got {warmup_runs}")
+    if fetch_mode not in FETCH_MODES:
+        raise ValueError(f"Unknown fetch mode '{fetch_mode}'; expected {FETCH_MODES}")
+
+    statement = text(query_sql)
+    if params:
+        statement = statement.bindparams(**params)
+    for _ in range(warmup_runs):
+        execute_and_materialize(connection, statement, fetch_mode)
+
+    samples_ms = []
+    for _ in range(trials):
+        start_time = time.monotonic()
+        execute_and_materialize(connection, statement, fetch_mode)
+        end_time = time.monotonic()
+        samples_ms.append((end_time - start_time) * 1000)
+    return samples_ms
+
+
+def run_cold_trials(
+    engine: Engine,
+    query_sql: str,
+    trials: int,
+    evict_hook: Optional[str] = None,
+    fetch_mode: str = FETCH_MODE_EXECUTE,
+) -> Tuple[List[float], str]:
+    """
+    Times a query ``trials`` times, each from a cold session.
+
+    Before every trial the query's relations are evicted (see
+    ``metrics_cache.evict_relations``), a brand-new unpooled connection is
+    opened and ``DISCARD ALL`` resets its session state, so no plan cache,
+    prepared statement or temp table survives from a previous run. Warm-up
+    runs do not apply in this mode.
+
+    Returns:
+        A tuple of (latencies in ms, eviction method used).
+    """
+    cold_engine = create_engine(engine.url, poolclass=NullPool)
+    statement = text(query_sql)
+    samples_ms: List[float] = []
+    method = "discard_only"
+    try:
+        with cold_engine.connect() as admin:
+            relations = metrics_cache.get_query_relations(admin, query_sql)
+
+        for _ in range(trials):
+            with cold_engine.connect() as admin:
+                method = metrics_cache.evict_relations(admin, relations, evict_hook)
+                admin.commit()
+
+            with cold_engine.connect() as connection:
+                # DISCARD ALL cannot run inside a transaction block; switch
+                # back afterwards because server-side cursors need one. The
+                # statement autobegins a transaction that must end before the
+                # isolation level can change again.
+                connection.execution_options(isolation_level="AUTOCOMMIT")
+                connection.exec_driver_sql("DISCARD ALL")
+                connection.commit()
+                connection.execution_options(
+                    isolation_level=connection.default_isolation_level
+                )
+                start_time = time.monotonic()
+                execute_and_materialize(connection, statement, fetch_mode)
+                end_time = time.monotonic()
+                samples_ms.append((end_time - start_time) * 1000)
+    finally:
+        cold_engine.dispose()
+
+    return samples_ms, method
+
+
+def parse_latency_samples(raw_samples: Any) -> List[float]:
+    """Decodes the JSON-encoded ``latency_samples_ms`` column into a list."""
+    if not isinstance(raw_samples, str) or not raw_samples:
+        return []
+    try:
+        return [float(x) for x in json.loads(raw_samples)]
+    except (json.JSONDecodeError, TypeError, ValueError):
+        return []
+
+
+def bootstrap_median_ratio_ci(
+    samples: List[float], baseline_samples: List[float]
+) -> Tuple[Optional[float], Optional[float]]:
+    """
+    Computes a bootstrap confidence interval for median(samples)/median(baseline).
+
+    Both sample sets are resampled independently with replacement. Returns
+    ``(None, None)`` when either side has fewer than two samples, since a
+    single measurement carries no information about its own variability.
+    """
+    if len(samples) < 2 or len(baseline_samples) < 2:
+        return None, None
+
+    rng = np.random.default_rng(BOOTSTRAP_SEED)
+    values = np.asarray(samples)
+    baseline = np.asarray(baseline_samples)
+    resampled = rng.choice(values, size=(BOOTSTRAP_RESAMPLES, values.size))
+    resampled_base = rng.choice(
+        baseline, size=(BOOTSTRAP_RESAMPLES, baseline.size)
+    )
+    base_medians = np.median(resampled_base, axis=1)
+    if np.any(base_medians <= 0):
+        return None, None
+    ratios = np.median(resampled, axis=1) / base_medians
+
+    alpha = (1 - BOOTSTRAP_CONFIDENCE) / 2
+    low, high = np.quantile(ratios, [alpha, 1 - alpha])
+    return round(float(low), 2), round(float(high), 2)
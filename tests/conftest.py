@@ -0,0 +1,10 @@
+# -*- coding: utf-8 -*-
+"""Shared pytest configuration: makes the Phase 1 packages importable."""
+
+import sys
+from pathlib import Path
+
+# The Phase 1 scripts run from their src/ directory and import the
+# loading_modules and profiling_modules packages from there.
+LEGACY_DB_SRC = Path(__file__).resolve().parent.parent / "phases/01_LegacyDB/src"
+sys.path.insert(0, str(LEGACY_DB_SRC))
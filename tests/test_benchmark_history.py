@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""Tests for regression detection over the benchmark history."""
+
+import json
+
+import pandas as pd
+from profiling_modules.benchmark_history import detect_regressions
+
+
+def history_row(run_id, started_at, query_id, samples, status="Success"):
+    return {
+        "run_id": run_id,
+        "started_at": started_at,
+        "database": "TMP_DF9",
+        "query_id": query_id,
+        "cache_state": "unmanaged",
+        "fetch_mode": "execute",
+        "latency_median_ms": float(pd.Series(samples).median()),
+        "latency_samples_ms": json.dumps(samples),
+        "server_version": "16.2",
+        "status": status,
+    }
+
+
+def make_history(newest_samples, baseline_samples=(10.0, 10.2, 9.8, 10.1, 9.9)):
+    baseline = list(baseline_samples)
+    return pd.DataFrame([
+        history_row("r1", "2026-01-01T00:00:00", "1.1", baseline),
+        history_row("r2", "2026-01-02T00:00:00", "1.1", baseline),
+        history_row("r3", "2026-01-03T00:00:00", "1.1", newest_samples),
+    ])
+
+
+def test_clear_slowdown_is_flagged():
+    result = detect_regressions(make_history([20.0, 20.4, 19.6, 20.2, 19.8]))
+    assert len(result) == 1
+    row = result.iloc[0]
+    assert row["run_id"] == "r3"
+    assert row["baseline_runs"] == 2
+    assert row["slowdown_ratio"] == 2.0
+    assert row["ratio_ci_low"] > 1
+    assert bool(row["regression"])
+
+
+def test_noise_is_not_flagged():
+    result = detect_regressions(make_history([10.1, 9.9, 10.0, 10.2, 9.8]))
+    assert not bool(result.iloc[0]["regression"])
+
+
+def test_slowdown_below_threshold_is_not_flagged():
+    result = detect_regressions(
+        make_history([10.5, 10.5, 10.5, 10.5, 10.5], [10.0] * 5), min_slowdown=1.10
+    )
+    assert result.iloc[0]["slowdown_ratio"] == 1.05
+    assert not bool(result.iloc[0]["regression"])
+
+
+def test_single_trial_runs_are_never_flagged():
+    result = detect_regressions(make_history([50.0], [10.0]))
+    assert result.iloc[0]["ratio_ci_low"] is None
+    assert not bool(result.iloc[0]["regression"])
+
+
+def test_baseline_window_is_limited():
+    result = detect_regressions(make_history([20.0, 20.0, 20.0, 20.0]), baseline_runs=1)
+    assert result.iloc[0]["baseline_runs"] == 1
+
+
+def test_fewer_than_two_runs():
+    history = make_history([20.0, 20.0])
+    assert detect_regressions(history[history["run_id"] == "r1"]).empty
+    assert detect_regressions(pd.DataFrame()).empty
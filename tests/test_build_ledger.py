@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Tests for the incremental-rebuild decision of the build ledger."""
+
+import copy
+
+import pytest
+from loading_modules.build_ledger import (
+    ACTION_DELTA,
+    ACTION_FULL,
+    ACTION_SKIP,
+    invalidate_entries,
+    load_ledger,
+    plan_build,
+    record_build,
+    save_ledger,
+)
+
+ENTRY = {
+    "sql_sha256": "sql",
+    "options_sha256": "options",
+    "source": {
+        "mode": "checksum",
+        "tables": {"tmp_df9": "a", "lookup": "b"},
+        "keys": {str(key): f"row{key}" for key in range(20)},
+    },
+}
+
+
+def changed(**updates):
+    entry = copy.deepcopy(ENTRY)
+    for path, value in updates.items():
+        *parents, leaf = path.split("__")
+        target = entry
+        for parent in parents:
+            target = target[parent]
+        target[leaf] = value
+    return entry
+
+
+def test_unchanged_inputs_are_skipped():
+    assert plan_build(ENTRY, copy.deepcopy(ENTRY), True)[0] == ACTION_SKIP
+
+
+@pytest.mark.parametrize(
+    ("previous", "current", "target_ready", "reason"),
+    [
+        (ENTRY, ENTRY, False, "target table missing"),
+        (None, ENTRY, True, "no ledger entry"),
+        (ENTRY, changed(sql_sha256="new"), True, "SQL file changed"),
+        (ENTRY, changed(options_sha256="new"), True, "build options changed"),
+        (ENTRY, changed(source__mode="markers"), True, "fingerprint mode changed"),
+    ],
+)
+def test_full_rebuilds(previous, current, target_ready, reason):
+    assert plan_build(previous, current, target_ready) == (ACTION_FULL, reason, [])
+
+
+def test_changed_unkeyed_table_forces_full_rebuild():
+    current = changed(source__tables={"tmp_df9": "a", "lookup": "c", "new": "d"})
+    action, reason, keys = plan_build(ENTRY, current, True)
+    assert action == ACTION_FULL
+    assert reason == "source tables changed: lookup, new"
+    assert keys == []
+
+
+def test_few_changed_keys_are_patched():
+    keys = dict(ENTRY["source"]["keys"], **{"3": "edited", "20": "added"})
+    del keys["7"]
+    assert plan_build(ENTRY, changed(source__keys=keys), True) == (
+        ACTION_DELTA,
+        "3 keys changed",
+        ["20", "3", "7"],
+    )
+
+
+def test_too_many_changed_keys_force_full_rebuild():
+    keys = {key: "edited" for key in ENTRY["source"]["keys"]}
+    action, reason, _ = plan_build(ENTRY, changed(source__keys=keys), True)
+    assert (action, reason) == (ACTION_FULL, "20 keys changed (too many)")
+    assert plan_build(ENTRY, changed(source__keys=keys), True, 1.0)[0] == (ACTION_DELTA)
+
+
+def test_failed_build_forgets_its_entry(tmp_path):
+    ledger_path = tmp_path / "ledger.json"
+    ledger = {"wide": copy.deepcopy(ENTRY), "other": copy.deepcopy(ENTRY)}
+    current = changed(sql_sha256="new")
+
+    invalidate_entries(ledger_path, ledger, ["wide"])
+    assert load_ledger(ledger_path) == {"other": ENTRY}
+
+    record_build(ledger, "wide", (ENTRY, current), None)
+    save_ledger(ledger_path, ledger)
+    # The table may be empty or partial now, so it is rebuilt, never skipped.
+    previous = load_ledger(ledger_path).get("wide")
+    assert plan_build(previous, current, True) == (ACTION_FULL, "no ledger entry", [])
+
+
+def test_successful_builds_store_their_entry():
+    ledger = {}
+    current = changed(sql_sha256="new")
+    record_build(ledger, "wide", (ENTRY, current), {"action": ACTION_FULL})
+    assert ledger["wide"] == current
+    record_build(ledger, "wide", (ENTRY, ENTRY), {"action": ACTION_SKIP})
+    assert ledger["wide"] is ENTRY
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+"""Tests for cold-cache trials against a real SQLAlchemy connection."""
+
+import pytest
+from profiling_modules import metrics_cache
+from profiling_modules.timing import run_cold_trials
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.engine import Engine
+
+
+@pytest.fixture
+def sqlite_engine(tmp_path, monkeypatch):
+    """A file-backed SQLite engine that accepts PostgreSQL's DISCARD ALL."""
+    engine = create_engine(f"sqlite:///{tmp_path / 'cold.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE t (id INTEGER)"))
+        connection.execute(text("INSERT INTO t VALUES (1), (2), (3)"))
+
+    statements = []
+
+    def rewrite(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+        if statement == "DISCARD ALL":
+            statement = "SELECT 1"
+        return statement, parameters
+
+    # run_cold_trials creates its own engine, so listen on every engine.
+    event.listen(Engine, "before_cursor_execute", rewrite, retval=True)
+    monkeypatch.setattr(metrics_cache, "get_query_relations", lambda c, q: ["t"])
+    monkeypatch.setattr(
+        metrics_cache, "evict_relations", lambda c, r, h: "discard_only"
+    )
+    yield engine, statements
+    event.remove(Engine, "before_cursor_execute", rewrite)
+    engine.dispose()
+
+
+def test_every_cold_trial_discards_and_runs(sqlite_engine):
+    engine, statements = sqlite_engine
+    samples, method = run_cold_trials(engine, "SELECT * FROM t", trials=3)
+    assert len(samples) == 3
+    assert all(sample >= 0 for sample in samples)
+    assert method == "discard_only"
+    assert statements.count("DISCARD ALL") == 3
+    assert statements.count("SELECT * FROM t") == 3
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+"""Tests for the COPY text-format serializer."""
+
+import datetime
+from decimal import Decimal
+
+from loading_modules.copy_loader import format_copy_rows
+
+
+def test_format_copy_rows():
+    rows = [
+        (1, "plain", Decimal("2.50"), True, datetime.date(2026, 1, 2)),
+        (2, None, None, False, None),
+    ]
+    assert format_copy_rows(rows) == (
+        "1\tplain\t2.50\tTrue\t2026-01-02\n2\t\\N\t\\N\tFalse\t\\N\n"
+    )
+
+
+def test_format_copy_rows_escapes_delimiters():
+    rows = [("tab\there", "line\nbreak\r", "back\\slash", "\\N")]
+    assert format_copy_rows(rows) == (
+        "tab\\there\tline\\nbreak\\r\tback\\\\slash\t\\\\N\n"
+    )
+
+
+def test_format_copy_rows_empty():
+    assert format_copy_rows([]) == ""
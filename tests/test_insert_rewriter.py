@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""Tests for the INSERT-to-COPY rewriter."""
+
+import pytest
+from loading_modules.insert_rewriter import parse_insert
+
+
+def test_multi_row_insert_becomes_copy_lines():
+    statement = (
+        "INSERT INTO public.sites (id, name, area, active) VALUES "
+        "(1, 'Oztoyahualco', 2.5, TRUE),\n  (2, 'it''s\ta\\site', -1e3, false)"
+    )
+    assert parse_insert(statement) == (
+        "COPY public.sites (id, name, area, active) FROM STDIN",
+        ["1\tOztoyahualco\t2.5\ttrue\n", "2\tit's\\ta\\\\site\t-1e3\tfalse\n"],
+    )
+
+
+def test_null_and_quoted_identifiers():
+    statement = '-- row\nINSERT INTO "Odd ""T""" VALUES (NULL, \'\', .5)'
+    assert parse_insert(statement) == (
+        'COPY "Odd ""T""" FROM STDIN',
+        ["\\N\t\t.5\n"],
+    )
+
+
+def test_null_string_is_not_null():
+    # The string 'NULL' is text, while the NULL keyword becomes COPY's \N.
+    assert parse_insert("INSERT INTO t VALUES ('NULL', null)")[1] == ["NULL\t\\N\n"]
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "INSERT INTO t VALUES (1, 2), (3)",
+        "INSERT INTO t VALUES (1), (2, 3)",
+        "INSERT INTO t VALUES (1) ON CONFLICT DO NOTHING",
+        "INSERT INTO t (id) VALUES (1) ON CONFLICT (id) DO UPDATE SET id = 2",
+        "INSERT INTO t VALUES (1) RETURNING id",
+        "INSERT INTO t VALUES (E'a\\tb')",
+        "INSERT INTO t VALUES ('1'::int)",
+        "INSERT INTO t VALUES (now())",
+        "INSERT INTO t VALUES (DEFAULT)",
+        "INSERT INTO t SELECT 1",
+        "UPDATE t SET id = 1",
+    ],
+)
+def test_unsuitable_statements_are_left_alone(statement):
+    assert parse_insert(statement) is None
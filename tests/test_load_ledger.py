@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+"""Tests for the load plan of the in-database load ledger."""
+
+import os
+
+import pytest
+from loading_modules.build_ledger import file_sha256
+from loading_modules.load_ledger import (
+    ACTION_ADOPT,
+    ACTION_LOAD,
+    ACTION_RELOAD,
+    ACTION_RESUME,
+    ACTION_SKIP,
+    plan_load,
+)
+
+
+@pytest.fixture
+def dump(tmp_path):
+    path = tmp_path / "TMP_DF9.sql"
+    path.write_text("SELECT 1;\n", encoding="utf-8")
+    return path
+
+
+def ledger_state(path, sha256=None):
+    stat = path.stat()
+    return {
+        "dump": path.name,
+        "sha256": sha256 or file_sha256(path),
+        "size_bytes": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+    }
+
+
+def test_missing_database_is_loaded(dump):
+    assert plan_load(None, dump)[0] == ACTION_LOAD
+
+
+@pytest.mark.parametrize(
+    ("resumable", "adoptable", "action"),
+    [
+        (True, True, ACTION_RESUME),
+        (False, True, ACTION_ADOPT),
+        (False, False, ACTION_RELOAD),
+    ],
+)
+def test_untracked_database(dump, resumable, adoptable, action):
+    assert plan_load({}, dump, resumable, adoptable)[0] == action
+
+
+def test_unchanged_dump_is_skipped_without_hashing(dump):
+    assert plan_load(ledger_state(dump, sha256="stale"), dump) == (
+        ACTION_SKIP,
+        "dump size and modification time unchanged",
+        None,
+    )
+
+
+def test_touched_dump_is_verified_by_hash(dump):
+    state = ledger_state(dump)
+    os.utime(dump, ns=(state["mtime_ns"] + 10**9, state["mtime_ns"] + 10**9))
+    action, _, sha256 = plan_load(state, dump)
+    assert (action, sha256) == (ACTION_SKIP, state["sha256"])
+
+
+def test_changed_dump_is_reloaded(dump):
+    state = ledger_state(dump)
+    dump.write_text("SELECT 2;\nSELECT 3;\n", encoding="utf-8")
+    action, reason, sha256 = plan_load(state, dump)
+    assert (action, reason) == (ACTION_RELOAD, "dump SHA-256 changed")
+    assert sha256 == file_sha256(dump)
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""Tests for the cleanup of candidate indexes."""
+
+from profiling_modules import metrics_indexes
+
+CANDIDATE = ("public", "tblSSN", "SSN")
+
+
+class StubResult:
+    def scalar_one(self):
+        return 8192
+
+
+class StubConnection:
+    """Records statements and fails those that start with ``fail_on``."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.statements = []
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        self.statements.append(sql)
+        if self.fail_on and sql.startswith(self.fail_on):
+            raise RuntimeError(f"{self.fail_on} failed")
+        return StubResult()
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def measure(connection, monkeypatch):
+    monkeypatch.setattr(metrics_indexes, "_median_latency", lambda *args: 5.0)
+    return metrics_indexes._measure_candidate(
+        connection,
+        CANDIDATE,
+        [("q1", "SELECT 1"), ("q2", "SELECT 2")],
+        {"q1": 10.0, "q2": 20.0},
+        trials=1,
+        warmup_runs=0,
+        context={"database": "tmp_df9", "schema": "public"},
+    )
+
+
+def test_candidate_index_is_dropped(monkeypatch):
+    connection = StubConnection()
+    results = measure(connection, monkeypatch)
+    assert [r["status"] for r in results] == ["Success", "Success"]
+    assert [r["speedup"] for r in results] == [2.0, 4.0]
+    assert connection.statements[-2].startswith("DROP INDEX")
+
+
+def test_failed_drop_fails_the_candidate(monkeypatch):
+    connection = StubConnection(fail_on="DROP INDEX")
+    results = measure(connection, monkeypatch)
+    assert [r["status"] for r in results] == ["Failed", "Failed"]
+    assert all("DROP INDEX failed" in r["error_message"] for r in results)
+    assert connection.rollbacks == 1
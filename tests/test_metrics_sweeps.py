@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+"""Tests for the choice of parameter-sweep points."""
+
+from profiling_modules.metrics_sweeps import select_sweep_points
+
+
+def rows(*frequencies):
+    return [{"value": f"v{f}", "frequency": f} for f in frequencies]
+
+
+def test_all_points_are_kept_in_frequency_order():
+    assert select_sweep_points(rows(5, 1, 3), None) == rows(1, 3, 5)
+    assert select_sweep_points(rows(5, 1, 3), 3) == rows(1, 3, 5)
+
+
+def test_thinning_spans_rarest_to_most_frequent():
+    selected = select_sweep_points(rows(*range(1, 11)), 4)
+    assert [r["frequency"] for r in selected] == [1, 4, 7, 10]
+
+
+def test_single_point_is_the_most_frequent():
+    assert select_sweep_points(rows(2, 9, 4), 1) == rows(9)
+
+
+def test_missing_frequency_sorts_first():
+    value_rows = [{"value": "a", "frequency": 3}, {"value": "b"}]
+    assert [r["value"] for r in select_sweep_points(value_rows, None)] == ["b", "a"]
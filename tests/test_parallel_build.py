@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+"""Tests for the key-range slicing of extraction queries."""
+
+from pathlib import Path
+
+import pytest
+from loading_modules.parallel_build import find_root_table, partition_query
+
+SQL_DIR = Path(__file__).resolve().parent.parent / "phases/01_LegacyDB/sql"
+
+
+def test_first_range_includes_null_keys():
+    assert partition_query("SELECT * FROM t;", "SSN", (None, 100)) == (
+        'SELECT * FROM (\nSELECT * FROM t\n) AS q WHERE (q."SSN" < 100) '
+        'OR q."SSN" IS NULL'
+    )
+
+
+def test_middle_and_last_ranges():
+    assert partition_query("SELECT * FROM t", "SSN", (100, 200)).endswith(
+        'WHERE q."SSN" >= 100 AND q."SSN" < 200'
+    )
+    assert partition_query("SELECT * FROM t", "SSN", (200, None)).endswith(
+        'WHERE q."SSN" >= 200'
+    )
+
+
+def test_single_unbounded_range_keeps_every_row():
+    assert partition_query("SELECT 1", "SSN", (None, None)).endswith(
+        'WHERE (TRUE) OR q."SSN" IS NULL'
+    )
+
+
+def test_identifiers_and_bounds_are_quoted():
+    query = partition_query("SELECT 1", 'odd"key', ("o'k", None))
+    assert query.endswith("WHERE q.\"odd\"\"key\" >= 'o''k'")
+
+
+@pytest.mark.parametrize("name", ["flatten_df9.sql", "flatten_df9_text_nulls.sql"])
+def test_root_table_of_flattening_queries(name):
+    query_sql = (SQL_DIR / name).read_text(encoding="utf-8")
+    assert find_root_table(query_sql) == 'tmp_df9."location"'
+
+
+def test_root_table_skips_ctes_comments_and_literals():
+    query_sql = (
+        "-- FROM comment\n"
+        "WITH c AS (SELECT x FROM inner_t) "
+        "SELECT EXTRACT(year FROM d), 'FROM lit' "
+        'FROM "My ""T""" AS t LEFT JOIN c ON TRUE'
+    )
+    assert find_root_table(query_sql) == '"My ""T"""'
+
+
+def test_root_table_of_subquery_is_unknown():
+    assert find_root_table("SELECT * FROM (SELECT 1) AS q") is None
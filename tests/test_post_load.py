@@ -0,0 +1,24 @@
+# -*- coding: utf-8 -*-
+"""Tests for integer type narrowing."""
+
+from decimal import Decimal
+
+import pytest
+from loading_modules.post_load import narrowest_integer_type
+
+
+@pytest.mark.parametrize(
+    ("min_value", "max_value", "expected"),
+    [
+        (0, 1, "smallint"),
+        (-32768, 32767, "smallint"),
+        (-32769, 0, "integer"),
+        (0, 32768, "integer"),
+        (0, 2**31, "bigint"),
+        (-(2**63), 2**63 - 1, "bigint"),
+        (0, 2**63, None),
+        (Decimal("-5"), Decimal("40000"), "integer"),
+    ],
+)
+def test_narrowest_integer_type(min_value, max_value, expected):
+    assert narrowest_integer_type(min_value, max_value) == expected
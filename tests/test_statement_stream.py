@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""Tests for the incremental SQL dump splitter."""
+
+import pytest
+from loading_modules.statement_stream import StatementSplitter, iter_statements
+
+DUMP = """
+SET client_encoding = 'UTF8';
+-- a comment; with a semicolon
+INSERT INTO t VALUES (E'it\\'s; escaped', 'doubled '' quote; here');
+CREATE TABLE "odd;name" (id int);
+/* outer /* nested; */ still a comment; */
+CREATE FUNCTION f() RETURNS int AS $body$ SELECT 1; $body$ LANGUAGE sql;
+DO $$ BEGIN PERFORM 1; END $$;
+SELECT 1
+"""
+
+EXPECTED = [
+    "SET client_encoding = 'UTF8'",
+    "-- a comment; with a semicolon\n"
+    "INSERT INTO t VALUES (E'it\\'s; escaped', 'doubled '' quote; here')",
+    'CREATE TABLE "odd;name" (id int)',
+    "/* outer /* nested; */ still a comment; */\n"
+    "CREATE FUNCTION f() RETURNS int AS $body$ SELECT 1; $body$ LANGUAGE sql",
+    "DO $$ BEGIN PERFORM 1; END $$",
+    "SELECT 1",
+]
+
+
+def split(text, piece_size=None):
+    """Feeds text to a splitter whole or in fixed-size pieces."""
+    splitter = StatementSplitter()
+    statements = []
+    if piece_size is None:
+        statements += splitter.feed(text)
+    else:
+        for start in range(0, len(text), piece_size):
+            statements += splitter.feed(text[start : start + piece_size])
+    return statements + splitter.finish()
+
+
+@pytest.mark.parametrize("piece_size", [None, 1, 2, 3, 7])
+def test_split_is_independent_of_piece_boundaries(piece_size):
+    assert split(DUMP, piece_size) == EXPECTED
+
+
+def test_backslash_is_literal_outside_escape_strings():
+    # In a standard string a backslash does not escape the closing quote.
+    assert split("SELECT 'a\\'; SELECT 2;") == ["SELECT 'a\\'", "SELECT 2"]
+
+
+def test_identifier_ending_in_e_does_not_start_escape_string():
+    assert split("SELECT name'x\\'; SELECT 2;", 1) == [
+        "SELECT name'x\\'",
+        "SELECT 2",
+    ]
+
+
+def test_dollar_in_identifier_is_not_a_quote():
+    assert split("SELECT a$b$c; SELECT 2;", 1) == ["SELECT a$b$c", "SELECT 2"]
+
+
+def test_dollar_tag_must_match_to_close():
+    text = "SELECT $a$ $b$; $a$; SELECT 2;"
+    assert split(text, 1) == ["SELECT $a$ $b$; $a$", "SELECT 2"]
+
+
+def test_comment_only_statements_are_dropped():
+    assert split("-- header\n;\n/* nothing */;\nSELECT 1;\n-- trailer") == ["SELECT 1"]
+
+
+def test_iter_statements_reads_file(tmp_path):
+    path = tmp_path / "dump.sql"
+    path.write_text(DUMP, encoding="utf-8")
+    assert list(iter_statements(path)) == EXPECTED
@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+"""Tests for the latency-statistics helpers."""
+
+import json
+
+import pytest
+from profiling_modules.timing import percentile, summarize_latencies
+
+
+def test_summarize_latencies():
+    samples = [4.0, 1.0, 3.0, 2.0, 10.0]
+    summary = summarize_latencies(samples)
+    assert summary["latency_min_ms"] == 1.0
+    assert summary["latency_median_ms"] == 3.0
+    assert summary["latency_mean_ms"] == 4.0
+    assert summary["latency_p95_ms"] == 8.8
+    assert summary["latency_p99_ms"] == 9.76
+    assert summary["latency_stddev_ms"] == pytest.approx(3.54, abs=0.01)
+    # Raw samples keep their measurement order for the CSV round trip.
+    assert json.loads(summary["latency_samples_ms"]) == samples
+
+
+def test_summarize_single_sample():
+    summary = summarize_latencies([2.3456])
+    assert summary["latency_median_ms"] == summary["latency_p99_ms"] == 2.35
+    assert summary["latency_stddev_ms"] == 0.0
+
+
+def test_summarize_no_samples():
+    assert summarize_latencies([]) == {}
+
+
+def test_percentile_interpolates():
+    assert percentile([0.0, 10.0], 25) == 2.5
+    assert percentile([7.0], 95) == 7.0